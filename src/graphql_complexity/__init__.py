@@ -1,20 +1,43 @@
-from graphql_complexity.evaluator.complexity import get_complexity
-from graphql_complexity.evaluator.explain import explain_complexity, ExplanationResult, FieldExplanation
+from .evaluator.bulk import get_complexities, ComplexityResult
+from .evaluator.cache import ComplexityCache, ParseCache
+from .evaluator.complexity import get_complexity
+from .evaluator.explain import explain_complexity, ExplanationResult, FieldExplanation
+from .evaluator.plan import compile_cost_plan, CostPlan
+from .evaluator.rule import build_complexity_validation_rule
+from .evaluator.stats import AnalysisStats
+from .errors import ComplexityLimitError, FragmentCycleError, FragmentExpansionError
 
 from .estimators import (
     ArgumentsEstimator,
+    CachingEstimator,
     ComplexityEstimator,
+    CostSpecEstimator,
     DirectivesEstimator,
+    ListSize,
     SimpleEstimator,
 )
 
 __all__ = [
     "get_complexity",
+    "get_complexities",
+    "ComplexityResult",
+    "ComplexityCache",
+    "ParseCache",
     "explain_complexity",
     "ExplanationResult",
     "FieldExplanation",
+    "compile_cost_plan",
+    "CostPlan",
+    "build_complexity_validation_rule",
+    "AnalysisStats",
+    "ComplexityLimitError",
+    "FragmentCycleError",
+    "FragmentExpansionError",
     "ArgumentsEstimator",
+    "CachingEstimator",
     "ComplexityEstimator",
+    "CostSpecEstimator",
     "DirectivesEstimator",
+    "ListSize",
     "SimpleEstimator",
 ]
@@ -5,3 +5,8 @@ import dataclasses
 class Config:
     count_arg_name: str | None = "first"  # ToDo: Improve Unset
     count_missing_arg_value: int = 1
+    max_fragment_expansion: int | None = None
+    # Relay connections: the slicing argument of a connection field sizes its `edges` and `nodes`
+    relay_connections: bool = False
+    connection_slicing_args: tuple[str, ...] = ("first", "last")
+    max_connection_size: int | None = None
@@ -0,0 +1,29 @@
+from graphql import GraphQLError
+
+
+class ComplexityLimitError(GraphQLError):
+    """Raised when the complexity of a query exceeds the maximum allowed.
+
+    When the limit is exceeded while traversing the document, `complexity` is a lower
+    bound of the query complexity and `path` holds the fields leading to the field that
+    exceeded it."""
+
+    def __init__(self, complexity: int, max_complexity: int, path: list[str] | None = None):
+        super().__init__(
+            f"Query is too complex. Max complexity is {max_complexity}, estimated "
+            f"complexity is {complexity}",
+            path=path,
+        )
+        self.complexity = complexity
+        self.max_complexity = max_complexity
+
+    def __reduce__(self):
+        return type(self), (self.complexity, self.max_complexity, self.path)
+
+
+class FragmentCycleError(GraphQLError):
+    """Raised when the fragments of a document spread each other in a cycle."""
+
+
+class FragmentExpansionError(GraphQLError):
+    """Raised when the fragments of a document expand to more fields than allowed."""
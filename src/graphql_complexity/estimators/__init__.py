@@ -1,11 +1,16 @@
-from .base import ComplexityEstimator
+from .base import ComplexityEstimator, ListSize
 from .arguments import ArgumentsEstimator
+from .caching import CachingEstimator
+from .cost_spec import CostSpecEstimator
 from .directive import DirectivesEstimator
 from .simple import SimpleEstimator
 
 __all__ = [
     "ArgumentsEstimator",
+    "CachingEstimator",
     "ComplexityEstimator",
+    "CostSpecEstimator",
     "DirectivesEstimator",
+    "ListSize",
     "SimpleEstimator",
 ]
@@ -1,4 +1,4 @@
-from graphql import IntValueNode, ListValueNode
+from graphql import IntValueNode, ListValueNode, VariableNode
 from graphql_complexity.estimators.base import ComplexityEstimator
 
 
@@ -6,6 +6,7 @@ class ArgumentsEstimator(ComplexityEstimator):
     """
     Estimates complexity by multiplying a base value by
     numeric argument values (e.g. first, limit, ids).
+    Arguments given as variables are resolved with the request variables.
 
     Usage:
         estimator = ArgumentsEstimator(
@@ -14,6 +15,9 @@ class ArgumentsEstimator(ComplexityEstimator):
         )
     """
 
+    uses_variables = True
+    pure = True
+
     def __init__(
         self,
         multipliers: list[str],
@@ -22,18 +26,33 @@ class ArgumentsEstimator(ComplexityEstimator):
         self.multipliers = multipliers
         self.default_complexity = default_complexity
 
-    def get_field_complexity(self, node, type_info, path) -> int:
-        multiplier = self._get_multiplier(node)
+    def fingerprint(self):
+        return type(self), tuple(self.multipliers), self.default_complexity
+
+    def get_field_complexity(self, node, type_info, path, variables=None) -> int:
+        multiplier = self._get_multiplier(node, variables or {})
         return self.default_complexity * multiplier
 
-    def _get_multiplier(self, node) -> int:
+    def _get_multiplier(self, node, variables) -> int:
         for arg in node.arguments or []:
             if arg.name.value in self.multipliers:
-                value = self._extract_value(arg.value)
+                if isinstance(arg.value, VariableNode):
+                    value = self._extract_variable(variables.get(arg.value.name.value))
+                else:
+                    value = self._extract_value(arg.value)
                 if value is not None:
                     return value
         return 1
 
+    @staticmethod
+    def _extract_variable(value) -> int | None:
+        # limit: $limit  →  value of the variable, or length of a list
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, (list, tuple)):
+            return len(value)
+        return None
+
     def _extract_value(self, value_node) -> int | None:
         # limit: 10  →  10
         if isinstance(value_node, IntValueNode):
@@ -1,7 +1,49 @@
 import abc
+import dataclasses
+from typing import Any, Hashable
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ListSize:
+    """Number of items a field is expected to return.
+
+    When `sized_fields` are given, the field returns an object, such as a connection,
+    and `count` is the size of the lists returned by those child fields instead."""
+    count: int
+    sized_fields: tuple[str, ...] = ()
 
 
 class ComplexityEstimator(abc.ABC):
+    # Estimators that read variables receive the request ones as a `variables` keyword
+    uses_variables: bool = False
+    # Estimators that size lists are asked for the size of every field, see `get_list_size`
+    sizes_lists: bool = False
+    # Pure estimators only depend on the parent type, the field and its arguments, see `CachingEstimator`
+    pure: bool = False
+    # Estimators that batch fields are called once per selection set, see `get_fields_complexity`
+    batches_fields: bool = False
+
     @abc.abstractmethod
-    def get_field_complexity(self, node, type_info, path) -> int:
-        """Return the complexity of the field."""
+    def get_field_complexity(self, node, type_info, path, variables: dict[str, Any] | None = None) -> int:
+        """Return the complexity of the field. The request variables are only given when
+        `uses_variables` is set."""
+
+    def get_list_size(self, node, type_info, variables: dict[str, Any]) -> ListSize | None:
+        """Return the number of items the field is expected to return, or None to use
+        the count argument of the configuration. Only called when `sizes_lists` is set."""
+        return None
+
+    def get_fields_complexity(self, nodes: list[Any], parent_type, variables: dict[str, Any]) -> list[int]:
+        """Return the complexity of the fields of a selection set, in the same order,
+        given the type they are selected on. Meta fields, such as `__typename`, and fields
+        excluded by the 'skip' and 'include' directives are not given; cost plans give the
+        fields whose directives depend on variables. The request variables are only given
+        when `uses_variables` is set, and are empty otherwise. Only called when
+        `batches_fields` is set, instead of `get_field_complexity`."""
+        raise NotImplementedError
+
+    def fingerprint(self) -> Hashable:
+        """Return a hashable value identifying the configuration of the estimator.
+        Cached complexities are shared between estimators with the same fingerprint.
+        By default, an estimator only shares them with itself."""
+        return self
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Any, Hashable
+
+from graphql import ListValueNode, ObjectValueNode, ValueNode, VariableNode
+
+from .base import ComplexityEstimator, ListSize
+from ..evaluator.cache import CacheStats, LRUCache, _freeze
+
+
+class CachingEstimator(ComplexityEstimator):
+    """Estimator that caches the complexity given by a pure estimator to each field.
+
+    Complexities are cached by parent type, field name and arguments, so a field
+    selected many times, through aliases or fragments, is estimated once. Literal
+    arguments are normalized, so their order and the order of the fields of input
+    objects does not matter. Arguments given as variables are resolved with the
+    request variables when the estimator uses them, and keyed by name otherwise.
+
+    Only estimators declaring themselves `pure` can be cached: their complexity can
+    only depend on the parent type, the field and its arguments, not on the path or
+    the alias of the field. The cache holds up to `maxsize` complexities, evicting
+    the least recently used ones, and its usage is counted in `stats`. Types are keyed
+    by name, so a wrapper should not be shared between schemas.
+
+    Usage:
+        estimator = CachingEstimator(MyEstimator(), maxsize=10_000)
+        get_complexity(query, schema, estimator)
+        print(estimator.stats.hits, estimator.stats.misses)
+    """
+
+    pure = True
+
+    def __init__(self, estimator: ComplexityEstimator, maxsize: int = 4096):
+        if not isinstance(estimator, ComplexityEstimator):
+            raise ValueError("Estimator must be of type 'ComplexityEstimator'")
+        if not estimator.pure:
+            raise ValueError("Only pure estimators can be cached")
+        self.estimator = estimator
+        self.cache = LRUCache(maxsize=maxsize)
+        self.uses_variables = estimator.uses_variables
+        self.sizes_lists = estimator.sizes_lists
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def fingerprint(self) -> Hashable:
+        # Caching does not change the complexities, so they are shared with the estimator
+        return self.estimator.fingerprint()
+
+    def get_field_complexity(self, node, type_info, path, variables: dict[str, Any] | None = None) -> int:
+        parent_type = type_info.get_parent_type()
+        key = (
+            parent_type.name if parent_type else None,
+            node.name.value,
+            tuple(sorted(
+                (arg.name.value, _normalize_value(arg.value, variables if self.uses_variables else None))
+                for arg in node.arguments or ()
+            )),
+        )
+        complexity = self.cache.get(key)
+        if complexity is None:
+            if self.uses_variables:
+                complexity = self.estimator.get_field_complexity(node, type_info, path, variables=variables)
+            else:
+                complexity = self.estimator.get_field_complexity(node, type_info, path)
+            self.cache.set(key, complexity)
+        return complexity
+
+    def get_list_size(self, node, type_info, variables: dict[str, Any]) -> ListSize | None:
+        return self.estimator.get_list_size(node, type_info, variables)
+
+
+def _normalize_value(value_node: ValueNode, variables: dict[str, Any] | None) -> Hashable:
+    """Return a hashable version of an argument value. Variables are resolved when
+    `variables` are given."""
+    if isinstance(value_node, VariableNode):
+        if variables is None:
+            return "$", value_node.name.value
+        return "$", _freeze(variables.get(value_node.name.value))
+    if isinstance(value_node, ListValueNode):
+        return "[]", tuple(_normalize_value(value, variables) for value in value_node.values)
+    if isinstance(value_node, ObjectValueNode):
+        fields = value_node.fields
+        return "{}", tuple(sorted((field.name.value, _normalize_value(field.value, variables)) for field in fields))
+    # The kind tells apart values with the same text, such as 1 and "1"
+    return value_node.kind, getattr(value_node, "value", None)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import math
+from typing import Any, NamedTuple
+
+from graphql import (
+    GraphQLInterfaceType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    IntValueNode,
+    ListValueNode,
+    VariableNode,
+    get_named_type,
+)
+
+from .base import ComplexityEstimator, ListSize
+from .directive import get_directive_arguments, inherit_from_interfaces, to_graphql_schema
+
+DEFAULT_COST_DIRECTIVE_NAME = "cost"
+DEFAULT_LIST_SIZE_DIRECTIVE_NAME = "listSize"
+
+
+class _ListSizeInfo(NamedTuple):
+    assumed_size: int | None
+    slicing_arguments: tuple[str, ...]
+    sized_fields: tuple[str, ...]
+
+
+class CostSpecEstimator(ComplexityEstimator):
+    """Complexity estimator following the IBM GraphQL cost directive specification.
+
+    The weight of a field is given by `@cost(weight:)` on its definition, or on the type
+    it returns, and defaults to `default_weight`. `@listSize` on a field definition
+    sizes the list it returns:
+        - `slicingArguments`: arguments holding the number of items, such as `first`
+          or `last`. The largest one given is used.
+        - `assumedSize`: number of items when no slicing argument is given.
+        - `sizedFields`: child fields returning the list, such as the `edges` of a
+          connection, the size applies to instead of the field itself.
+    List fields without `@listSize` are sized with the count argument of the config.
+
+    The directives are read once, when the estimator is created, into tables keyed by
+    parent type and field name. Fields without directives take the ones of the same
+    field in the interfaces their type implements. The schema can be a `GraphQLSchema`,
+    a Strawberry schema or its SDL.
+
+    Usage:
+        estimator = CostSpecEstimator(schema)
+        get_complexity(query, schema, estimator, variables=variables)
+    """
+
+    sizes_lists = True
+    pure = True
+    batches_fields = True
+
+    def __init__(
+        self,
+        schema: GraphQLSchema | str | Any,
+        default_weight: int = 1,
+        cost_directive_name: str = DEFAULT_COST_DIRECTIVE_NAME,
+        list_size_directive_name: str = DEFAULT_LIST_SIZE_DIRECTIVE_NAME,
+    ):
+        if default_weight < 0:
+            raise ValueError("'default_weight' must be a positive integer (greater or equal than 0)")
+        self.default_weight = default_weight
+        self.weights: dict[tuple[str, str], int] = {}
+        self.list_sizes: dict[tuple[str, str], _ListSizeInfo] = {}
+        self._compile(to_graphql_schema(schema), cost_directive_name, list_size_directive_name)
+        self.__fingerprint = (
+            type(self),
+            default_weight,
+            hash(frozenset(self.weights.items())),
+            hash(frozenset(self.list_sizes.items())),
+        )
+
+    def fingerprint(self):
+        return self.__fingerprint
+
+    def get_field_complexity(self, node, type_info, path, variables=None) -> int:
+        parent_type = type_info.get_parent_type()
+        if parent_type is None:
+            return self.default_weight
+        return self.weights.get((parent_type.name, node.name.value), self.default_weight)
+
+    def get_fields_complexity(self, nodes, parent_type, variables) -> list[int]:
+        if parent_type is None:
+            return [self.default_weight] * len(nodes)
+        type_name, weights, default_weight = parent_type.name, self.weights, self.default_weight
+        return [weights.get((type_name, node.name.value), default_weight) for node in nodes]
+
+    def get_list_size(self, node, type_info, variables: dict[str, Any]) -> ListSize | None:
+        parent_type = type_info.get_parent_type()
+        info = self.list_sizes.get((parent_type.name, node.name.value)) if parent_type else None
+        if info is None:
+            return None
+        count = None
+        arguments = {arg.name.value: arg.value for arg in node.arguments or ()}
+        field_def = type_info.get_field_def()
+        for arg_name in info.slicing_arguments:
+            if arg_name in arguments:
+                value = _get_count(arguments[arg_name], variables)
+            else:
+                value = _get_default_count(field_def, arg_name)
+            if value is not None and (count is None or value > count):
+                count = value
+        if count is None:
+            count = info.assumed_size
+        return None if count is None else ListSize(count, info.sized_fields)
+
+    def _compile(self, schema: GraphQLSchema, cost_directive_name: str, list_size_directive_name: str) -> None:
+        types = [
+            type_ for type_ in schema.type_map.values() if isinstance(type_, (GraphQLObjectType, GraphQLInterfaceType))
+        ]
+        for type_ in types:
+            for field_name, field in type_.fields.items():
+                weight = _get_weight(field, cost_directive_name)
+                if weight is None:
+                    weight = _get_weight(get_named_type(field.type), cost_directive_name)
+                if weight is not None:
+                    self.weights[type_.name, field_name] = weight
+                list_size = _get_list_size_info(field, list_size_directive_name)
+                if list_size is not None:
+                    self.list_sizes[type_.name, field_name] = list_size
+        for table in (self.weights, self.list_sizes):
+            inherit_from_interfaces(table, types)
+
+
+def _get_weight(element: Any, directive_name: str) -> int | None:
+    arguments = get_directive_arguments(element, directive_name)
+    if isinstance(arguments, dict):
+        arguments = arguments.get("weight")
+    # Weights are strings in the specification, to allow decimals
+    return None if arguments is None else math.ceil(float(arguments))
+
+
+def _get_list_size_info(element: Any, directive_name: str) -> _ListSizeInfo | None:
+    arguments = get_directive_arguments(element, directive_name)
+    if not isinstance(arguments, dict):
+        return None
+    assumed_size = _get_argument(arguments, "assumedSize", "assumed_size")
+    return _ListSizeInfo(
+        assumed_size=None if assumed_size is None else int(assumed_size),
+        slicing_arguments=tuple(_get_argument(arguments, "slicingArguments", "slicing_arguments") or ()),
+        sized_fields=tuple(_get_argument(arguments, "sizedFields", "sized_fields") or ()),
+    )
+
+
+def _get_argument(arguments: dict[str, Any], name: str, python_name: str) -> Any:
+    """Return the argument of a directive, named in camel case in the SDL, or in
+    snake case in Strawberry schema directives."""
+    return arguments.get(name, arguments.get(python_name))
+
+
+def _get_default_count(field_def, arg_name: str) -> int | None:
+    """Return the count given by the default value of the argument in the schema, if any."""
+    arg = field_def.args.get(arg_name) if field_def else None
+    value = arg.default_value if arg else None
+    if isinstance(value, list):
+        return len(value)
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def _get_count(value_node, variables: dict[str, Any]) -> int | None:
+    if isinstance(value_node, VariableNode):
+        value = variables.get(value_node.name.value)
+        return value if isinstance(value, int) and not isinstance(value, bool) else None
+    if isinstance(value_node, IntValueNode):
+        return int(value_node.value)
+    if isinstance(value_node, ListValueNode):
+        return len(value_node.values)
+    return None
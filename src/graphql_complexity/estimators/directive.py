@@ -1,6 +1,15 @@
+from __future__ import annotations
+
 from typing import Any
 
-from graphql import Visitor, parse, visit
+from graphql import (
+    GraphQLField,
+    GraphQLInterfaceType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    build_schema,
+    value_from_ast_untyped,
+)
 
 from graphql_complexity.estimators.base import ComplexityEstimator
 
@@ -9,28 +18,16 @@ DEFAULT_COMPLEXITY_DIRECTIVE_NAME = "complexity"
 DEFAULT_COMPLEXITY_VALUE = 1
 
 
-class DirectivesVisitor(Visitor):
-    def __init__(self, directive_name: str, collector: dict[str, int]):
-        self._collector = collector
-        self.directive_name = directive_name
-        super().__init__()
-
-    def enter_field_definition(self, node, key, parent, path, ancestors):
-        for directive in node.directives:
-            if directive.name.value == self.directive_name:
-                complexity = next(
-                    arg.value.value
-                    for arg in directive.arguments
-                    if arg.name.value == DIRECTIVE_ESTIMATOR_FIELD_COMPLEXITY_NAME
-                )
-                self._collector[node.name.value] = int(complexity)
-                break
-
-
 class DirectivesEstimator(ComplexityEstimator):
     """Complexity estimator that uses directives to get the complexity of the fields.
-    The complexity is calculated by visiting the schema and using the complexity
-    directive to get the complexity of each field.
+    The complexity of each field is read once from the complexity directive applied
+    to its definition, and looked up by its parent type and name.
+
+    The schema can be a `GraphQLSchema`, a Strawberry schema or the SDL of the schema.
+    Besides the directive in the SDL of the field, the complexity can be given by a
+    Strawberry schema directive or by the `extensions` of the field, under the name
+    of the directive. Fields of an interface without a complexity take the one of the
+    interfaces they implement.
 
     Example:
         Given the following schema:
@@ -50,9 +47,12 @@ class DirectivesEstimator(ComplexityEstimator):
         And the total complexity will be 6.
     """
 
+    pure = True
+    batches_fields = True
+
     def __init__(
         self,
-        schema: str,
+        schema: GraphQLSchema | str | Any,
         directive_name: str = DEFAULT_COMPLEXITY_DIRECTIVE_NAME,
         missing_complexity: int = DEFAULT_COMPLEXITY_VALUE,
     ):
@@ -61,15 +61,94 @@ class DirectivesEstimator(ComplexityEstimator):
         self.__complexity_map = self.collect_from_schema(
             schema=schema, directive_name=directive_name
         )
+        self.__fingerprint = (
+            type(self), directive_name, self.__missing_complexity, hash(frozenset(self.__complexity_map.items()))
+        )
         super().__init__()
 
     @staticmethod
-    def collect_from_schema(schema: str, directive_name: str) -> dict[str, int]:
-        collector: dict[str, Any] = {}
-        ast = parse(schema)
-        visitor = DirectivesVisitor(collector=collector, directive_name=directive_name)
-        visit(ast, visitor)
+    def collect_from_schema(schema: GraphQLSchema | str | Any, directive_name: str) -> dict[tuple[str, str], int]:
+        """Return the complexity of the fields of the schema, by parent type and field name."""
+        schema = to_graphql_schema(schema)
+        collector: dict[tuple[str, str], int] = {}
+        types = [
+            type_ for type_ in schema.type_map.values() if isinstance(type_, (GraphQLObjectType, GraphQLInterfaceType))
+        ]
+        for type_ in types:
+            for field_name, field in type_.fields.items():
+                complexity = _get_field_complexity(field, directive_name)
+                if complexity is not None:
+                    collector[type_.name, field_name] = complexity
+        inherit_from_interfaces(collector, types)
         return collector
 
-    def get_field_complexity(self, node, type_info, path) -> int:
-        return self.__complexity_map.get(node.name.value, self.__missing_complexity)
+    def fingerprint(self):
+        return self.__fingerprint
+
+    def get_field_complexity(self, node, type_info, path, variables=None) -> int:
+        parent_type = type_info.get_parent_type()
+        if parent_type is None:
+            return self.__missing_complexity
+        return self.__complexity_map.get((parent_type.name, node.name.value), self.__missing_complexity)
+
+    def get_fields_complexity(self, nodes, parent_type, variables) -> list[int]:
+        if parent_type is None:
+            return [self.__missing_complexity] * len(nodes)
+        type_name, complexity_map, missing = parent_type.name, self.__complexity_map, self.__missing_complexity
+        return [complexity_map.get((type_name, node.name.value), missing) for node in nodes]
+
+
+def to_graphql_schema(schema: GraphQLSchema | str | Any) -> GraphQLSchema:
+    """Return the graphql-core schema of a `GraphQLSchema`, a Strawberry schema or an SDL."""
+    if isinstance(schema, str):
+        return build_schema(schema, assume_valid_sdl=True)
+    # Strawberry schemas wrap the graphql-core one
+    return getattr(schema, "_schema", schema)
+
+
+def inherit_from_interfaces(table: dict[tuple[str, str], Any], types: list[Any]) -> None:
+    """Complete a table keyed by parent type and field name with the entries of the
+    interfaces implemented by the types, for the fields without an entry."""
+    for type_ in types:
+        for field_name in type_.fields:
+            if (type_.name, field_name) in table:
+                continue
+            for interface in type_.interfaces:
+                if (interface.name, field_name) in table:
+                    table[type_.name, field_name] = table[interface.name, field_name]
+                    break
+
+
+def _get_field_complexity(field: GraphQLField, directive_name: str) -> int | None:
+    """Return the complexity given to the field by the directive, if any."""
+    arguments = get_directive_arguments(field, directive_name)
+    if isinstance(arguments, dict):
+        arguments = arguments.get(DIRECTIVE_ESTIMATOR_FIELD_COMPLEXITY_NAME)
+    return None if arguments is None else int(arguments)
+
+
+def get_directive_arguments(element: Any, directive_name: str) -> dict[str, Any] | Any | None:
+    """Return the arguments of the directive applied to a schema element, such as a
+    field or a type, if any.
+
+    The directive is looked up in the AST node of the element, then in its `extensions`,
+    which hold the arguments or a bare value under the name of the directive, then in
+    the Strawberry schema directives of the element."""
+    if element.ast_node:
+        for directive in element.ast_node.directives or ():
+            if directive.name.value == directive_name:
+                return {arg.name.value: value_from_ast_untyped(arg.value) for arg in directive.arguments}
+    extensions = element.extensions or {}
+    if directive_name in extensions:
+        return extensions[directive_name]
+    definition = extensions.get("strawberry-definition")
+    for directive in getattr(definition, "directives", None) or ():
+        directive_definition = getattr(type(directive), "__strawberry_directive__", None)
+        if directive_definition and _strawberry_directive_name(directive_definition) == directive_name:
+            return vars(directive)
+    return None
+
+
+def _strawberry_directive_name(directive_definition: Any) -> str:
+    name = directive_definition.graphql_name or directive_definition.python_name
+    return name[:1].lower() + name[1:]
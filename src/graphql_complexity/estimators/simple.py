@@ -5,6 +5,8 @@ class SimpleEstimator(ComplexityEstimator):
     """Simple complexity estimator that returns a constant complexity for all fields.
     Constant can be set in the constructor."""
 
+    pure = True
+
     def __init__(self, complexity: int = 1):
         if complexity < 0:
             raise ValueError(
@@ -15,3 +17,6 @@ class SimpleEstimator(ComplexityEstimator):
 
     def get_field_complexity(self, *_, **__) -> int:
         return self.__complexity_constant
+
+    def fingerprint(self):
+        return type(self), self.__complexity_constant
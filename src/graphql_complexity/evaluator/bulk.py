@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+import os
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Hashable, Iterable, Literal
+
+from graphql import (
+    DocumentNode,
+    GraphQLError,
+    build_schema,
+    is_introspection_type,
+    is_specified_directive,
+    is_specified_scalar_type,
+    print_ast,
+    print_schema,
+)
+
+from .complexity import get_complexity
+
+if TYPE_CHECKING:
+    from graphql import GraphQLSchema, Node
+    from ..config import Config
+    from ..estimators import ComplexityEstimator
+
+# Arguments of `get_complexity` shared by the queries analyzed by a worker process
+_worker_arguments: tuple[GraphQLSchema, ComplexityEstimator, Config | None, int | None] | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class ComplexityResult:
+    """Complexity of a query analyzed by `get_complexities`, or the error raised
+    while analyzing it, such as a syntax error or a `ComplexityLimitError`."""
+    complexity: int | None = None
+    error: Exception | None = None
+
+
+def get_complexities(
+        queries: Iterable[str | DocumentNode],
+        schema: GraphQLSchema,
+        estimator: ComplexityEstimator,
+        config: Config | None = None,
+        *,
+        max_complexity: int | None = None,
+        executor: Literal["process", "thread"] | None = "process",
+        max_workers: int | None = None,
+        chunksize: int | None = None,
+) -> list[ComplexityResult]:
+    """Calculate the complexity of many queries, using a pool of processes or threads.
+
+    Identical queries are analyzed once. The remaining ones are split in chunks of
+    `chunksize` queries, by default about four per worker, that are analyzed by the
+    `executor`: "process" to use every core, "thread", or None to analyze them in
+    the current thread.
+
+    Worker processes rebuild the schema from its SDL, so the estimator and the
+    configuration must be picklable. Schemas built from an SDL keep the directives
+    applied in it, but the `extensions` of code-first schemas are lost: estimators
+    reading them at analysis time must use threads.
+
+    A result is returned for each query, in the same order. Errors raised while
+    analyzing a query are returned in its result, instead of aborting the batch."""
+    indexes: dict[Hashable, int] = {}
+    unique: list[str | DocumentNode] = []
+    positions: list[int] = []
+    for query in queries:
+        key = _query_key(query)
+        if key not in indexes:
+            indexes[key] = len(unique)
+            # Documents are sent to worker processes as text, cheaper to pickle than their AST
+            unique.append(key if executor == "process" else query)
+        positions.append(indexes[key])
+
+    if executor is None or len(unique) <= 1:
+        results = [_analyze(query, schema, estimator, config, max_complexity) for query in unique]
+    else:
+        max_workers = max_workers or os.cpu_count() or 1
+        chunksize = chunksize or math.ceil(len(unique) / (max_workers * 4))
+        chunks = [unique[start:start + chunksize] for start in range(0, len(unique), chunksize)]
+        with _build_executor(executor, max_workers, schema, estimator, config, max_complexity) as pool:
+            if executor == "process":
+                analyzed = pool.map(_analyze_chunk_in_worker, chunks)
+            else:
+                analyzed = pool.map(partial(_analyze_chunk, schema, estimator, config, max_complexity), chunks)
+            results = [result for chunk in analyzed for result in chunk]
+
+    return [results[position] for position in positions]
+
+
+def _query_key(query: str | DocumentNode) -> str | DocumentNode:
+    """Return the text of the query, or the document if it has no source,
+    so identical queries are analyzed once."""
+    if isinstance(query, DocumentNode):
+        return query.loc.source.body.strip() if query.loc else query
+    return query.strip()
+
+
+def _build_executor(
+        executor: str,
+        max_workers: int,
+        schema: GraphQLSchema,
+        estimator: ComplexityEstimator,
+        config: Config | None,
+        max_complexity: int | None,
+) -> Executor:
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if executor == "process":
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(_print_schema_with_directives(schema), estimator, config, max_complexity),
+        )
+    raise ValueError(f"Unknown executor {executor!r}, expected 'process', 'thread' or None")
+
+
+def _print_schema_with_directives(schema: GraphQLSchema) -> str:
+    """Return the SDL of the schema, printed from the definitions it was built from so
+    the directives applied in them are kept. `print_schema` drops them, and is only
+    used for schemas that were not entirely built from an SDL."""
+    types = [
+        type_ for type_ in schema.type_map.values()
+        if not is_specified_scalar_type(type_) and not is_introspection_type(type_)
+    ]
+    directives = [directive for directive in schema.directives if not is_specified_directive(directive)]
+    definitions: list[Node] = [schema.ast_node] if schema.ast_node else []
+    definitions.extend(schema.extension_ast_nodes)
+    for directive in directives:
+        if directive.ast_node is None:
+            return print_schema(schema)
+        definitions.append(directive.ast_node)
+    for type_ in types:
+        if type_.ast_node is None:
+            return print_schema(schema)
+        definitions.append(type_.ast_node)
+        definitions.extend(type_.extension_ast_nodes)
+    return print_ast(DocumentNode(definitions=tuple(definitions)))
+
+
+def _init_worker(sdl: str, estimator: ComplexityEstimator, config: Config | None, max_complexity: int | None):
+    global _worker_arguments
+    _worker_arguments = (build_schema(sdl), estimator, config, max_complexity)
+
+
+def _analyze_chunk_in_worker(queries: list[str | DocumentNode]) -> list[ComplexityResult]:
+    if _worker_arguments is None:
+        raise RuntimeError("Worker processes must be initialized by get_complexities")
+    schema, estimator, config, max_complexity = _worker_arguments
+    results = _analyze_chunk(schema, estimator, config, max_complexity, queries)
+    return [
+        ComplexityResult(complexity=result.complexity, error=_picklable(result.error)) if result.error else result
+        for result in results
+    ]
+
+
+def _analyze_chunk(
+        schema: GraphQLSchema,
+        estimator: ComplexityEstimator,
+        config: Config | None,
+        max_complexity: int | None,
+        queries: list[str | DocumentNode],
+) -> list[ComplexityResult]:
+    return [_analyze(query, schema, estimator, config, max_complexity) for query in queries]
+
+
+def _analyze(
+        query: str | DocumentNode,
+        schema: GraphQLSchema,
+        estimator: ComplexityEstimator,
+        config: Config | None,
+        max_complexity: int | None,
+) -> ComplexityResult:
+    try:
+        return ComplexityResult(
+            complexity=get_complexity(query, schema, estimator, config, max_complexity=max_complexity)
+        )
+    except Exception as error:  # noqa: BLE001 - errors are reported per query
+        return ComplexityResult(error=error)
+
+
+def _picklable(error: Exception) -> Exception:
+    """Return the error, or an equivalent one that can be sent back from a worker process."""
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:  # noqa: BLE001 - any error raised while pickling
+        if isinstance(error, GraphQLError):
+            return GraphQLError(error.message, source=error.source, positions=error.positions, path=error.path)
+        return RuntimeError(f"{type(error).__name__}: {error}")
+    return error
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import math
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable
+
+from graphql import (
+    DocumentNode,
+    GraphQLIncludeDirective,
+    GraphQLSkipDirective,
+    ListValueNode,
+    ObjectValueNode,
+    VariableNode,
+    Visitor,
+    parse,
+    print_schema,
+    visit,
+)
+
+from ..config import Config
+
+if TYPE_CHECKING:
+    from graphql import DirectiveNode, FieldNode, GraphQLSchema, ValueNode
+    from ..estimators import ComplexityEstimator
+    from .stats import AnalysisStats
+
+_schema_fingerprints: weakref.WeakKeyDictionary[GraphQLSchema, str] = weakref.WeakKeyDictionary()
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Counters of a cache usage."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class LRUCache:
+    """Thread safe cache that evicts the least recently used entries once it holds
+    more than `maxsize` of them, or once the size of its entries, as measured by
+    `sizeof`, adds up to more than `maxbytes`. Entries bigger than `maxbytes` are
+    not cached. Entries older than `ttl` seconds, if given, are discarded when read."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None, maxbytes: int | None = None):
+        if maxsize < 1:
+            raise ValueError("'maxsize' must be a positive integer (greater than 0)")
+        if maxbytes is not None and maxbytes < 1:
+            raise ValueError("'maxbytes' must be a positive integer (greater than 0)")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.size = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value cached for the key, or `default` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                self.size -= entry[2]
+                self.stats.expirations += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache the value for the key, evicting the least recently used entries."""
+        expires_at = math.inf if self.ttl is None else time.monotonic() + self.ttl
+        size = self.sizeof(key, value) if self.maxbytes is not None else 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[2]
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            self._entries[key] = (value, expires_at, size)
+            self.size += size
+            while len(self._entries) > self.maxsize or (self.maxbytes is not None and self.size > self.maxbytes):
+                self.size -= self._entries.popitem(last=False)[1][2]
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry from the cache. Statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def sizeof(self, key: Hashable, value: Any) -> int:
+        """Return the size of an entry, counted against `maxbytes`: the shallow size of the value."""
+        return sys.getsizeof(value)
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedComplexity:
+    """Complexity cached for a query. When the calculation was stopped by a
+    `max_complexity`, `exact` is False and `complexity` is a lower bound."""
+    complexity: int
+    exact: bool = True
+    path: list[str] | None = None
+
+
+class ParseCache(LRUCache):
+    """Cache of the documents parsed from query texts, used by `get_complexity`,
+    `build_complexity_tree`, `explain_complexity` and `compile_cost_plan`.
+
+    It holds up to `maxsize` documents, and the texts they were parsed from add up
+    to `maxbytes` bytes at most, so a few huge documents do not evict every small
+    one. Queries bigger than `maxbytes` are parsed every time.
+
+    Usage:
+        cache = ParseCache(maxsize=1024, maxbytes=4 * 1024 * 1024)
+        get_complexity(query, schema, estimator, parse_cache=cache)
+        print(cache.stats.hits, cache.stats.misses, cache.size)
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float | None = None, maxbytes: int | None = 1024 * 1024):
+        super().__init__(maxsize=maxsize, ttl=ttl, maxbytes=maxbytes)
+
+    def parse(self, query: str, stats: AnalysisStats | None = None) -> DocumentNode:
+        """Return the document of the query, parsing it if it is not cached."""
+        document = self.get(query)
+        if document is None:
+            document = parse(query)
+            self.set(query, document)
+            if stats is not None:
+                stats.parse_cache_misses += 1
+        elif stats is not None:
+            stats.parse_cache_hits += 1
+        return document
+
+    def sizeof(self, key: Hashable, value: Any) -> int:
+        return len(str(key).encode())
+
+
+# Parse cache used when none is given
+default_parse_cache = ParseCache()
+
+
+class ComplexityCache(LRUCache):
+    """Cache of the complexity of queries, used by `get_complexity`.
+
+    Results are keyed on the query text (or the document itself when it has no
+    source), the operation name, the request variables, the schema, the estimator
+    fingerprint and the configuration, so the same cache can be shared between
+    schemas and estimators.
+
+    Only the variables the complexity depends on are part of the key: those given
+    to count and slicing arguments and to `@skip`/`@include`, or all of them for
+    estimators that use variables. A persisted query only varying by the `$id` it
+    fetches is calculated once.
+
+    Usage:
+        cache = ComplexityCache(maxsize=512, ttl=3600)
+        get_complexity(query, schema, estimator, cache=cache)
+        print(cache.stats.hits, cache.stats.misses)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None, maxbytes: int | None = None):
+        super().__init__(maxsize=maxsize, ttl=ttl, maxbytes=maxbytes)
+        # Names of the variables the complexity of each query text depends on
+        self._cost_variables = LRUCache(maxsize=maxsize)
+
+    def key(
+            self,
+            query: str | DocumentNode,
+            schema: GraphQLSchema,
+            estimator: ComplexityEstimator,
+            config: Config | None = None,
+            variables: dict[str, Any] | None = None,
+            operation_name: str | None = None,
+            parse_cache: ParseCache | None = None,
+    ) -> Hashable:
+        """Return the key of the complexity of a query. Query texts given with
+        variables are parsed through the `parse_cache`, by default the shared one."""
+        document = query
+        if isinstance(query, DocumentNode):
+            query = query.loc.source.body if query.loc else query
+        if variables and not estimator.uses_variables:
+            names = self._get_cost_variables(document, query, estimator, config or Config(), parse_cache)
+            variables = {name: value for name, value in variables.items() if name in names}
+        return (
+            query.strip() if isinstance(query, str) else query,
+            operation_name,
+            _freeze(variables) if variables else None,
+            schema_fingerprint(schema),
+            estimator.fingerprint(),
+            _freeze(dataclasses.astuple(config)) if config else None,
+        )
+
+    def _get_cost_variables(
+            self,
+            document: str | DocumentNode,
+            query: str | DocumentNode,
+            estimator: ComplexityEstimator,
+            config: Config,
+            parse_cache: ParseCache | None,
+    ) -> frozenset[str]:
+        """Return the names of the variables the complexity of the document depends on,
+        collected once per query text."""
+        key = (query, estimator.sizes_lists, config.count_arg_name, config.relay_connections,
+               config.connection_slicing_args) if isinstance(query, str) else None
+        names = self._cost_variables.get(key) if key else None
+        if names is None:
+            if isinstance(document, str):
+                document = (parse_cache or default_parse_cache).parse(document)
+            collector = _CostVariablesCollector(estimator, config)
+            visit(document, collector)
+            names = frozenset(collector.names)
+            if key:
+                self._cost_variables.set(key, names)
+        return names
+
+
+class _CostVariablesCollector(Visitor):
+    """Collect the variables given to the arguments the complexity depends on. Every
+    argument of the fields may size lists for estimators that do, so they are all kept."""
+
+    def __init__(self, estimator: ComplexityEstimator, config: Config):
+        super().__init__()
+        self.names: set[str] = set()
+        self.all_arguments = estimator.sizes_lists
+        self.arguments = {config.count_arg_name}
+        if config.relay_connections:
+            self.arguments.update(config.connection_slicing_args)
+
+    def enter_field(self, node: FieldNode, *_args: Any) -> None:
+        for arg in node.arguments or ():
+            if self.all_arguments or arg.name.value in self.arguments:
+                _collect_variables(arg.value, self.names)
+
+    def enter_directive(self, node: DirectiveNode, *_args: Any) -> None:
+        if node.name.value in (GraphQLSkipDirective.name, GraphQLIncludeDirective.name):
+            for arg in node.arguments or ():
+                _collect_variables(arg.value, self.names)
+
+
+def _collect_variables(value_node: ValueNode, names: set[str]) -> None:
+    if isinstance(value_node, VariableNode):
+        names.add(value_node.name.value)
+    elif isinstance(value_node, ListValueNode):
+        for value in value_node.values:
+            _collect_variables(value, names)
+    elif isinstance(value_node, ObjectValueNode):
+        for field in value_node.fields:
+            _collect_variables(field.value, names)
+
+
+def schema_fingerprint(schema: GraphQLSchema) -> str:
+    """Return a digest of the schema SDL, calculated once per schema instance."""
+    fingerprint = _schema_fingerprints.get(schema)
+    if fingerprint is None:
+        fingerprint = hashlib.sha256(print_schema(schema).encode()).hexdigest()
+        _schema_fingerprints[schema] = fingerprint
+    return fingerprint
+
+
+def _freeze(value: Any) -> Hashable:
+    """Return a hashable version of a JSON like value."""
+    if isinstance(value, dict):
+        return "{}", tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return "[]", tuple(_freeze(item) for item in value)
+    # The type tells apart equal values, such as 1 and True
+    return type(value).__name__, value
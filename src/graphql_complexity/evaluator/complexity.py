@@ -1,29 +1,134 @@
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from graphql import DocumentNode, TypeInfo, TypeInfoVisitor, parse, visit
+from graphql import DocumentNode
 
-from .visitor import ComplexityVisitor
+from .cache import CachedComplexity, default_parse_cache
+from .schema_index import SchemaTypeInfo
+from .stats import count_estimator_calls, measure
+from .utils import select_operation
+from .visitor import ComplexityVisitor, StreamingComplexityVisitor
+from .walker import walk
+from ..errors import ComplexityLimitError
 
 if TYPE_CHECKING:
     from graphql import GraphQLSchema
     from . import nodes
     from ..config import Config
     from ..estimators import ComplexityEstimator
+    from .cache import ComplexityCache, ParseCache
+    from .stats import AnalysisStats
 
 
-@lru_cache(maxsize=256)
-def _parse_cached(query: str) -> DocumentNode:
-    return parse(query)
+def _get_document(
+        query: str | DocumentNode,
+        operation_name: str | None,
+        parse_cache: ParseCache | None = None,
+        stats: AnalysisStats | None = None,
+) -> DocumentNode:
+    """Return the document to analyze, restricted to the operation if one is named.
+    Query texts are parsed through the parse cache, the default one if none is given."""
+    if isinstance(query, DocumentNode):
+        ast = query
+    else:
+        ast = (default_parse_cache if parse_cache is None else parse_cache).parse(query, stats)
+    if operation_name is not None:
+        ast = select_operation(ast, operation_name)
+    return ast
+
+
+def get_complexity(
+        query: str | DocumentNode,
+        schema: GraphQLSchema,
+        estimator: ComplexityEstimator,
+        config: Config | None = None,
+        *,
+        variables: dict[str, Any] | None = None,
+        operation_name: str | None = None,
+        max_complexity: int | None = None,
+        cache: ComplexityCache | None = None,
+        parse_cache: ParseCache | None = None,
+        stats: AnalysisStats | None = None,
+) -> int:
+    """Calculate the complexity of a query using the provided estimator.
+
+    The complexity is accumulated while traversing the document, without building
+    the complexity tree. Use `build_complexity_tree` to inspect how it is calculated.
+
+    The request `variables` are used to resolve arguments and directives given as
+    variables, such as the count of list fields. Missing variables take the default
+    value of their definition.
 
+    When `operation_name` is given, only that operation and the fragments reachable
+    from it are analyzed. Otherwise, the complexity of every operation is added up.
+
+    When `max_complexity` is given, ComplexityLimitError is raised if the complexity
+    exceeds it. The traversal stops as soon as the accumulated complexity goes over
+    the limit, so most of the document of an abusive query is never visited.
+
+    When a `cache` is given, the complexity of queries already calculated is reused.
+    Query texts are parsed once through the `parse_cache`, by default a cache shared
+    by every analysis (`graphql_complexity.evaluator.cache.default_parse_cache`).
+
+    When `stats` are given, the durations of the analysis phases and its counters are
+    added to them."""
+    arguments = (query, schema, estimator, config, variables, operation_name, max_complexity, parse_cache, stats)
+    if cache is None:
+        result = _calculate_complexity(*arguments)
+    else:
+        key = cache.key(query, schema, estimator, config, variables, operation_name, parse_cache)
+        result = cache.get(key)
+        # A lower bound is only enough to reject the query against the same or lower limits
+        if result is None or not (result.exact or (max_complexity is not None and result.complexity > max_complexity)):
+            result = _calculate_complexity(*arguments)
+            cache.set(key, result)
+            if stats is not None:
+                stats.cache_misses += 1
+        elif stats is not None:
+            stats.cache_hits += 1
+
+    if max_complexity is not None and result.complexity > max_complexity:
+        raise ComplexityLimitError(result.complexity, max_complexity, path=result.path)
+    return result.complexity
+
+
+def _calculate_complexity(
+        query: str | DocumentNode,
+        schema: GraphQLSchema,
+        estimator: ComplexityEstimator,
+        config: Config | None,
+        variables: dict[str, Any] | None,
+        operation_name: str | None,
+        max_complexity: int | None,
+        parse_cache: ParseCache | None = None,
+        stats: AnalysisStats | None = None,
+) -> CachedComplexity:
+    with measure(stats, "parse"):
+        ast = _get_document(query, operation_name, parse_cache, stats)
+    type_info = SchemaTypeInfo(schema)
 
-def get_complexity(query: str | DocumentNode, schema: GraphQLSchema, estimator: ComplexityEstimator, config: Config = None) -> int:
-    """Calculate the complexity of a query using the provided estimator."""
-    tree = build_complexity_tree(query, schema, estimator, config)
+    visitor = StreamingComplexityVisitor(
+        estimator=estimator,
+        type_info=type_info,
+        config=config,
+        variables=variables,
+        max_complexity=max_complexity,
+        schema=schema,
+    )
+    count_estimator_calls(visitor, stats)
+    with measure(stats, "traversal"):
+        walk(ast, visitor, type_info)
+    with measure(stats, "evaluation"):
+        complexity = visitor.complexity
+    if stats is not None:
+        stats.add_visitor_counters(visitor)
 
-    return tree.evaluate()
+    return CachedComplexity(
+        complexity=complexity,
+        exact=visitor.exceeded_path is None,
+        path=visitor.exceeded_path,
+    )
 
 
 def build_complexity_tree(
@@ -31,12 +136,28 @@ def build_complexity_tree(
         schema: GraphQLSchema,
         estimator: ComplexityEstimator,
         config: Config | None = None,
+        *,
+        variables: dict[str, Any] | None = None,
+        operation_name: str | None = None,
+        parse_cache: ParseCache | None = None,
+        stats: AnalysisStats | None = None,
 ) -> nodes.ComplexityNode:
-    """Calculate the complexity of a query using the provided estimator."""
-    ast = query if isinstance(query, DocumentNode) else _parse_cached(query)
-    type_info = TypeInfo(schema)
+    """Build the complexity tree of a query using the provided estimator and variables.
+    When `operation_name` is given, only that operation and its fragments are built.
+    Query texts are parsed through the `parse_cache`, the default one if none is given.
+    When `stats` are given, the durations of the analysis phases and its counters are
+    added to them."""
+    with measure(stats, "parse"):
+        ast = _get_document(query, operation_name, parse_cache, stats)
+    type_info = SchemaTypeInfo(schema)
 
-    visitor = ComplexityVisitor(estimator=estimator, type_info=type_info, config=config)
-    visit(ast, TypeInfoVisitor(type_info, visitor))
+    visitor = ComplexityVisitor(
+        estimator=estimator, type_info=type_info, config=config, variables=variables, schema=schema
+    )
+    count_estimator_calls(visitor, stats)
+    with measure(stats, "traversal"):
+        walk(ast, visitor, type_info)
+    if stats is not None:
+        stats.add_visitor_counters(visitor)
 
     return visitor.complexity_tree
@@ -8,10 +8,12 @@ from __future__ import annotations
 import dataclasses
 from typing import TYPE_CHECKING, Any
 
-from graphql import TypeInfo, TypeInfoVisitor, parse, visit
-
 from . import nodes
+from .complexity import _get_document
+from .schema_index import SchemaTypeInfo
+from .stats import count_estimator_calls, measure
 from .visitor import ComplexityVisitor
+from .walker import walk
 from ..estimators.simple import SimpleEstimator
 from ..estimators.directive import DirectivesEstimator
 
@@ -19,6 +21,8 @@ if TYPE_CHECKING:
     from graphql import GraphQLSchema
     from ..config import Config
     from ..estimators import ComplexityEstimator
+    from .cache import ParseCache
+    from .stats import AnalysisStats
 
 
 @dataclasses.dataclass
@@ -127,7 +131,10 @@ def _extract_estimator_details(estimator: ComplexityEstimator) -> dict[str, Any]
     elif isinstance(estimator, DirectivesEstimator):
         details["directive_name"] = estimator._DirectivesEstimator__directive_name
         details["missing_complexity"] = estimator._DirectivesEstimator__missing_complexity
-        details["complexity_map"] = estimator._DirectivesEstimator__complexity_map
+        details["complexity_map"] = {
+            f"{type_name}.{field_name}": complexity
+            for (type_name, field_name), complexity in estimator._DirectivesEstimator__complexity_map.items()
+        }
     else:
         details["type"] = type(estimator).__name__
 
@@ -135,62 +142,72 @@ def _extract_estimator_details(estimator: ComplexityEstimator) -> dict[str, Any]
 
 
 def _extract_field_breakdown(
-    node: nodes.ComplexityNode,
-    path: str = "",
-    breakdown: list[FieldExplanation] | None = None
+    tree: nodes.ComplexityNode,
+    totals: dict[int, int],
 ) -> list[FieldExplanation]:
-    """Extract field-by-field breakdown from the complexity tree."""
-    if breakdown is None:
-        breakdown = []
-
-    # Skip root node in the path
-    if isinstance(node, nodes.RootNode) and not path:
-        current_path = ""
-    else:
-        current_path = f"{path}.{node.name}" if path else node.name
-
-    # Calculate complexities
-    if isinstance(node, (nodes.Field, nodes.ListField)):
-        children_complexity = sum(child.evaluate() for child in node.children)
-
-        if isinstance(node, nodes.ListField):
-            multiplier = node.count
-            total_complexity = node.complexity + multiplier * children_complexity
-            field_explanation = FieldExplanation(
-                field_path=current_path,
-                field_name=node.name,
-                node_type="ListField",
-                field_complexity=node.complexity,
-                children_complexity=children_complexity,
-                total_complexity=total_complexity,
-                multiplier=multiplier,
-            )
+    """Extract field-by-field breakdown from the complexity tree.
+
+    `totals` holds the complexity of every node of the tree, as returned by
+    `nodes.evaluate_subtrees`, so no subtree is evaluated again. The tree is walked
+    in pre-order with an explicit stack."""
+    breakdown = []
+    stack: list[tuple[nodes.ComplexityNode, str]] = [(tree, "")]
+    while stack:
+        node, path = stack.pop()
+
+        # Skip root node in the path
+        if isinstance(node, nodes.RootNode) and not path:
+            current_path = ""
         else:
-            total_complexity = node.complexity + children_complexity
-            field_explanation = FieldExplanation(
-                field_path=current_path,
-                field_name=node.name,
-                node_type="Field",
-                field_complexity=node.complexity,
-                children_complexity=children_complexity,
-                total_complexity=total_complexity,
-            )
-
-        breakdown.append(field_explanation)
-    elif isinstance(node, nodes.FragmentSpreadNode):
-        field_explanation = FieldExplanation(
-            field_path=current_path,
+            current_path = f"{path}.{node.name}" if path else node.name
+
+        field_explanation = _explain_node(node, current_path, totals)
+        if field_explanation:
+            breakdown.append(field_explanation)
+
+        stack.extend((child, current_path) for child in reversed(node.children))
+
+    return breakdown
+
+
+def _explain_node(
+    node: nodes.ComplexityNode,
+    path: str,
+    totals: dict[int, int],
+) -> FieldExplanation | None:
+    """Return the explanation of a single node of the complexity tree."""
+    if isinstance(node, nodes.ListField):
+        return FieldExplanation(
+            field_path=path,
+            field_name=node.name,
+            node_type="ListField",
+            field_complexity=node.complexity,
+            children_complexity=sum(totals[id(child)] for child in node.children),
+            total_complexity=totals[id(node)],
+            multiplier=node.count,
+        )
+    if isinstance(node, nodes.Field):
+        return FieldExplanation(
+            field_path=path,
+            field_name=node.name,
+            node_type="Field",
+            field_complexity=node.complexity,
+            children_complexity=sum(totals[id(child)] for child in node.children),
+            total_complexity=totals[id(node)],
+        )
+    if isinstance(node, nodes.FragmentSpreadNode):
+        return FieldExplanation(
+            field_path=path,
             field_name=node.name,
             node_type="FragmentSpread",
             field_complexity=0,
-            children_complexity=node.evaluate(),
-            total_complexity=node.evaluate(),
+            children_complexity=totals[id(node)],
+            total_complexity=totals[id(node)],
             details={"fragment_name": node.name},
         )
-        breakdown.append(field_explanation)
-    elif isinstance(node, nodes.SkippedField):
-        field_explanation = FieldExplanation(
-            field_path=current_path,
+    if isinstance(node, nodes.SkippedField):
+        return FieldExplanation(
+            field_path=path,
             field_name=node.name,
             node_type="SkippedField",
             field_complexity=0,
@@ -198,10 +215,9 @@ def _extract_field_breakdown(
             total_complexity=0,
             details={"reason": "Field was skipped due to @skip or @include directive"},
         )
-        breakdown.append(field_explanation)
-    elif isinstance(node, nodes.MetaField):
-        field_explanation = FieldExplanation(
-            field_path=current_path,
+    if isinstance(node, nodes.MetaField):
+        return FieldExplanation(
+            field_path=path,
             field_name=node.name,
             node_type="MetaField",
             field_complexity=0,
@@ -209,20 +225,19 @@ def _extract_field_breakdown(
             total_complexity=0,
             details={"reason": "Meta fields like __typename have zero complexity"},
         )
-        breakdown.append(field_explanation)
-
-    # Recursively process children
-    for child in node.children:
-        _extract_field_breakdown(child, current_path, breakdown)
-
-    return breakdown
+    return None
 
 
 def explain_complexity(
     query: str,
     schema: GraphQLSchema,
     estimator: ComplexityEstimator,
-    config: Config = None
+    config: Config | None = None,
+    *,
+    variables: dict[str, Any] | None = None,
+    operation_name: str | None = None,
+    parse_cache: ParseCache | None = None,
+    stats: AnalysisStats | None = None,
 ) -> ExplanationResult:
     """
     Explain how the complexity of a GraphQL query is calculated.
@@ -238,6 +253,10 @@ def explain_complexity(
         schema: The GraphQL schema
         estimator: The complexity estimator to use
         config: Optional configuration for complexity calculation
+        variables: Optional request variables, used to resolve arguments given as variables
+        operation_name: Optional name of the operation to explain, ignoring the others
+        parse_cache: Optional ParseCache used to parse the query, the default one if not given
+        stats: Optional AnalysisStats the phase durations and counters are added to
 
     Returns:
         ExplanationResult containing detailed explanation of the complexity calculation
@@ -278,24 +297,35 @@ def explain_complexity(
         >>> print(f"Estimator: {explanation.estimator_name}")
     """
     # Build the complexity tree
-    ast = parse(query)
-    type_info = TypeInfo(schema)
-    visitor = ComplexityVisitor(estimator=estimator, type_info=type_info, config=config)
-    visit(ast, TypeInfoVisitor(type_info, visitor))
+    with measure(stats, "parse"):
+        ast = _get_document(query, operation_name, parse_cache, stats)
+    type_info = SchemaTypeInfo(schema)
+    visitor = ComplexityVisitor(
+        estimator=estimator, type_info=type_info, config=config, variables=variables, schema=schema
+    )
+    count_estimator_calls(visitor, stats)
+    with measure(stats, "traversal"):
+        walk(ast, visitor, type_info)
     tree = visitor.complexity_tree
+    if stats is not None:
+        stats.add_visitor_counters(visitor)
 
     # Extract estimator information
     estimator_name = type(estimator).__name__
     estimator_details = _extract_estimator_details(estimator)
 
+    # Evaluate every subtree once, to be reused by the representation and breakdown
+    with measure(stats, "evaluation"):
+        totals = nodes.evaluate_subtrees(tree)
+
     # Get tree representation
-    tree_representation = tree.describe()
+    tree_representation = tree.describe(totals=totals)
 
     # Get field breakdown
-    field_breakdown = _extract_field_breakdown(tree)
+    field_breakdown = _extract_field_breakdown(tree, totals)
 
     # Calculate total complexity
-    total_complexity = tree.evaluate()
+    total_complexity = totals[id(tree)]
 
     return ExplanationResult(
         total_complexity=total_complexity,
@@ -304,4 +334,4 @@ def explain_complexity(
         tree_representation=tree_representation,
         field_breakdown=field_breakdown,
         query=query,
-    )
\ No newline at end of file
+    )
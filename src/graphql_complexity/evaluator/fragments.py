@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from ..errors import FragmentCycleError, FragmentExpansionError
+
+FragmentsGraph = dict[str, tuple[int, dict[str, int]]]
+"""Number of fields and count of spreads of each fragment, by fragment name."""
+
+
+def sort_fragments(graph: FragmentsGraph) -> list[str]:
+    """Return the fragment names sorted so every fragment comes after the fragments
+    it spreads. Spreads of undefined fragments are ignored.
+
+    The graph is traversed with an explicit stack, visiting each fragment and spread
+    once, and FragmentCycleError is raised as soon as a cycle is found."""
+    order: list[str] = []
+    sorted_: dict[str, bool] = {}  # False while the fragment is in the stack
+    for start in graph:
+        if start in sorted_:
+            continue
+        sorted_[start] = False
+        stack = [(start, iter(graph[start][1]))]
+        while stack:
+            name, spreads = stack[-1]
+            for spread in spreads:
+                if spread not in graph:
+                    continue
+                state = sorted_.get(spread)
+                if state is None:
+                    sorted_[spread] = False
+                    stack.append((spread, iter(graph[spread][1])))
+                    break
+                if state is False:
+                    raise _cycle_error(spread, [n for n, _ in stack])
+            else:
+                stack.pop()
+                sorted_[name] = True
+                order.append(name)
+    return order
+
+
+def check_fragments_expansion(
+        graph: FragmentsGraph,
+        order: list[str],
+        fields: int,
+        spreads: dict[str, int],
+        max_expansion: int,
+) -> None:
+    """Raise FragmentExpansionError if the given fields and spreads expand to more than
+    `max_expansion` fields once every fragment is inlined. `order` must be the result
+    of `sort_fragments`, so the size of each fragment is calculated only once."""
+    sizes: dict[str, int] = {}
+    for name in order:
+        fragment_fields, fragment_spreads = graph[name]
+        # Sizes are capped so they do not grow exponentially with the fragments nesting.
+        sizes[name] = min(max_expansion + 1, _expand(fragment_fields, fragment_spreads, sizes))
+
+    if _expand(fields, spreads, sizes) > max_expansion:
+        raise FragmentExpansionError(
+            f"Fragments expand to more than {max_expansion} fields."
+        )
+
+
+def _expand(fields: int, spreads: dict[str, int], sizes: dict[str, int]) -> int:
+    return fields + sum(count * sizes.get(name, 0) for name, count in spreads.items())
+
+
+def _cycle_error(name: str, stack: list[str]) -> FragmentCycleError:
+    via = stack[stack.index(name) + 1:]
+    via_names = f" via {', '.join(repr(n) for n in via)}" if via else ""
+    return FragmentCycleError(f"Cannot spread fragment {name!r} within itself{via_names}.")
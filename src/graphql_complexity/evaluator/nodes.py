@@ -2,35 +2,51 @@ from __future__ import annotations
 
 import dataclasses
 import logging
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterable
 
 from graphql import GraphQLList
 
-from graphql_complexity.evaluator.utils import get_node_argument_value, is_meta_type
+from ..errors import FragmentCycleError
+from .utils import get_node_argument_value, is_meta_type
 
 if TYPE_CHECKING:
-    from graphql import FieldNode, TypeInfo
-    from graphql_complexity.config import Config
+    from graphql import FieldNode, GraphQLField
+    from ..config import Config
+    from .sizing import Sizes
+    from .utils import FieldTypeInfo
 
 logger = logging.getLogger(__name__)
 
+_EVALUATING = object()
 
-@dataclasses.dataclass(kw_only=True)
+
+@dataclasses.dataclass(kw_only=True, slots=True)
 class ComplexityNode:
+    """Node of the complexity tree. Nodes are slotted, as a tree holds one of them per
+    field of the query and instance dicts would dominate its memory.
+
+    Subclasses define how their complexity is calculated through `_evaluated_children`
+    and `_combine`, so the tree is evaluated iteratively by `evaluate_tree`."""
     name: str
-    parent: 'ComplexityNode' = None
+    parent: 'ComplexityNode | None' = None
     children: list['ComplexityNode'] = dataclasses.field(default_factory=list)
 
     def evaluate(self) -> int:
-        raise NotImplementedError
-
-    def describe(self, depth=0) -> str:
-        """Return a friendly representation of the node and its children complexity."""
-        return (
-            f"{chr(9) * depth}{self.name} ({self.__class__.__name__}) = {self.evaluate()}" +
-            f"{chr(10) if self.children else ''}" +
-            '\n'.join(c.describe(depth=depth+1) for c in self.children)
-        )
+        """Return the complexity of the node, including its children."""
+        return evaluate_tree(self)
+
+    def describe(self, depth=0, totals: dict[int, int] | None = None) -> str:
+        """Return a friendly representation of the node and its children complexity.
+        `totals` can be given to reuse the result of `evaluate_subtrees` for this node."""
+        if totals is None:
+            totals = evaluate_subtrees(self)
+        lines = []
+        stack = [(self, depth)]
+        while stack:
+            node, level = stack.pop()
+            lines.append(f"{chr(9) * level}{node.name} ({node.__class__.__name__}) = {totals[id(node)]}")
+            stack.extend((child, level + 1) for child in reversed(node.children))
+        return "\n".join(lines)
 
     def add_child(self, node: 'ComplexityNode') -> None:
         """Add a child to the current node."""
@@ -39,98 +55,187 @@ class ComplexityNode:
         self.children.append(node)
         node.parent = self
 
+    def _evaluated_children(self) -> Iterable[ComplexityNode]:
+        """Return the nodes whose complexity is needed to evaluate this node."""
+        return self.children
 
-class RootNode(ComplexityNode):
-    def evaluate(self) -> int:
-        return sum(child.evaluate() for child in self.children)
+    def _combine(self, children_complexity: int) -> int:
+        """Return the complexity of the node given the sum of its evaluated children."""
+        raise NotImplementedError
 
 
-@dataclasses.dataclass
-class FragmentSpreadNode(ComplexityNode):
-    fragments_definition: dict
+class RootNode(ComplexityNode):
+    __slots__ = ()
 
-    def evaluate(self):
-        fragment = self.fragments_definition.get(self.name)
-        if not fragment:
-            return 0
-        return fragment.evaluate()
+    def _combine(self, children_complexity: int) -> int:
+        return children_complexity
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
+class FragmentSpreadNode(ComplexityNode):
+    """Spread of a fragment, whose complexity is the one of the fragment definition.
+    The complexity of each fragment is stored in `fragments_complexity`, which is
+    shared by every spread of the document, so fragments are evaluated only once.
+    Fragments spread where `sizes` apply to their fields are evaluated once per sizes."""
+    fragments_definition: dict
+    fragments_complexity: dict = dataclasses.field(default_factory=dict)
+    sizes: Sizes | None = None
+
+    @property
+    def key(self) -> str | tuple[str, Sizes]:
+        """Return the key of the fragment spread: its name, and the sizes of its fields, if any."""
+        return self.name if self.sizes is None else (self.name, self.sizes)
+
+    def _evaluated_children(self) -> Iterable[ComplexityNode]:
+        key = self.key
+        complexity = self.fragments_complexity.get(key)
+        if complexity is _EVALUATING:
+            raise FragmentCycleError(f"Cannot spread fragment {self.name!r} within itself.")
+        if complexity is not None:
+            return ()
+        self.fragments_complexity[key] = _EVALUATING
+        fragment = self.fragments_definition.get(key)
+        return (fragment,) if fragment else ()
+
+    def _combine(self, children_complexity: int) -> int:
+        key = self.key
+        complexity = self.fragments_complexity[key]
+        if complexity is _EVALUATING:
+            complexity = self.fragments_complexity[key] = children_complexity
+        return complexity
+
+
+@dataclasses.dataclass(slots=True)
 class Field(ComplexityNode):
     complexity: int
 
-    def evaluate(self) -> int:
-        return self.complexity + sum(child.evaluate() for child in self.children)
+    def _combine(self, children_complexity: int) -> int:
+        return self.complexity + children_complexity
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ListField(Field):
     count: int
 
-    def evaluate(self) -> int:
-        return self.complexity + self.count * sum(child.evaluate() for child in self.children)
+    def _combine(self, children_complexity: int) -> int:
+        return self.complexity + self.count * children_complexity
 
 
-@dataclasses.dataclass
 class SkippedField(ComplexityNode):
-    wraps: ComplexityNode
-
-    @classmethod
-    def wrap(cls, node: ComplexityNode):
-        wrapper = cls(
-            name=node.name,
-            parent=node.parent,
-            children=node.children,
-            wraps=node,
-        )
-        node.parent.children.remove(node)
-        node.parent.add_child(wrapper)
-        return wrapper
+    """Field excluded by the 'skip' or 'include' directives. Its selections are not
+    traversed, so it never has children."""
+    __slots__ = ()
 
-    def evaluate(self) -> int:
+    def _evaluated_children(self) -> Iterable[ComplexityNode]:
+        return ()
+
+    def _combine(self, children_complexity: int) -> int:
         return 0
 
 
 class MetaField(ComplexityNode):
+    __slots__ = ()
 
-    def evaluate(self) -> int:
+    def _evaluated_children(self) -> Iterable[ComplexityNode]:
+        return ()
+
+    def _combine(self, children_complexity: int) -> int:
         return 0
 
 
+def evaluate_subtrees(node: ComplexityNode) -> dict[int, int]:
+    """Return the complexity of every node of the tree rooted at the given node, keyed
+    by node id. Each node is evaluated once, so the whole tree is evaluated in linear time."""
+    totals: dict[int, int] = {}
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if id(current) not in totals:
+            # Children of meta fields are not part of their parent evaluation
+            evaluate_tree(current, totals)
+        stack.extend(current.children)
+    return totals
+
+
+def evaluate_tree(node: ComplexityNode, totals: dict[int, int] | None = None) -> int:
+    """Return the complexity of the tree rooted at the given node.
+
+    The tree is evaluated in post-order with an explicit stack instead of recursion,
+    so its depth is not bounded by the interpreter recursion limit. When `totals` is
+    given, the complexity of every evaluated node is stored in it, keyed by node id."""
+    # Frames hold a node, the iterator of its children left to evaluate and their complexity
+    stack: list[list[Any]] = [[node, iter(node._evaluated_children()), 0]]
+    while True:
+        frame = stack[-1]
+        child = next(frame[1], None)
+        if child is not None:
+            stack.append([child, iter(child._evaluated_children()), 0])
+            continue
+
+        stack.pop()
+        complexity = frame[0]._combine(frame[2])
+        if totals is not None:
+            totals[id(frame[0])] = complexity
+        if not stack:
+            return complexity
+        stack[-1][2] += complexity
+
+
 def build_node(
     node: FieldNode,
-    type_info: TypeInfo,
+    type_info: FieldTypeInfo,
     complexity: int,
     variables: dict[str, Any],
     config: Config,
+    count: int | None = None,
 ) -> ComplexityNode:
-    """Build a complexity node from a field node."""
+    """Build a complexity node from a field node. When the `count` its selections are
+    multiplied by is given, it is used instead of the count argument of list fields."""
     type_ = type_info.get_type()
     if is_meta_type(type_, node):
         return MetaField(name=node.name.value)
-    if isinstance(type_, GraphQLList):
-        return build_list_node(node, complexity, variables, config)
+    if count is not None:
+        if count != 1 or isinstance(type_, GraphQLList):
+            return ListField(name=node.name.value, complexity=complexity, count=count)
+    elif isinstance(type_, GraphQLList):
+        return build_list_node(node, complexity, variables, config, type_info.get_field_def())
     return Field(
         name=node.name.value,
         complexity=complexity,
     )
 
 
-def build_list_node(node: FieldNode, complexity: int, variables: dict[str, Any], config: Config) -> ListField:
+def build_list_node(
+    node: FieldNode,
+    complexity: int,
+    variables: dict[str, Any],
+    config: Config,
+    field_def: GraphQLField | None = None,
+) -> ListField:
     """Build a list complexity node from a field node."""
-    if config.count_arg_name:
-        try:
-            count = int(
-                get_node_argument_value(node=node, arg_name=config.count_arg_name, variables=variables)
-            )
-        except ValueError:
-            logger.debug("Missing or invalid value for argument '%s' in node '%s'", config.count_arg_name, node)
-            count = config.count_missing_arg_value
-    else:
-        count = 1
     return ListField(
         name=node.name.value,
         complexity=complexity,
-        count=count,
+        count=get_list_count(node, variables, config, field_def),
     )
+
+
+def get_list_count(
+    node: FieldNode,
+    variables: dict[str, Any],
+    config: Config,
+    field_def: GraphQLField | None = None,
+) -> int:
+    """Return the number of items a list field is expected to return. A count argument
+    missing from the node takes its default value in the field definition, if given."""
+    if not config.count_arg_name:
+        return 1
+    try:
+        return int(
+            get_node_argument_value(
+                node=node, arg_name=config.count_arg_name, variables=variables, field_def=field_def
+            )
+        )
+    except (TypeError, ValueError):
+        logger.debug("Missing or invalid value for argument '%s' in node '%s'", config.count_arg_name, node)
+        return config.count_missing_arg_value
@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import dataclasses
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple, Union
+
+from graphql import (
+    SKIP,
+    BooleanValueNode,
+    GraphQLIncludeDirective,
+    GraphQLList,
+    GraphQLSkipDirective,
+    VariableNode,
+)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - NumPy is an optional dependency
+    numpy = None  # type: ignore[assignment]
+
+from .complexity import _get_document
+from .nodes import get_list_count
+from .schema_index import SchemaTypeInfo
+from .utils import is_meta_type
+from .visitor import _BaseComplexityVisitor
+from .walker import walk
+from ..config import Config
+
+if TYPE_CHECKING:
+    from graphql import DocumentNode, FieldNode, GraphQLSchema, SelectionNode
+    from ..estimators import ComplexityEstimator
+    from .cache import ComplexityCache, ParseCache
+    from .utils import FieldTypeInfo
+
+# A count is either known when compiling or the name of the variable holding it
+Count = Union[int, str]
+# A condition holds when the truthiness of the variable matches the expected value
+Condition = tuple[str, bool]
+
+_INT64_MAX = 2 ** 63 - 1
+
+
+class PlanSegment(NamedTuple):
+    """Flat arrays describing the selections of the operations or of a fragment.
+
+    Entries are stored in the order they were visited, so every entry comes after
+    its parent. Entry `i` is the child of entry `parents[i]`, where -1 is the root
+    of the segment. Spreads hold the index of the fragment in the plan, or -1."""
+    parents: tuple[int, ...]
+    costs: tuple[int, ...]
+    counts: tuple[Count, ...]
+    conditions: tuple[tuple[Condition, ...], ...]
+    spreads: tuple[int, ...]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CostPlan:
+    """Complexity of a document, compiled to be evaluated for any set of variables.
+
+    The costs given by the estimator are calculated once. List counts and
+    `@skip`/`@include` conditions given as variables are kept as references to them,
+    and resolved by `evaluate`, which only walks the flat arrays of the plan.
+    Fragments are stored in dependency order, so each one is evaluated once.
+
+    Plans only hold plain values, so they can be cached, pickled and shared
+    between processes. `evaluate_many` evaluates a plan for many sets of variables
+    at once, using NumPy when it is installed.
+
+    Usage:
+        plan = compile_cost_plan(query, schema, estimator)
+        plan.evaluate({"first": 10})
+        plan.evaluate_many([{"first": 10}, {"first": 20}])
+    """
+    fragments: tuple[PlanSegment, ...]
+    operations: PlanSegment
+    defaults: dict[str, Any] = dataclasses.field(default_factory=dict)
+    count_missing_arg_value: int = 1
+
+    def evaluate(self, variables: dict[str, Any] | None = None) -> int:
+        """Return the complexity of the document for the given variables.
+        Variables missing from them take the default value of their definition."""
+        return self._evaluate(self._with_defaults(variables))
+
+    def evaluate_many(self, bindings: Iterable[dict[str, Any] | None]) -> list[int]:
+        """Return the complexity of the document for each set of variables, in order.
+
+        With NumPy, each entry of the plan is evaluated once for all the sets of
+        variables, as operations over columns of 64-bit integers. Without it, or when
+        the complexity could overflow them, the sets of variables are evaluated one
+        after the other."""
+        resolved = [self._with_defaults(variables) for variables in bindings]
+        if numpy is None or not resolved:
+            return [self._evaluate(variables) for variables in resolved]
+        columns = _VariableColumns(resolved, self.count_missing_arg_value)
+        if not self._fits_columns(columns):
+            return [self._evaluate(variables) for variables in resolved]
+        totals: list[Any] = []
+        for fragment in self.fragments:
+            totals.append(self._evaluate_segment_columns(fragment, columns, totals))
+        return self._evaluate_segment_columns(self.operations, columns, totals).tolist()
+
+    def _fits_columns(self, columns: _VariableColumns) -> bool:
+        """Whether every intermediate value of `_evaluate_segment_columns` fits in 64-bit
+        integers, bounding them with the largest absolute costs and counts."""
+        try:
+            bounds: list[int] = []
+            for fragment in self.fragments:
+                bounds.append(_bound_segment(fragment, columns, bounds))
+            return _bound_segment(self.operations, columns, bounds) <= _INT64_MAX
+        except OverflowError:
+            return False
+
+    def _with_defaults(self, variables: dict[str, Any] | None) -> dict[str, Any]:
+        return {**self.defaults, **variables} if variables else self.defaults
+
+    def _evaluate(self, variables: dict[str, Any]) -> int:
+        totals: list[int] = []
+        for fragment in self.fragments:
+            totals.append(self._evaluate_segment(fragment, variables, totals))
+        return self._evaluate_segment(self.operations, variables, totals)
+
+    def _evaluate_segment(self, segment: PlanSegment, variables: dict[str, Any], totals: list[int]) -> int:
+        """Add up the cost of the entries, scaled by the counts of their ancestors.
+        Scales are stored shifted by one, so the root of the segment is at index 0."""
+        scales = [1]
+        total = 0
+        for parent, cost, count, conditions, spread in zip(*segment):
+            scale = scales[parent + 1]
+            if scale and conditions and not _conditions_hold(conditions, variables):
+                scale = 0
+            if scale:
+                total += scale * (cost + (totals[spread] if spread >= 0 else 0))
+                if isinstance(count, str):
+                    count = _get_count(variables.get(count), self.count_missing_arg_value)
+                scale *= count
+            scales.append(scale)
+        return total
+
+    @staticmethod
+    def _evaluate_segment_columns(segment: PlanSegment, columns: _VariableColumns, totals: list[Any]) -> Any:
+        """Same as `_evaluate_segment`, where scales and totals are columns with a row
+        per set of variables. Entries without count nor conditions share their parent column."""
+        scales = [columns.ones]
+        total = columns.zeros()
+        for parent, cost, count, conditions, spread in zip(*segment):
+            scale = scales[parent + 1]
+            if conditions:
+                scale = scale * columns.conditions(conditions)
+            if spread >= 0:
+                total += scale * (cost + totals[spread])
+            elif cost:
+                total += scale * cost
+            if isinstance(count, str):
+                scale = scale * columns.count(count)
+            elif count != 1:
+                scale = scale * count
+            scales.append(scale)
+        return total
+
+
+class _VariableColumns:
+    """Columns with the value of each variable for every set of variables, built once per variable."""
+
+    def __init__(self, bindings: list[dict[str, Any]], count_missing_arg_value: int):
+        self.bindings = bindings
+        self.count_missing_arg_value = count_missing_arg_value
+        self.ones = numpy.ones(len(bindings), dtype=numpy.int64)
+        self._counts: dict[str, Any] = {}
+        self._conditions: dict[tuple[Condition, ...], Any] = {}
+
+    def zeros(self):
+        return numpy.zeros(len(self.bindings), dtype=numpy.int64)
+
+    def count(self, name: str):
+        column = self._counts.get(name)
+        if column is None:
+            column = self._counts[name] = numpy.fromiter(
+                (_get_count(variables.get(name), self.count_missing_arg_value) for variables in self.bindings),
+                dtype=numpy.int64,
+                count=len(self.bindings),
+            )
+        return column
+
+    def conditions(self, conditions: tuple[Condition, ...]):
+        column = self._conditions.get(conditions)
+        if column is None:
+            column = self._conditions[conditions] = numpy.fromiter(
+                (_conditions_hold(conditions, variables) for variables in self.bindings),
+                dtype=numpy.int64,
+                count=len(self.bindings),
+            )
+        return column
+
+
+def _bound_segment(segment: PlanSegment, columns: _VariableColumns, bounds: list[int]) -> int:
+    """Upper bound of the absolute value of a segment, ignoring its conditions."""
+    scales = [1]
+    total = 0
+    for parent, cost, count, _conditions, spread in zip(*segment):
+        scale = scales[parent + 1]
+        total += scale * (abs(cost) + (bounds[spread] if spread >= 0 else 0))
+        if isinstance(count, str):
+            column = columns.count(count)
+            count = max(-int(column.min()), int(column.max()))
+        scales.append(scale * abs(count))
+    return total
+
+
+def _get_count(value: Any, count_missing_arg_value: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return count_missing_arg_value
+
+
+def _conditions_hold(conditions: tuple[Condition, ...], variables: dict[str, Any]) -> bool:
+    for name, expected in conditions:
+        if bool(variables.get(name)) is not expected:
+            return False
+    return True
+
+
+class CostPlanVisitor(_BaseComplexityVisitor):
+    """Visitor that compiles the document into a `CostPlan`.
+
+    It follows the same traversal as `ComplexityVisitor`, but instead of building
+    complexity nodes, it appends an entry per field, inline fragment with conditions
+    and fragment spread to the segment being visited."""
+
+    def __init__(self, estimator: ComplexityEstimator, type_info: FieldTypeInfo, config: Config | None = None):
+        if estimator.uses_variables:
+            raise ValueError("Cost plans can not be compiled for estimators that use variables")
+        if estimator.sizes_lists:
+            raise ValueError("Cost plans can not be compiled for estimators that size lists")
+        if config is not None and config.relay_connections:
+            raise ValueError("Cost plans can not be compiled with Relay connections")
+        super().__init__(estimator=estimator, type_info=type_info, config=config)
+        self._segments: dict[str, _SegmentBuilder] = {}
+        self._operations = _SegmentBuilder()
+        self._segment = self._operations
+        self._parents: list[int] = [-1]
+
+    @property
+    def cost_plan(self) -> CostPlan:
+        """Return the plan of the document after visiting it."""
+        indexes = {name: index for index, name in enumerate(self.fragments_order)}
+        return CostPlan(
+            fragments=tuple(self._segments[name].build(indexes) for name in self.fragments_order),
+            operations=self._operations.build(indexes),
+            defaults=self.variables,
+            count_missing_arg_value=self.config.count_missing_arg_value,
+        )
+
+    def _estimates_field(self, node: FieldNode) -> bool:
+        """Fields excluded by conditions given as variables are estimated, as the plan
+        keeps their cost for the sets of variables that include them."""
+        return not node.name.value.startswith("__") and _get_conditions(node) is not None
+
+    def enter_field(self, node, key, parent, path, ancestors):
+        conditions = _get_conditions(node)
+        if conditions is None:
+            return SKIP
+        type_ = self.type_info.get_type()
+        if is_meta_type(type_, node):
+            return SKIP
+
+        self._fields_count += 1
+        cost = self.get_field_complexity(node, self.type_info, path)
+        count = self._get_count(node) if isinstance(type_, GraphQLList) else 1
+        self._parents.append(self._segment.add(self._parents[-1], cost, count, conditions))
+
+    def leave_field(self, node, key, parent, path, ancestors):
+        self._parents.pop()
+
+    def enter_inline_fragment(self, node, key, parent, path, ancestors):
+        conditions = _get_conditions(node)
+        if conditions is None:
+            return SKIP
+        parent_index = self._parents[-1]
+        if conditions:
+            parent_index = self._segment.add(parent_index, 0, 1, conditions)
+        self._parents.append(parent_index)
+
+    def leave_inline_fragment(self, node, key, parent, path, ancestors):
+        self._parents.pop()
+
+    def enter_fragment_spread(self, node, key, parent, path, ancestors):
+        conditions = _get_conditions(node)
+        if conditions is None:
+            return SKIP
+        super().enter_fragment_spread(node, key, parent, path, ancestors)
+        self._segment.add(self._parents[-1], 0, 1, conditions, spread=node.name.value)
+
+    def enter_fragment_definition(self, node, key, parent, path, ancestors):
+        super().enter_fragment_definition(node, key, parent, path, ancestors)
+        self._segment = self._segments[node.name.value] = _SegmentBuilder()
+
+    def leave_fragment_definition(self, node, key, parent, path, ancestors):
+        super().leave_fragment_definition(node, key, parent, path, ancestors)
+        self._segment = self._operations
+
+    def _get_count(self, node: FieldNode) -> Count:
+        """Return the count of a list field, or the variable holding it."""
+        arg = next((arg for arg in node.arguments if arg.name.value == self.config.count_arg_name), None)
+        if arg is not None and isinstance(arg.value, VariableNode):
+            return arg.value.name.value
+        return get_list_count(node, {}, self.config, self.type_info.get_field_def())
+
+
+class _SegmentBuilder:
+    """Columns of a segment while it is being compiled."""
+
+    def __init__(self):
+        self.parents: list[int] = []
+        self.costs: list[int] = []
+        self.counts: list[Count] = []
+        self.conditions: list[tuple[Condition, ...]] = []
+        self.spreads: list[str | None] = []
+
+    def add(self, parent: int, cost: int, count: Count, conditions: tuple[Condition, ...], spread: str | None = None) -> int:
+        """Append an entry and return its index."""
+        self.parents.append(parent)
+        self.costs.append(cost)
+        self.counts.append(count)
+        self.conditions.append(conditions)
+        self.spreads.append(spread)
+        return len(self.parents) - 1
+
+    def build(self, fragments: dict[str, int]) -> PlanSegment:
+        """Return the segment, with the spreads given by the index of their fragment."""
+        return PlanSegment(
+            parents=tuple(self.parents),
+            costs=tuple(self.costs),
+            counts=tuple(self.counts),
+            conditions=tuple(self.conditions),
+            spreads=tuple(-1 if name is None else fragments.get(name, -1) for name in self.spreads),
+        )
+
+
+def _get_conditions(node: SelectionNode) -> tuple[Condition, ...] | None:
+    """Return the 'skip' and 'include' conditions given as variables of a selection.
+    Return None if the selection is excluded by a literal condition."""
+    conditions = []
+    for directive in node.directives or ():
+        name = directive.name.value
+        if name not in (GraphQLIncludeDirective.name, GraphQLSkipDirective.name):
+            continue
+        expected = name == GraphQLIncludeDirective.name
+        value = next((arg.value for arg in directive.arguments if arg.name.value == "if"), None)
+        if isinstance(value, VariableNode):
+            conditions.append((value.name.value, expected))
+        elif isinstance(value, BooleanValueNode) and value.value is not expected:
+            return None
+    return tuple(conditions)
+
+
+def compile_cost_plan(
+        query: str | DocumentNode,
+        schema: GraphQLSchema,
+        estimator: ComplexityEstimator,
+        config: Config | None = None,
+        *,
+        operation_name: str | None = None,
+        cache: ComplexityCache | None = None,
+        parse_cache: ParseCache | None = None,
+) -> CostPlan:
+    """Compile the complexity of a query into a plan to be evaluated per set of variables.
+
+    The document is visited once, and `CostPlan.evaluate` returns the same complexity
+    as `get_complexity` for the given variables, without visiting it again.
+    Estimators that use variables can not be compiled, as their costs depend on them.
+
+    When a `cache` is given, plans already compiled for the query are reused. Query
+    texts are parsed through the `parse_cache`, the default one if none is given."""
+    if cache is not None:
+        key = ("plan", cache.key(query, schema, estimator, config, operation_name=operation_name))
+        plan = cache.get(key)
+        if plan is None:
+            plan = compile_cost_plan(
+                query, schema, estimator, config, operation_name=operation_name, parse_cache=parse_cache
+            )
+            cache.set(key, plan)
+        return plan
+
+    ast = _get_document(query, operation_name, parse_cache)
+    type_info = SchemaTypeInfo(schema)
+
+    visitor = CostPlanVisitor(estimator=estimator, type_info=type_info, config=config)
+    walk(ast, visitor, type_info)
+
+    return visitor.cost_plan
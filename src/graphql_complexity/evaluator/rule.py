@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable
+
+from graphql import SKIP, ValidationRule
+
+from .schema_index import SchemaTypeInfo
+from .stats import count_estimator_calls, measure
+from .visitor import StreamingComplexityVisitor
+from ..errors import ComplexityLimitError, FragmentCycleError, FragmentExpansionError
+
+if TYPE_CHECKING:
+    from graphql import ValidationContext
+    from ..config import Config
+    from ..estimators import ComplexityEstimator
+    from .stats import AnalysisStats
+
+
+class _ValidationComplexityVisitor(StreamingComplexityVisitor):
+    """Streaming visitor that reports the complexity of the document to a validation context.
+
+    The validation context is used as the type information, as it follows the types of
+    the nodes visited by every validation rule. Operations other than `operation_name`,
+    when given, are skipped."""
+
+    def __init__(
+            self,
+            context: ValidationContext,
+            estimator: ComplexityEstimator,
+            config: Config | None,
+            variables: dict[str, Any] | None,
+            operation_name: str | None,
+            max_complexity: int | None,
+            on_complexity: Callable[[int], Any] | None,
+            stats: AnalysisStats | None = None,
+    ):
+        super().__init__(
+            estimator=estimator,
+            type_info=context,
+            config=config,
+            variables=variables,
+            max_complexity=max_complexity,
+            schema=context.schema,
+        )
+        self.context = context
+        self.operation_name = operation_name
+        self.on_complexity = on_complexity
+        self.stats = stats
+        count_estimator_calls(self, stats)
+
+    def enter_operation_definition(self, node, key, parent, path, ancestors):
+        if not self._visits_operation(node):
+            return SKIP
+
+    def _visits_operation(self, node):
+        return self.operation_name is None or (node.name is not None and node.name.value == self.operation_name)
+
+    def leave_document(self, node, key, parent, path, ancestors):
+        try:
+            super().leave_document(node, key, parent, path, ancestors)
+        except FragmentCycleError:
+            # Fragment cycles are reported by the NoFragmentCyclesRule of graphql-core
+            return
+        except FragmentExpansionError as error:
+            self.context.report_error(error)
+            return
+        self._report_complexity()
+
+    def _visit_fragment_variants(self, type_info):
+        """Visit the fragment variants following their types with a `SchemaTypeInfo`, as the
+        validation context only follows the document visited by the validation rules."""
+        type_info = SchemaTypeInfo(self.context.schema)
+        self.type_info = self.list_sizer.type_info = type_info
+        try:
+            super()._visit_fragment_variants(type_info)
+        finally:
+            self.type_info = self.list_sizer.type_info = self.context
+
+    def _exceeded(self, node, ancestors):
+        """Report the lower bound reached once the limit is exceeded, as the
+        document is not visited by this rule anymore."""
+        result = super()._exceeded(node, ancestors)
+        self._report_complexity()
+        return result
+
+    def _report_complexity(self):
+        with measure(self.stats, "evaluation"):
+            complexity = self.complexity
+        if self.stats is not None:
+            self.stats.add_visitor_counters(self)
+        if self.on_complexity is not None:
+            self.on_complexity(complexity)
+        if self.max_complexity is not None and complexity > self.max_complexity:
+            self.context.report_error(ComplexityLimitError(complexity, self.max_complexity, path=self.exceeded_path))
+
+
+def build_complexity_validation_rule(
+        estimator: ComplexityEstimator,
+        config: Config | None = None,
+        *,
+        variables: dict[str, Any] | None = None,
+        operation_name: str | None = None,
+        max_complexity: int | None = None,
+        on_complexity: Callable[[int], Any] | None = None,
+        stats: AnalysisStats | None = None,
+) -> type[ValidationRule]:
+    """Build a graphql-core validation rule that calculates the complexity of the document.
+
+    The rule is visited by `graphql.validate` in the same traversal as the other rules,
+    sharing their type information, so the document is not visited again to calculate
+    its complexity. It reports a `ComplexityLimitError` when the complexity exceeds
+    `max_complexity`, and passes the complexity to `on_complexity` once calculated.
+    If the limit is exceeded, the traversal of the rule stops and the lower bound
+    reached is passed instead. When `stats` are given, the counters of the analysis
+    and its evaluation time are added to them, as the traversal is shared.
+
+    Usage:
+        rule = build_complexity_validation_rule(estimator, max_complexity=100)
+        errors = validate(schema, document, [*specified_rules, rule])
+    """
+
+    class ComplexityValidationRule(ValidationRule):
+        def __init__(self, context: ValidationContext):
+            super().__init__(context)
+            self.visitor = _ValidationComplexityVisitor(
+                context, estimator, config, variables, operation_name, max_complexity, on_complexity, stats
+            )
+
+        def get_enter_leave_for_kind(self, kind):
+            return self.visitor.get_enter_leave_for_kind(kind)
+
+    return ComplexityValidationRule
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import dataclasses
+import weakref
+from typing import TYPE_CHECKING, Any, Callable
+
+from graphql import (
+    GraphQLInterfaceType,
+    GraphQLList,
+    GraphQLObjectType,
+    GraphQLUnionType,
+    Node,
+    SchemaMetaFieldDef,
+    TypeMetaFieldDef,
+    TypeNameMetaFieldDef,
+    get_named_type,
+    get_nullable_type,
+)
+
+if TYPE_CHECKING:
+    from graphql import (
+        GraphQLCompositeType,
+        GraphQLField,
+        GraphQLNamedType,
+        GraphQLOutputType,
+        GraphQLSchema,
+    )
+
+_COMPOSITE_TYPES = (GraphQLObjectType, GraphQLInterfaceType, GraphQLUnionType)
+
+_schema_indexes: weakref.WeakKeyDictionary[GraphQLSchema, SchemaIndex] = weakref.WeakKeyDictionary()
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FieldInfo:
+    """Precomputed information of a field of a composite type."""
+    definition: GraphQLField
+    type: GraphQLOutputType
+
+
+class SchemaIndex:
+    """Fields of every composite type of a schema, by type name and field name.
+
+    The index is built once per schema by `get_schema_index`, including the
+    `__typename` meta field of every composite type and the `__schema` and `__type`
+    meta fields of the query type, so looking up the field of a node is a couple
+    of dict probes.
+
+    `connections` holds the Relay connection types of the schema, with the fields
+    holding their items, by type name.
+
+    Indexes are cached in a `WeakKeyDictionary` by schema, so they do not hold a
+    reference to their schema, which would keep it alive."""
+
+    def __init__(self, schema: GraphQLSchema):
+        self.types: dict[str, dict[str, FieldInfo]] = {}
+        self.connections: dict[str, tuple[str, ...]] = {}
+        typename_info = _build_field_info(TypeNameMetaFieldDef)
+        for name, type_ in schema.type_map.items():
+            if isinstance(type_, (GraphQLObjectType, GraphQLInterfaceType)):
+                fields = {field_name: _build_field_info(field) for field_name, field in type_.fields.items()}
+                connection_fields = _get_connection_fields(type_)
+                if connection_fields:
+                    self.connections[name] = connection_fields
+            elif isinstance(type_, GraphQLUnionType):
+                fields = {}
+            else:
+                continue
+            fields["__typename"] = typename_info
+            self.types[name] = fields
+        if schema.query_type:
+            query_fields = self.types[schema.query_type.name]
+            query_fields["__schema"] = _build_field_info(SchemaMetaFieldDef)
+            query_fields["__type"] = _build_field_info(TypeMetaFieldDef)
+
+    def get_field(self, parent_type: GraphQLNamedType | None, field_name: str) -> FieldInfo | None:
+        """Return the information of the field of the given type, if it exists."""
+        if parent_type is None:
+            return None
+        fields = self.types.get(parent_type.name)
+        return fields.get(field_name) if fields else None
+
+
+def get_schema_index(schema: GraphQLSchema) -> SchemaIndex:
+    """Return the index of the schema, built once per schema instance."""
+    index = _schema_indexes.get(schema)
+    if index is None:
+        index = _schema_indexes[schema] = SchemaIndex(schema)
+    return index
+
+
+def _build_field_info(field: GraphQLField) -> FieldInfo:
+    return FieldInfo(definition=field, type=field.type)
+
+
+def _get_connection_fields(type_: GraphQLObjectType | GraphQLInterfaceType) -> tuple[str, ...]:
+    """Return the fields holding the items of a Relay connection type: its `edges`,
+    whose items have a `node`, and its `nodes` when it has them. Types that are not
+    connections have none."""
+    if not type_.name.endswith("Connection"):
+        return ()
+    edges = type_.fields.get("edges")
+    if edges is None or not isinstance(get_nullable_type(edges.type), GraphQLList):
+        return ()
+    edge_type = get_named_type(edges.type)
+    if not isinstance(edge_type, (GraphQLObjectType, GraphQLInterfaceType)) or "node" not in edge_type.fields:
+        return ()
+    nodes = type_.fields.get("nodes")
+    if nodes is not None and isinstance(get_nullable_type(nodes.type), GraphQLList):
+        return ("edges", "nodes")
+    return ("edges",)
+
+
+class SchemaTypeInfo:
+    """Lightweight replacement of graphql-core's `TypeInfo`, backed by a `SchemaIndex`.
+
+    Only the nodes that change the type of the selections are tracked: operations,
+    selection sets, fields and fragments. It provides `get_type`, `get_parent_type`
+    and `get_field_def`, which is what the complexity visitors and estimators use.
+    """
+
+    def __init__(self, schema: GraphQLSchema, index: SchemaIndex | None = None):
+        self.schema = schema
+        self.index = index or get_schema_index(schema)
+        self._type_stack: list[GraphQLOutputType | None] = []
+        self._parent_type_stack: list[GraphQLCompositeType | None] = []
+        self._field_stack: list[FieldInfo | None] = []
+        self._enter: dict[str, Callable[[Any], None]] = {
+            "operation_definition": self._enter_operation_definition,
+            "selection_set": self._enter_selection_set,
+            "field": self._enter_field,
+            "inline_fragment": self._enter_fragment,
+            "fragment_definition": self._enter_fragment,
+        }
+        self._leave: dict[str, Callable[[], Any]] = {
+            "operation_definition": self._type_stack.pop,
+            "selection_set": self._parent_type_stack.pop,
+            "field": self._leave_field,
+            "inline_fragment": self._type_stack.pop,
+            "fragment_definition": self._type_stack.pop,
+        }
+
+    def get_type(self) -> GraphQLOutputType | None:
+        return self._type_stack[-1] if self._type_stack else None
+
+    def get_parent_type(self) -> GraphQLCompositeType | None:
+        return self._parent_type_stack[-1] if self._parent_type_stack else None
+
+    def get_field_def(self) -> GraphQLField | None:
+        field = self._field_stack[-1] if self._field_stack else None
+        return field.definition if field else None
+
+    def enter(self, node: Node) -> None:
+        enter = self._enter.get(node.kind)
+        if enter:
+            enter(node)
+
+    def leave(self, node: Node) -> None:
+        leave = self._leave.get(node.kind)
+        if leave:
+            leave()
+
+    def _enter_operation_definition(self, node) -> None:
+        self._type_stack.append(self.schema.get_root_type(node.operation))
+
+    def _enter_selection_set(self, node) -> None:
+        named_type = get_named_type(self.get_type())
+        self._parent_type_stack.append(named_type if isinstance(named_type, _COMPOSITE_TYPES) else None)
+
+    def _enter_field(self, node) -> None:
+        field = self.index.get_field(self.get_parent_type(), node.name.value)
+        self._field_stack.append(field)
+        self._type_stack.append(field.type if field else None)
+
+    def _leave_field(self) -> None:
+        self._field_stack.pop()
+        self._type_stack.pop()
+
+    def _enter_fragment(self, node) -> None:
+        if node.type_condition:
+            type_ = self.schema.get_type(node.type_condition.name.value)
+        else:
+            type_ = get_named_type(self.get_type())
+        self._type_stack.append(type_ if isinstance(type_, _COMPOSITE_TYPES) else None)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from graphql import GraphQLList, get_named_type
+
+from ..estimators.base import ListSize
+from . import nodes
+from .schema_index import get_schema_index
+from .utils import get_node_argument_value
+
+if TYPE_CHECKING:
+    from graphql import FieldNode, GraphQLSchema
+    from ..config import Config
+    from ..estimators import ComplexityEstimator
+    from .utils import FieldTypeInfo
+
+
+Sizes = tuple[tuple[str, int], ...]
+"""Sizes applying to the fields of a selection set, by field name."""
+
+
+class ListSizer:
+    """Sizes the lists of the fields being visited, for estimators that size lists and
+    for Relay connections, when enabled by the configuration.
+
+    The estimator is asked for the size of every field. Fields it does not size that
+    return a connection are sized by their slicing arguments, and the size applies to
+    the fields holding the items of the connection. Other list fields fall back to the
+    count argument of the configuration. Sizes that apply to child fields are kept in
+    a stack until the children are visited. Fragments spread where sizes apply are
+    sized with them, see `sizes` and `enter_fragment_definition`."""
+
+    def __init__(
+            self,
+            estimator: ComplexityEstimator,
+            type_info: FieldTypeInfo,
+            variables: dict[str, Any],
+            config: Config,
+            schema: GraphQLSchema | None = None,
+    ):
+        self.estimator = estimator
+        self.type_info = type_info
+        self.variables = variables
+        self.config = config
+        self.connections: dict[str, tuple[str, ...]] = {}
+        if config.relay_connections:
+            if schema is None:
+                raise ValueError("The schema is required to size Relay connections")
+            self.connections = get_schema_index(schema).connections
+        self._sized_fields: list[dict[str, int] | None] = [None]
+
+    def enter_field(self, node: FieldNode) -> int:
+        """Return the count the selections of the field are multiplied by."""
+        size = self.estimator.get_list_size(node, self.type_info, self.variables) if self.estimator.sizes_lists else None
+        if size is None and self.connections:
+            size = self._get_connection_size(node)
+        parent_sizes = self._sized_fields[-1]
+        if parent_sizes and node.name.value in parent_sizes:
+            count = parent_sizes[node.name.value]
+        elif size is not None:
+            count = 1 if size.sized_fields else size.count
+        elif isinstance(self.type_info.get_type(), GraphQLList):
+            count = nodes.get_list_count(node, self.variables, self.config, self.type_info.get_field_def())
+        else:
+            count = 1
+        self._sized_fields.append(
+            dict.fromkeys(size.sized_fields, size.count) if size is not None and size.sized_fields else None
+        )
+        return count
+
+    @property
+    def sizes(self) -> Sizes | None:
+        """Return the sizes applying to the fields of the selection set being visited,
+        which the fragments spread in it must be sized with."""
+        sizes = self._sized_fields[-1]
+        return tuple(sorted(sizes.items())) if sizes else None
+
+    def leave_field(self) -> None:
+        self._sized_fields.pop()
+
+    def enter_fragment_definition(self, sizes: Sizes | None = None) -> None:
+        """Start sizing a fragment definition, with the sizes of the selection set it is spread in."""
+        self._sized_fields.append(dict(sizes) if sizes else None)
+
+    def leave_fragment_definition(self) -> None:
+        self._sized_fields.pop()
+
+    def _get_connection_size(self, node: FieldNode) -> ListSize | None:
+        """Return the size of the connection returned by the field, if any: the largest
+        of its slicing arguments, or their default values, capped by the configured maximum."""
+        type_ = get_named_type(self.type_info.get_type())
+        sized_fields = self.connections.get(type_.name) if type_ else None
+        if not sized_fields:
+            return None
+        field_def = self.type_info.get_field_def()
+        counts = []
+        for arg_name in self.config.connection_slicing_args:
+            try:
+                counts.append(int(get_node_argument_value(node, arg_name, self.variables, field_def)))
+            except (TypeError, ValueError):
+                continue
+        count = max(counts, default=self.config.count_missing_arg_value)
+        if self.config.max_connection_size is not None:
+            count = min(count, self.config.max_connection_size)
+        return ListSize(count, sized_fields)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+if TYPE_CHECKING:
+    from .visitor import _BaseComplexityVisitor
+
+
+@dataclasses.dataclass
+class AnalysisStats:
+    """Durations, in seconds, and counters of the analysis of queries.
+
+    Pass an instance as `stats` to `get_complexity`, `build_complexity_tree` or
+    `explain_complexity` to collect them. Values are added to the ones already held,
+    so the same instance can gather the stats of several analyses.
+
+    - `parse_time`: parsing the query and selecting its operation.
+    - `traversal_time`: walking the document, calling the estimator on each field and
+      building the complexity tree, if any.
+    - `evaluation_time`: adding up the complexity of the operations and fragments.
+    - `fields_visited`: fields the estimator was called for, excluding the ones
+      skipped by `@skip`/`@include` or the limit.
+    - `fragments_expanded`: fragment spreads resolved into their fragment complexity.
+    - `estimator_calls`: calls to `get_field_complexity` of the estimator, or to
+      `get_fields_complexity` for estimators that batch fields.
+    - `cache_hits` and `cache_misses`: lookups of the complexity cache, if any.
+    - `parse_cache_hits` and `parse_cache_misses`: lookups of the parse cache.
+    """
+    parse_time: float = 0.0
+    traversal_time: float = 0.0
+    evaluation_time: float = 0.0
+    fields_visited: int = 0
+    fragments_expanded: int = 0
+    estimator_calls: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    parse_cache_hits: int = 0
+    parse_cache_misses: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
+
+    def add_visitor_counters(self, visitor: _BaseComplexityVisitor) -> None:
+        """Add the counters of a visitor that traversed a document."""
+        self.fields_visited += visitor.fields_visited
+        self.fragments_expanded += visitor.fragments_expanded
+        for estimate in (visitor.get_field_complexity, visitor.get_fields_complexity):
+            if isinstance(estimate, CallCounter):
+                self.estimator_calls += estimate.calls
+
+
+class CallCounter:
+    """Callable wrapper that counts the calls to the wrapped function."""
+
+    def __init__(self, func: Callable):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.func(*args, **kwargs)
+
+
+def count_estimator_calls(visitor: _BaseComplexityVisitor, stats: AnalysisStats | None) -> None:
+    """Count the calls of the visitor to the estimator, if stats are collected."""
+    if stats is not None:
+        if visitor.get_fields_complexity is not None:
+            visitor.get_fields_complexity = CallCounter(visitor.get_fields_complexity)
+        else:
+            visitor.get_field_complexity = CallCounter(visitor.get_field_complexity)
+
+
+@contextlib.contextmanager
+def measure(stats: AnalysisStats | None, phase: str) -> Iterator[None]:
+    """Add the duration of the block to the `<phase>_time` of the stats, if given."""
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(stats, f"{phase}_time", getattr(stats, f"{phase}_time") + time.perf_counter() - start)
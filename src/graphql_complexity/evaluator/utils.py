@@ -1,27 +1,56 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Protocol
 
 from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    Undefined,
     VariableNode,
     get_named_type,
     is_introspection_type,
 )
 
 if TYPE_CHECKING:
-    from graphql import DirectiveNode, FieldNode
+    from graphql import DirectiveNode, GraphQLCompositeType, GraphQLField, GraphQLOutputType
 
 
-def get_node_argument_value(node: FieldNode | DirectiveNode, arg_name: str, variables: dict[str, Any]) -> Any:
-    """Returns the value of the argument given by parameter."""
+class FieldTypeInfo(Protocol):
+    """Type information of the current field read by the visitors and estimators, such
+    as a `TypeInfo`, a `SchemaTypeInfo` or the `ValidationContext` of a validation rule."""
+
+    def get_type(self) -> GraphQLOutputType | None: ...
+
+    def get_parent_type(self) -> GraphQLCompositeType | None: ...
+
+    def get_field_def(self) -> GraphQLField | None: ...
+
+
+def get_node_argument_value(
+    node: FieldNode | DirectiveNode,
+    arg_name: str,
+    variables: dict[str, Any],
+    field_def: GraphQLField | None = None,
+) -> Any:
+    """Returns the value of the argument given by parameter. When the argument is not
+    given, the default value it has in the field definition is returned, if any."""
     arg = next((arg for arg in node.arguments if arg.name.value == arg_name), None)
     if not arg:
-        raise ValueError(f"Value for {arg_name!r} not found in {node.name.value!r} arguments")
+        definition = field_def.args.get(arg_name) if field_def else None
+        if definition is None or definition.default_value is Undefined:
+            raise ValueError(f"Value for {arg_name!r} not found in {node.name.value!r} arguments")
+        return definition.default_value
 
     if isinstance(arg.value, VariableNode):
         return variables.get(arg.value.name.value)
 
-    return arg.value.value
+    # Lists and objects have no single value
+    return getattr(arg.value, "value", None)
 
 
 def is_meta_type(type_, node) -> bool:
@@ -41,3 +70,45 @@ def is_meta_type(type_, node) -> bool:
 
     unwrapped_type = get_named_type(type_)
     return unwrapped_type is not None and is_introspection_type(unwrapped_type)
+
+
+def select_operation(document: DocumentNode, operation_name: str) -> DocumentNode:
+    """Return a document with the named operation and the fragments reachable from it.
+
+    Only selection sets are walked, with an explicit stack and without type information,
+    so selecting the operation is much cheaper than visiting the whole document."""
+    operation = None
+    fragments: dict[str, FragmentDefinitionNode] = {}
+    for definition in document.definitions:
+        if isinstance(definition, FragmentDefinitionNode):
+            fragments[definition.name.value] = definition
+        elif (
+            isinstance(definition, OperationDefinitionNode)
+            and definition.name
+            and definition.name.value == operation_name
+        ):
+            operation = definition
+    if operation is None:
+        raise GraphQLError(f"Unknown operation named '{operation_name}'.")
+
+    reachable: set[str] = set()
+    stack = [operation.selection_set]
+    while stack:
+        for selection in stack.pop().selections:
+            if isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                if name in fragments and name not in reachable:
+                    reachable.add(name)
+                    stack.append(fragments[name].selection_set)
+            elif isinstance(selection, (FieldNode, InlineFragmentNode)) and selection.selection_set:
+                stack.append(selection.selection_set)
+
+    return DocumentNode(
+        definitions=tuple(
+            definition
+            for definition in document.definitions
+            if definition is operation or (
+                isinstance(definition, FragmentDefinitionNode) and definition.name.value in reachable
+            )
+        )
+    )
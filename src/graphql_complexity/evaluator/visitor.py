@@ -1,23 +1,213 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import math
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
 
 from graphql import (
+    BREAK,
+    SKIP,
+    FieldNode,
     GraphQLIncludeDirective,
+    GraphQLList,
     GraphQLSkipDirective,
+    OperationDefinitionNode,
     Visitor,
+    value_from_ast_untyped,
 )
 
 from graphql_complexity.estimators.base import ComplexityEstimator
 from . import nodes
-from .utils import get_node_argument_value
+from .fragments import check_fragments_expansion, sort_fragments
+from .sizing import ListSizer
+from .utils import get_node_argument_value, is_meta_type
+from .walker import walk
 from ..config import Config
 
 if TYPE_CHECKING:
-    from graphql import DirectiveNode, TypeInfo
+    from graphql import DirectiveNode, FragmentDefinitionNode, GraphQLSchema, SelectionNode
+    from .sizing import Sizes
+    from .utils import FieldTypeInfo
+    from .walker import TypeInfoLike
 
+FragmentKey = str | tuple[str, "Sizes"]
+"""Key of a fragment: its name, and the sizes of its fields when spread where sizes apply."""
 
-class ComplexityVisitor(Visitor):
+
+class _BaseComplexityVisitor(Visitor):
+    """Common state shared by the visitors that compute the complexity of a document.
+
+    Besides the configuration, it keeps the number of fields and the fragments spread
+    by the operations and by each fragment definition. Once the document is visited,
+    they are used to detect fragment cycles and to bound the fragments expansion.
+
+    The given variables are copied, and completed with the default values of the
+    variables the operations define. Estimators that use variables receive them too.
+
+    When the estimator sizes lists, or Relay connections are enabled by the
+    configuration, `list_sizer` gives the count of each field. Relay connections
+    are found in the given `schema`. Fragments spread where sizes apply to their
+    fields, such as the `edges` of a connection, are visited again with those sizes
+    once the document is visited. Each of these variants is visited once, and is
+    keyed by the name of the fragment and the sizes.
+
+    When the estimator batches fields, the fields of each selection set are estimated
+    at once when entering it, and `get_field_complexity` returns their complexity.
+    """
+
+    def __init__(
+            self,
+            estimator: ComplexityEstimator,
+            type_info: FieldTypeInfo,
+            config: Config | None = None,
+            variables: dict[str, Any] | None = None,
+            schema: GraphQLSchema | None = None,
+    ):
+        if not isinstance(estimator, ComplexityEstimator):
+            raise ValueError("Estimator must be of type 'ComplexityEstimator'")
+        self.config = config or Config()
+        self.estimator: ComplexityEstimator = estimator
+        self.variables = dict(variables) if variables else {}
+        self.type_info = type_info
+        self.get_field_complexity: Callable[[Any, Any, Any], int] = (
+            partial(estimator.get_field_complexity, variables=self.variables)
+            if estimator.uses_variables
+            else estimator.get_field_complexity
+        )
+        self.get_fields_complexity = estimator.get_fields_complexity if estimator.batches_fields else None
+        self._fields_complexity: dict[int, int] = {}
+        if estimator.batches_fields:
+            self.get_field_complexity = self._get_batched_field_complexity
+        self.list_sizer = (
+            ListSizer(estimator, type_info, self.variables, self.config, schema)
+            if estimator.sizes_lists or self.config.relay_connections
+            else None
+        )
+        self.fragments_order: list[str] = []
+        self._fields_count = 0
+        self._spreads_count: dict[str, int] = {}
+        self._fragments_graph: dict[str, tuple[int, dict[str, int]]] = {}
+        self._operations_count: tuple[int, dict[str, int]] = (0, {})
+        self._fragment_definitions: dict[str, FragmentDefinitionNode] = {}
+        self._fragment_variants: dict[str, dict[Sizes, None]] = {}
+        self._pending_variants: list[tuple[str, Sizes]] = []
+        self._fragment_sizes: Sizes | None = None
+        self._fragment_key: FragmentKey = ""
+        super().__init__()
+
+    @property
+    def fields_visited(self) -> int:
+        """Return the number of fields visited by the operations and fragments."""
+        return self._fields_count + sum(fields for fields, _ in self._fragments_graph.values())
+
+    @property
+    def fragments_expanded(self) -> int:
+        """Return the number of fragment spreads visited by the operations and fragments."""
+        return sum(self._spreads_count.values()) + sum(
+            sum(spreads.values()) for _, spreads in self._fragments_graph.values()
+        )
+
+    def enter_selection_set(self, node, key, parent, path, ancestors):
+        """Estimate the fields of the selection set at once, for estimators that batch fields."""
+        if self.get_fields_complexity is None:
+            return
+        fields = [
+            selection for selection in node.selections
+            if isinstance(selection, FieldNode) and self._estimates_field(selection)
+        ]
+        if fields:
+            complexities = self._estimate_fields(fields, self.type_info.get_parent_type())
+            self._fields_complexity.update(zip(map(id, fields), complexities))
+
+    def _estimate_fields(self, nodes, parent_type):
+        """Estimate the fields at once, given the variables only to estimators that use them."""
+        return self.get_fields_complexity(nodes, parent_type, self.variables if self.estimator.uses_variables else {})
+
+    def _estimates_field(self, node: FieldNode) -> bool:
+        """Return whether the field of a selection set is estimated: meta fields, whose
+        names start with '__', and fields excluded by the 'skip' and 'include' directives
+        are not."""
+        return not node.name.value.startswith("__") and should_include_node(node, self.variables)
+
+    def _get_batched_field_complexity(self, node, type_info, path) -> int:
+        complexity = self._fields_complexity.pop(id(node), None)
+        if complexity is None:
+            # Fields starting with '__' that are not meta fields, such as unknown ones, are estimated alone
+            complexity = self._estimate_fields([node], type_info.get_parent_type())[0]
+        return complexity
+
+    def enter_document(self, node, key, parent, path, ancestors):
+        """Complete the variables with the default values of the operations visited,
+        before visiting the fragments that may be defined ahead of them."""
+        for definition in node.definitions:
+            if not isinstance(definition, OperationDefinitionNode) or not self._visits_operation(definition):
+                continue
+            for variable_definition in definition.variable_definitions or ():
+                name = variable_definition.variable.name.value
+                if name not in self.variables and variable_definition.default_value is not None:
+                    self.variables[name] = value_from_ast_untyped(variable_definition.default_value)
+
+    def _visits_operation(self, node: OperationDefinitionNode) -> bool:
+        """Return whether the operation is part of the complexity."""
+        return True
+
+    def enter_fragment_definition(self, node, key, parent, path, ancestors):
+        name = node.name.value
+        self._fragment_definitions.setdefault(name, node)
+        self._fragment_key = name if self._fragment_sizes is None else (name, self._fragment_sizes)
+        self._operations_count = (self._fields_count, self._spreads_count)
+        self._fields_count, self._spreads_count = 0, {}
+        if self.list_sizer is not None:
+            self.list_sizer.enter_fragment_definition(self._fragment_sizes)
+
+    def leave_fragment_definition(self, node, key, parent, path, ancestors):
+        self._fragments_graph[node.name.value] = (self._fields_count, self._spreads_count)
+        self._fields_count, self._spreads_count = self._operations_count
+        if self.list_sizer is not None:
+            self.list_sizer.leave_fragment_definition()
+
+    def enter_fragment_spread(self, node, key, parent, path, ancestors):
+        name = node.name.value
+        self._spreads_count[name] = self._spreads_count.get(name, 0) + 1
+
+    def leave_document(self, node, key, parent, path, ancestors):
+        """Check the fragments of the document, failing before they are expanded."""
+        self.fragments_order = sort_fragments(self._fragments_graph)
+        if self.config.max_fragment_expansion is not None:
+            check_fragments_expansion(
+                self._fragments_graph,
+                self.fragments_order,
+                self._fields_count,
+                self._spreads_count,
+                self.config.max_fragment_expansion,
+            )
+        if self._pending_variants:
+            self._visit_fragment_variants(self.type_info)
+
+    def _get_spread_key(self, name: str) -> FragmentKey:
+        """Return the key of the fragment spread in the selection set being visited,
+        recording the variant of the fragment to visit if sizes apply to its fields."""
+        sizes = self.list_sizer.sizes if self.list_sizer is not None else None
+        if sizes is None:
+            return name
+        variants = self._fragment_variants.setdefault(name, {})
+        if sizes not in variants:
+            variants[sizes] = None
+            self._pending_variants.append((name, sizes))
+        return name, sizes
+
+    def _visit_fragment_variants(self, type_info: TypeInfoLike) -> None:
+        """Visit the fragments spread where sizes apply to their fields with those sizes,
+        including the variants of the fragments they spread in turn."""
+        while self._pending_variants:
+            name, self._fragment_sizes = self._pending_variants.pop()
+            definition = self._fragment_definitions.get(name)
+            if definition is not None:
+                walk(definition, self, type_info)
+        self._fragment_sizes = None
+
+
+class ComplexityVisitor(_BaseComplexityVisitor):
     """Visitor that calculates the complexity of the operations in the document.
     The complexity is calculated by visiting the document and using the
     ComplexityEstimator to get the complexity of each field.
@@ -32,21 +222,17 @@ class ComplexityVisitor(Visitor):
     def __init__(
             self,
             estimator: ComplexityEstimator,
-            type_info: TypeInfo,
-            config: Config = None,
+            type_info: FieldTypeInfo,
+            config: Config | None = None,
             variables: dict[str, Any] | None = None,
+            schema: GraphQLSchema | None = None,
     ):
-        if not isinstance(estimator, ComplexityEstimator):
-            raise ValueError("Estimator must be of type 'ComplexityEstimator'")
-        self.config = config or Config()
-        self.estimator: ComplexityEstimator = estimator
-        self.variables = variables or {}
-        self.type_info = type_info
-        self.fragments: dict[str, nodes.ComplexityNode] = {}
+        super().__init__(estimator=estimator, type_info=type_info, config=config, variables=variables, schema=schema)
+        self.fragments: dict[FragmentKey, nodes.ComplexityNode] = {}
+        self.fragments_complexity: dict[FragmentKey, int] = {}
         self.root = nodes.RootNode(name="root")
         self.current_node = self.root
         self._previous_current_node = None
-        super().__init__()
 
     @property
     def complexity_tree(self) -> nodes.ComplexityNode:
@@ -55,48 +241,200 @@ class ComplexityVisitor(Visitor):
         represented as Node children. Each node is evaluated returning the complexity."""
         return self.root
 
-    def enter_variable_definition(self, node, key, parent, path, ancestors):
-        input_variable = self.variables.get(node.variable.name.value)
-        if input_variable is None:
-            self.variables[node.variable.name.value] = node.default_value.value
-
-    def enter_directive(self, node, key, parent, path, ancestors):
-        if not should_include_field(node, self.variables):
-            # Pop the last node added (parent) and ignore the next fields until the
-            # parent field is left.
-            self.current_node = nodes.SkippedField.wrap(self.current_node)
-
     def enter_field(self, node, key, parent, path, ancestors):
-        """Add the complexity of the current field to the current complexity list."""
-        complexity = self.estimator.get_field_complexity(node, self.type_info, path)
+        """Add the complexity of the current field to the current complexity list.
+        Fields excluded by the 'skip' and 'include' directives are added as skipped
+        fields, and their selections are not traversed."""
+        if not should_include_node(node, self.variables):
+            self.current_node.add_child(nodes.SkippedField(name=node.name.value))
+            return SKIP
 
-        cn = nodes.build_node(node, self.type_info, complexity, self.variables, self.config)
+        self._fields_count += 1
+        # Meta fields have no complexity, so they are not estimated
+        if is_meta_type(self.type_info.get_type(), node):
+            complexity = 0
+        else:
+            complexity = self.get_field_complexity(node, self.type_info, path)
+
+        count = self.list_sizer.enter_field(node) if self.list_sizer is not None else None
+        cn = nodes.build_node(node, self.type_info, complexity, self.variables, self.config, count)
         self.current_node.add_child(cn)
         self.current_node = cn
 
     def leave_field(self, node, key, parent, path, ancestors):
         self.current_node = self.current_node.parent
+        if self.list_sizer is not None:
+            self.list_sizer.leave_field()
+
+    def enter_inline_fragment(self, node, key, parent, path, ancestors):
+        if not should_include_node(node, self.variables):
+            return SKIP
 
-    def enter_fragment_definition(self, *args, **kwargs):
+    def enter_fragment_definition(self, node, *args, **kwargs):
         """Start a new complexity list for the current fragment."""
+        super().enter_fragment_definition(node, *args, **kwargs)
         self._previous_current_node = self.current_node
         self.current_node = nodes.RootNode(name="fragment")
 
     def leave_fragment_definition(self, node, *args, **kwargs):
         """Add the current complexity list to the fragments dict."""
-        self.fragments[node.name.value] = self.current_node
+        super().leave_fragment_definition(node, *args, **kwargs)
+        self.fragments[self._fragment_key] = self.current_node
         self.current_node = self._previous_current_node
 
     def enter_fragment_spread(self, node, *args, **kwargs):
         """Add a lazy fragment to the current complexity list."""
+        if not should_include_node(node, self.variables):
+            return SKIP
+        super().enter_fragment_spread(node, *args, **kwargs)
+        key = self._get_spread_key(node.name.value)
         self.current_node.add_child(
             nodes.FragmentSpreadNode(
                 name=node.name.value,
-                fragments_definition=self.fragments
+                fragments_definition=self.fragments,
+                fragments_complexity=self.fragments_complexity,
+                sizes=None if isinstance(key, str) else key[1],
             )
         )
 
 
+class StreamingComplexityVisitor(_BaseComplexityVisitor):
+    """Visitor that accumulates the complexity of the document in a single traversal,
+    without building a complexity tree.
+
+    Every field adds its complexity multiplied by the count of the list fields
+    enclosing it, which are kept in a stack of multipliers. Fields excluded by the
+    'skip' and 'include' directives, and meta fields, are not traversed at all.
+
+    Fragment spreads are recorded with the multiplier they were found at and resolved
+    after the whole document is visited, as fragments can be defined after being used.
+    Spreads of fragments already visited add the complexity of the fragment's own fields
+    right away, as a lower bound of their final complexity.
+    The complexity of each fragment is calculated only once, following the order given
+    by the fragments check, so nested fragments are resolved without recursion.
+
+    When `max_complexity` is given, the traversal stops as soon as the complexity
+    accumulated by the operations exceeds it, and `exceeded_path` holds the path to
+    the field where it happened.
+    """
+
+    def __init__(
+            self,
+            estimator: ComplexityEstimator,
+            type_info: FieldTypeInfo,
+            config: Config | None = None,
+            variables: dict[str, Any] | None = None,
+            max_complexity: int | None = None,
+            schema: GraphQLSchema | None = None,
+    ):
+        super().__init__(estimator=estimator, type_info=type_info, config=config, variables=variables, schema=schema)
+        self.max_complexity = max_complexity
+        self.exceeded_path: list[str] | None = None
+        self._limit = math.inf if max_complexity is None else max_complexity
+        self._multipliers: list[int] = [1]
+        self._total = 0
+        self._spreads: dict[FragmentKey, int] = {}
+        self._spreads_bound = 0
+        self._fragments: dict[FragmentKey, tuple[int, dict[FragmentKey, int]]] = {}
+        self._previous_state: tuple[list[int], int, dict[FragmentKey, int], int, float] | None = None
+        self._complexity: int | None = None
+
+    @property
+    def complexity(self) -> int:
+        """Return the complexity of the operations after visiting the document.
+        If the traversal was stopped by `max_complexity`, a lower bound is returned."""
+        if self.exceeded_path is not None:
+            return self._total + self._spreads_bound
+        if self._complexity is None:
+            resolved: dict[FragmentKey, int] = {}
+            for name in self.fragments_order:
+                resolved[name] = self._resolve(*self._fragments[name], resolved)
+                for sizes in self._fragment_variants.get(name, ()):
+                    resolved[name, sizes] = self._resolve(*self._fragments[name, sizes], resolved)
+            self._complexity = self._resolve(self._total, self._spreads, resolved)
+        return self._complexity
+
+    def enter_field(self, node, key, parent, path, ancestors):
+        if not should_include_node(node, self.variables):
+            return SKIP
+        type_ = self.type_info.get_type()
+        if is_meta_type(type_, node):
+            return SKIP
+
+        self._fields_count += 1
+        multipliers = self._multipliers
+        multiplier = multipliers[-1]
+        self._total += multiplier * self.get_field_complexity(node, self.type_info, path)
+        if self._total + self._spreads_bound > self._limit:
+            return self._exceeded(node, ancestors)
+        if self.list_sizer is not None:
+            multiplier *= self.list_sizer.enter_field(node)
+        elif isinstance(type_, GraphQLList):
+            multiplier *= nodes.get_list_count(node, self.variables, self.config, self.type_info.get_field_def())
+        multipliers.append(multiplier)
+
+    def leave_field(self, node, key, parent, path, ancestors):
+        self._multipliers.pop()
+        if self.list_sizer is not None:
+            self.list_sizer.leave_field()
+
+    def enter_inline_fragment(self, node, key, parent, path, ancestors):
+        if not should_include_node(node, self.variables):
+            return SKIP
+
+    def enter_fragment_spread(self, node, key, parent, path, ancestors):
+        if not should_include_node(node, self.variables):
+            return SKIP
+        super().enter_fragment_spread(node, key, parent, path, ancestors)
+        fragment_key = self._get_spread_key(node.name.value)
+        multiplier = self._multipliers[-1]
+        self._spreads[fragment_key] = self._spreads.get(fragment_key, 0) + multiplier
+        fragment = self._fragments.get(fragment_key)
+        if fragment:
+            self._spreads_bound += multiplier * fragment[0]
+            if self._total + self._spreads_bound > self._limit:
+                return self._exceeded(node, ancestors)
+
+    def enter_fragment_definition(self, node, key, parent, path, ancestors):
+        """Start accumulating the complexity of the fragment on its own."""
+        super().enter_fragment_definition(node, key, parent, path, ancestors)
+        self._previous_state = (
+            self._multipliers, self._total, self._spreads, self._spreads_bound, self._limit
+        )
+        self._multipliers, self._total, self._spreads, self._spreads_bound = [1], 0, {}, 0
+        self._limit = math.inf
+
+    def leave_fragment_definition(self, node, key, parent, path, ancestors):
+        """Store the fragment complexity and restore the accumulated state."""
+        super().leave_fragment_definition(node, key, parent, path, ancestors)
+        self._fragments[self._fragment_key] = (self._total, self._spreads)
+        (
+            self._multipliers, self._total, self._spreads, self._spreads_bound, self._limit
+        ) = self._previous_state
+
+    def _exceeded(self, node, ancestors):
+        """Record the path to the node that exceeded the limit and stop the traversal."""
+        self.exceeded_path = [
+            (ancestor.alias or ancestor.name).value
+            for ancestor in (*ancestors, node)
+            if isinstance(ancestor, FieldNode)
+        ]
+        return BREAK
+
+    @staticmethod
+    def _resolve(total: int, spreads: dict[FragmentKey, int], resolved: dict[FragmentKey, int]) -> int:
+        """Add the complexity of the spread fragments, already resolved, to the given total."""
+        return total + sum(multiplier * resolved.get(name, 0) for name, multiplier in spreads.items())
+
+
+def should_include_node(node: SelectionNode, variables: dict[str, Any]) -> bool:
+    """Check if a selection should be included based on its 'skip' and 'include' directives."""
+    for directive in node.directives or ():
+        if not should_include_field(directive, variables):
+            return False
+    return True
+
+
 def should_include_field(node: DirectiveNode, variables: dict[str, Any]) -> bool:
     """Check if a field should be ignored based on the 'skip' and 'include' directives."""
     if node.name.value == GraphQLIncludeDirective.name:
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Protocol
+
+from graphql import BREAK, SKIP
+
+if TYPE_CHECKING:
+    from graphql import Node, Visitor
+
+# Keys of the nodes that affect the complexity, in the order graphql-core visits them.
+# Names, arguments, values, types and variables are not traversed.
+WALKED_KEYS: dict[str, tuple[str, ...]] = {
+    "document": ("definitions",),
+    "operation_definition": ("variable_definitions", "directives", "selection_set"),
+    "fragment_definition": ("variable_definitions", "directives", "selection_set"),
+    "variable_definition": ("directives",),
+    "selection_set": ("selections",),
+    "field": ("directives", "selection_set"),
+    "inline_fragment": ("directives", "selection_set"),
+    "fragment_spread": ("directives",),
+    "directive": (),
+}
+
+
+class TypeInfoLike(Protocol):
+    """Type information updated while walking, such as `TypeInfo` or `SchemaTypeInfo`."""
+
+    def enter(self, node: Node) -> None: ...
+
+    def leave(self, node: Node) -> None: ...
+
+
+def walk(document: Node, visitor: Visitor, type_info: TypeInfoLike | None = None) -> None:
+    """Visit the nodes of the document that affect the complexity, with an explicit stack.
+
+    Only definitions, selection sets, fields, fragments and directives are visited,
+    calling the `enter_*` and `leave_*` methods of the visitor with the arguments
+    graphql-core's `visit` passes them: node, key, parent, path and ancestors.
+    Returning `SKIP` from an enter method skips the node, and `BREAK` stops the walk.
+    Editing the document by returning nodes is not supported.
+
+    When `type_info` is given, it is updated before entering and after leaving each
+    node, as `TypeInfoVisitor` does. A node of a document, such as a fragment
+    definition, can be walked too."""
+    _Walker(visitor, type_info).walk(document)
+
+
+class _Walker:
+    def __init__(self, visitor: Visitor, type_info: TypeInfoLike | None):
+        self.visitor = visitor
+        self.type_info = type_info
+        self.handlers: dict[str, tuple[Callable | None, Callable | None]] = {}
+        self.path: list[Any] = []
+        self.ancestors: list[Any] = []
+        # Nodes and lists of nodes being traversed, with their key, their parent, their
+        # kind (None for lists) and the keys of the children left to traverse
+        self.frames: list[tuple[Any, Any, Any, str | None, list[Any]]] = []
+
+    def walk(self, document: Node) -> None:
+        frames = self.frames
+        if not self._enter(document, None, None):
+            return
+        while frames:
+            container, _, _, kind, children = frames[-1]
+            if not children:
+                if not self._leave():
+                    return
+                continue
+            key = children.pop()
+            self.path.append(key)
+            if not self._enter(getattr(container, key) if kind else container[key], key, container):
+                return
+
+    def _get_handlers(self, kind: str) -> tuple[Callable | None, Callable | None]:
+        handlers = self.handlers.get(kind)
+        if handlers is None:
+            enter_leave = self.visitor.get_enter_leave_for_kind(kind)
+            handlers = self.handlers[kind] = (enter_leave.enter, enter_leave.leave)
+        return handlers
+
+    def _enter(self, node: Any, key: Any, parent: Any) -> bool:
+        """Enter the node and push its frame, returning False if the walk must stop."""
+        if isinstance(node, (list, tuple)):
+            kind = None
+            children: list[Any] = list(range(len(node) - 1, -1, -1))
+        else:
+            kind = node.kind
+            enter = self._get_handlers(kind)[0]
+            if self.type_info is not None:
+                self.type_info.enter(node)
+            result = enter(node, key, parent, self.path, self.ancestors) if enter else None
+            if result is BREAK:
+                return False
+            if result is SKIP:
+                if self.type_info is not None:
+                    self.type_info.leave(node)
+                if self.path:
+                    self.path.pop()
+                return True
+            children = [name for name in reversed(WALKED_KEYS.get(kind, ())) if getattr(node, name)]
+        if self.frames:
+            self.ancestors.append(self.frames[-1][0])
+        self.frames.append((node, key, parent, kind, children))
+        return True
+
+    def _leave(self) -> bool:
+        """Pop the current frame and leave its node, returning False if the walk must stop."""
+        node, key, parent, kind, _ = self.frames.pop()
+        if self.frames:
+            self.ancestors.pop()
+        if kind is not None:
+            leave = self._get_handlers(kind)[1]
+            result = leave(node, key, parent, self.path, self.ancestors) if leave else None
+            if self.type_info is not None:
+                self.type_info.leave(node)
+            if result is BREAK:
+                return False
+        if self.frames:
+            self.path.pop()
+        return True
@@ -5,37 +5,133 @@ from typing import TYPE_CHECKING
 from graphql import GraphQLError
 from strawberry.extensions import SchemaExtension
 
-from graphql_complexity import get_complexity
+from graphql_complexity import ComplexityLimitError, get_complexity
+from ..evaluator.cache import CachedComplexity
+from ..evaluator.rule import build_complexity_validation_rule
+from ..evaluator.stats import AnalysisStats
 
 if TYPE_CHECKING:
     from typing import Type
+    from graphql_complexity import ComplexityCache
+    from ..config import Config
     from graphql_complexity.estimators import ComplexityEstimator
 
 
 def build_complexity_extension(
     estimator: ComplexityEstimator,
     max_complexity: int | None = None,
+    cache: ComplexityCache | None = None,
+    use_validation_rule: bool = False,
+    collect_stats: bool = False,
+    config: Config | None = None,
 ) -> Type[SchemaExtension]:
-    class ComplexityExtension(SchemaExtension):
-        estimated_complexity: int
+    """Build a Strawberry extension that calculates the complexity of the operations.
 
-        def on_validate(
-            self,
-        ):
+    By default, the complexity is calculated before the document is validated. With
+    `use_validation_rule`, it is calculated by a validation rule in the same traversal
+    as the validation of the document, and a `ComplexityLimitError` is reported among
+    the validation errors when the complexity exceeds `max_complexity`.
+
+    With `collect_stats`, the `AnalysisStats` of each operation are returned by
+    `get_results` next to the complexity value. The `config` is used by every
+    analysis, such as to size Relay connections."""
+    return type(
+        "ComplexityExtension",
+        (_ComplexityExtension,),
+        {
+            "estimator": estimator,
+            "max_complexity": max_complexity or None,
+            "cache": cache,
+            "use_validation_rule": use_validation_rule,
+            "collect_stats": collect_stats,
+            "config": config,
+        },
+    )
+
+
+class _ComplexityExtension(SchemaExtension):
+    estimator: ComplexityEstimator
+    max_complexity: int | None = None
+    cache: ComplexityCache | None = None
+    use_validation_rule: bool = False
+    collect_stats: bool = False
+    config: Config | None = None
+    estimated_complexity: int | None = None
+    stats: AnalysisStats | None = None
+
+    def on_validate(
+        self,
+    ):
+        if self.collect_stats:
+            self.stats = AnalysisStats()
+        if self.use_validation_rule:
+            self._add_validation_rule()
+        else:
+            self._validate_complexity()
+        yield
+
+    def _validate_complexity(self):
+        try:
             self.estimated_complexity = get_complexity(
                 query=self.execution_context.graphql_document,
                 schema=self.execution_context.schema._schema,
-                estimator=estimator
+                estimator=self.estimator,
+                config=self.config,
+                variables=self.execution_context.variables,
+                operation_name=self.execution_context.operation_name,
+                max_complexity=self.max_complexity,
+                cache=self.cache,
+                stats=self.stats,
+            )
+        except ComplexityLimitError as error:
+            self.estimated_complexity = error.complexity
+            raise GraphQLError(error.message) from error
+
+    def _add_validation_rule(self):
+        """Add the complexity rule to the validation rules, unless it is cached."""
+        execution_context = self.execution_context
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(
+                execution_context.graphql_document,
+                execution_context.schema._schema,
+                self.estimator,
+                self.config,
+                variables=execution_context.variables,
+                operation_name=execution_context.operation_name,
             )
+            cached = self.cache.get(key)
+            if cached is not None and cached.exact:
+                if self.stats is not None:
+                    self.stats.cache_hits += 1
+                self.estimated_complexity = cached.complexity
+                if self.max_complexity is not None and cached.complexity > self.max_complexity:
+                    raise GraphQLError(ComplexityLimitError(cached.complexity, self.max_complexity).message)
+                return
+            if self.stats is not None:
+                self.stats.cache_misses += 1
 
-            if max_complexity and self.estimated_complexity > max_complexity:
-                error = GraphQLError(
-                    f"Query is too complex. Max complexity is {max_complexity}, estimated "
-                    f"complexity is {self.estimated_complexity}"
-                )
-                raise error
+        execution_context.validation_rules = (
+            *execution_context.validation_rules,
+            build_complexity_validation_rule(
+                self.estimator,
+                self.config,
+                variables=execution_context.variables,
+                operation_name=execution_context.operation_name,
+                max_complexity=self.max_complexity,
+                on_complexity=lambda complexity: self._set_complexity(complexity, key),
+                stats=self.stats,
+            ),
+        )
 
-        def get_results(self):
-            return {"complexity": {"value": self.estimated_complexity}}
+    def _set_complexity(self, complexity: int, key):
+        self.estimated_complexity = complexity
+        if key is not None and self.cache is not None:
+            exact = self.max_complexity is None or complexity <= self.max_complexity
+            self.cache.set(key, CachedComplexity(complexity, exact=exact))
 
-    return ComplexityExtension
+    def get_results(self):
+        complexity = {"value": self.estimated_complexity}
+        if self.stats is not None:
+            complexity["stats"] = self.stats.as_dict()
+        return {"complexity": complexity}
@@ -0,0 +1,115 @@
+"""Benchmarks of the analysis functions and estimators over generated pathological workloads.
+
+Each benchmark records the peak memory of one analysis, in bytes, and the size of the
+query in its `extra_info`, next to the timings reported by pytest-benchmark.
+"""
+import pytest
+from graphql import build_schema, parse
+
+from graphql_complexity import (
+    ArgumentsEstimator,
+    DirectivesEstimator,
+    SimpleEstimator,
+    explain_complexity,
+    get_complexity,
+)
+from graphql_complexity.evaluator.complexity import build_complexity_tree
+from tests.benchmarks.utils import peak_memory
+
+SDL = """
+    directive @complexity(value: Int!) on FIELD_DEFINITION
+
+    type Node {
+        id: ID
+        name: String @complexity(value: 2)
+        child: Node
+        children(first: Int): [Node] @complexity(value: 3)
+    }
+
+    type Query {
+        node(id: ID): Node
+        items(ids: [ID], first: Int): [Node] @complexity(value: 5)
+    }
+"""
+SCHEMA = build_schema(SDL)
+
+
+def _wide_selection(fields: int = 2_000) -> str:
+    return "query { node { " + " ".join(f"f{i}: name" for i in range(fields)) + " } }"
+
+
+def _deep_nesting(depth: int = 200) -> str:
+    return "query { node { " + "child { " * depth + "id" + " }" * depth + " } }"
+
+
+def _fragment_reuse(fragments: int = 100, spreads: int = 50) -> str:
+    definitions = ["fragment f0 on Node { id name }"] + [
+        f"fragment f{i} on Node {{ id name children(first: 2) {{ ...f{i - 1} }} }}" for i in range(1, fragments)
+    ]
+    selections = " ".join(f"n{i}: node {{ ...f{fragments - 1} }}" for i in range(spreads))
+    return "query { " + selections + " } " + " ".join(definitions)
+
+
+def _many_aliases(aliases: int = 1_000) -> str:
+    return "query { " + " ".join(f'a{i}: items(first: {i % 50}) {{ id name }}' for i in range(aliases)) + " }"
+
+
+def _many_operations(operations: int = 200) -> str:
+    return " ".join(f'query q{i} {{ node(id: "{i}") {{ id name child {{ id }} }} }}' for i in range(operations))
+
+
+def _big_list_literals(fields: int = 10, size: int = 1_000) -> str:
+    ids = ", ".join(f'"{i}"' for i in range(size))
+    return "query { " + " ".join(f"l{i}: items(ids: [{ids}]) {{ id }}" for i in range(fields)) + " }"
+
+
+WORKLOADS = {
+    "wide_selection": _wide_selection(),
+    "deep_nesting": _deep_nesting(),
+    "fragment_reuse": _fragment_reuse(),
+    "many_aliases": _many_aliases(),
+    "many_operations": _many_operations(),
+    "big_list_literals": _big_list_literals(),
+}
+DOCUMENTS = {name: parse(query) for name, query in WORKLOADS.items()}
+
+ESTIMATORS = {
+    "simple": SimpleEstimator(),
+    "arguments": ArgumentsEstimator(multipliers=["first", "ids"]),
+    "directives": DirectivesEstimator(SDL),
+}
+
+workloads = pytest.mark.parametrize("workload", list(WORKLOADS))
+
+
+def _run(benchmark, workload: str, func, *args):
+    benchmark.extra_info["query_bytes"] = len(WORKLOADS[workload])
+    benchmark.extra_info["peak_memory"] = peak_memory(lambda: func(*args))
+    return benchmark(func, *args)
+
+
+@workloads
+def test_parse(benchmark, workload):
+    _run(benchmark, workload, parse, WORKLOADS[workload])
+
+
+@workloads
+def test_build_complexity_tree(benchmark, workload):
+    tree = _run(benchmark, workload, build_complexity_tree, DOCUMENTS[workload], SCHEMA, SimpleEstimator())
+
+    assert tree.evaluate() == get_complexity(DOCUMENTS[workload], SCHEMA, SimpleEstimator())
+
+
+@workloads
+def test_explain_complexity(benchmark, workload):
+    explanation = _run(benchmark, workload, explain_complexity, WORKLOADS[workload], SCHEMA, SimpleEstimator())
+
+    assert explanation.total_complexity == get_complexity(DOCUMENTS[workload], SCHEMA, SimpleEstimator())
+
+
+@workloads
+@pytest.mark.parametrize("estimator", list(ESTIMATORS))
+def test_get_complexity(benchmark, workload, estimator):
+    complexity = _run(benchmark, workload, get_complexity, DOCUMENTS[workload], SCHEMA, ESTIMATORS[estimator])
+
+    assert complexity > 0
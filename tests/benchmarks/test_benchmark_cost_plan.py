@@ -0,0 +1,64 @@
+import random
+
+from graphql import build_schema
+
+from graphql_complexity import SimpleEstimator, compile_cost_plan, get_complexity
+
+SCHEMA = build_schema("""
+    type User {
+        id: ID
+        name: String
+        friends(first: Int): [User]
+        posts(first: Int): [Post]
+    }
+
+    type Post {
+        id: ID
+        title: String
+    }
+
+    type Query {
+        users(first: Int): [User]
+    }
+""")
+
+QUERY = """
+    query ($users: Int, $friends: Int = 5, $posts: Int, $withPosts: Boolean = false) {
+        users(first: $users) {
+            ...user
+            friends(first: $friends) {
+                ...user
+                posts(first: $posts) @include(if: $withPosts) { id title }
+            }
+        }
+    }
+    fragment user on User { id name posts(first: $posts) @include(if: $withPosts) { id title } }
+"""
+
+_random = random.Random(0)
+BINDINGS = [
+    {"users": _random.randint(1, 100), "posts": _random.randint(0, 20), "withPosts": _random.random() < 0.5}
+    for _ in range(10_000)
+]
+
+
+def test_get_complexity_per_binding(benchmark):
+    bindings = BINDINGS[:100]
+
+    benchmark(lambda: [get_complexity(QUERY, SCHEMA, SimpleEstimator(), variables=variables) for variables in bindings])
+
+
+def test_cost_plan_evaluate_per_binding(benchmark):
+    plan = compile_cost_plan(QUERY, SCHEMA, SimpleEstimator())
+
+    benchmark(lambda: [plan.evaluate(variables) for variables in BINDINGS])
+
+
+def test_cost_plan_evaluate_many(benchmark):
+    plan = compile_cost_plan(QUERY, SCHEMA, SimpleEstimator())
+
+    results = benchmark(plan.evaluate_many, BINDINGS)
+
+    assert results[:100] == [
+        get_complexity(QUERY, SCHEMA, SimpleEstimator(), variables=variables) for variables in BINDINGS[:100]
+    ]
@@ -0,0 +1,57 @@
+import dataclasses
+
+from graphql import build_schema, parse
+
+from graphql_complexity import SimpleEstimator
+from graphql_complexity.evaluator.complexity import build_complexity_tree
+from graphql_complexity.evaluator.nodes import ComplexityNode, Field
+from tests.benchmarks.utils import peak_memory
+
+SCHEMA = build_schema("""
+    type Item {
+        id: ID
+        name: String
+    }
+
+    type Query {
+        items(first: Int): [Item]
+    }
+""")
+
+NODES_COUNT = 10_000
+
+WIDE_QUERY = parse(
+    "query { items(first: 10) { " + " ".join(f"f{i}: name" for i in range(NODES_COUNT)) + " } }"
+)
+
+
+@dataclasses.dataclass(kw_only=True)
+class DictComplexityNode:
+    """Complexity node with an instance dict, as nodes were before being slotted."""
+    name: str
+    parent: ComplexityNode = None
+    children: list[ComplexityNode] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class DictField(DictComplexityNode):
+    complexity: int
+
+
+def test_build_wide_complexity_tree(benchmark):
+    benchmark.extra_info["peak_memory"] = peak_memory(
+        lambda: build_complexity_tree(WIDE_QUERY, SCHEMA, SimpleEstimator())
+    )
+
+    benchmark(build_complexity_tree, WIDE_QUERY, SCHEMA, SimpleEstimator())
+
+
+def test_slotted_nodes_memory(benchmark):
+    slotted = peak_memory(lambda: [Field(name="f", complexity=1) for _ in range(NODES_COUNT)])
+    with_dict = peak_memory(lambda: [DictField(name="f", complexity=1) for _ in range(NODES_COUNT)])
+    benchmark.extra_info["slotted_peak_memory"] = slotted
+    benchmark.extra_info["dict_peak_memory"] = with_dict
+
+    benchmark(lambda: [Field(name="f", complexity=1) for _ in range(NODES_COUNT)])
+
+    assert slotted < with_dict * 0.8
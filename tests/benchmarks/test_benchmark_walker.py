@@ -0,0 +1,43 @@
+from graphql import build_schema, parse, visit
+
+from graphql_complexity import SimpleEstimator
+from graphql_complexity.evaluator.schema_index import SchemaTypeInfo
+from graphql_complexity.evaluator.visitor import StreamingComplexityVisitor
+from graphql_complexity.evaluator.walker import walk
+from tests.ut_utils import SchemaTypeInfoVisitor
+
+SCHEMA = build_schema("""
+    type Item {
+        id: ID
+        name(format: String): String
+    }
+
+    type Query {
+        item(id: ID!): Item
+    }
+""")
+
+WIDE_QUERY = parse(
+    "query { " + " ".join(f'f{i}: item(id: "{i}") {{ id name(format: "short") }}' for i in range(2_000)) + " }"
+)
+
+
+def _calculate(traverse) -> int:
+    type_info = SchemaTypeInfo(SCHEMA)
+    visitor = StreamingComplexityVisitor(estimator=SimpleEstimator(), type_info=type_info)
+    traverse(type_info, visitor)
+    return visitor.complexity
+
+
+def test_visit_wide_query(benchmark):
+    complexity = benchmark(_calculate, lambda type_info, visitor: visit(
+        WIDE_QUERY, SchemaTypeInfoVisitor(type_info, visitor)
+    ))
+
+    assert complexity == 6_000
+
+
+def test_walk_wide_query(benchmark):
+    complexity = benchmark(_calculate, lambda type_info, visitor: walk(WIDE_QUERY, visitor, type_info))
+
+    assert complexity == 6_000
@@ -0,0 +1,11 @@
+import tracemalloc
+
+
+def peak_memory(func) -> int:
+    """Return the peak memory allocated, in bytes, while calling `func`."""
+    tracemalloc.start()
+    try:
+        result = func()  # noqa: F841 - keep the result alive while measuring
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
@@ -18,9 +18,9 @@ type User {
 """
 
 
-def _evaluate_complexity(query: str, multipliers: list[str], default_complexity: int = 1):
+def _evaluate_complexity(query: str, multipliers: list[str], default_complexity: int = 1, variables=None):
     estimator = ArgumentsEstimator(multipliers=multipliers, default_complexity=default_complexity)
-    return get_complexity(query, build_schema(_schema), estimator)
+    return get_complexity(query, build_schema(_schema), estimator, variables=variables)
 
 
 def test_field_without_matching_argument_returns_default_complexity():
@@ -88,4 +88,28 @@ def test_field_without_arguments_uses_default_complexity():
 def test_empty_list_argument_results_in_zero_complexity():
     query = """query { books(ids: []) }"""
     complexity = _evaluate_complexity(query, multipliers=["ids"])
-    assert complexity == 0  # len([]) = 0 → default_complexity * 0 = 0
\ No newline at end of file
+    assert complexity == 0  # len([]) = 0 → default_complexity * 0 = 0
+
+
+def test_variable_argument_multiplies_complexity():
+    query = """query Books($limit: Int) { books(limit: $limit) }"""
+    complexity = _evaluate_complexity(query, multipliers=["limit"], variables={"limit": 7})
+    assert complexity == 7
+
+
+def test_list_variable_uses_length_as_multiplier():
+    query = """query Books($ids: [String]) { books(ids: $ids) }"""
+    complexity = _evaluate_complexity(query, multipliers=["ids"], variables={"ids": ["a", "b"]})
+    assert complexity == 2
+
+
+def test_variable_default_value_multiplies_complexity():
+    query = """query Books($limit: Int = 4) { books(limit: $limit) }"""
+    complexity = _evaluate_complexity(query, multipliers=["limit"])
+    assert complexity == 4
+
+
+def test_missing_variable_falls_back_to_default_multiplier():
+    query = """query Books($limit: Int) { books(limit: $limit) }"""
+    complexity = _evaluate_complexity(query, multipliers=["limit"], default_complexity=3)
+    assert complexity == 3
@@ -0,0 +1,138 @@
+import pytest
+from graphql import build_schema, parse, specified_rules, validate
+
+from graphql_complexity import (
+    AnalysisStats,
+    ComplexityEstimator,
+    DirectivesEstimator,
+    build_complexity_validation_rule,
+    compile_cost_plan,
+    explain_complexity,
+    get_complexity,
+)
+from graphql_complexity.evaluator.complexity import build_complexity_tree
+from graphql_complexity.evaluator.schema_index import SchemaTypeInfo
+from graphql_complexity.evaluator.visitor import ComplexityVisitor, StreamingComplexityVisitor
+from graphql_complexity.evaluator.walker import walk
+from tests import ut_utils
+
+SCHEMA = build_schema(ut_utils.schema)
+
+
+class FieldEstimator(ComplexityEstimator):
+    def get_field_complexity(self, node, type_info, path) -> int:
+        return len(node.name.value) + len(type_info.get_parent_type().name)
+
+
+class BatchedFieldEstimator(FieldEstimator):
+    batches_fields = True
+
+    def __init__(self):
+        self.batches = []
+        self.variables = []
+
+    def get_fields_complexity(self, nodes, parent_type, variables) -> list[int]:
+        self.batches.append((parent_type.name, [node.name.value for node in nodes]))
+        self.variables.append(variables)
+        return [len(node.name.value) + len(parent_type.name) for node in nodes]
+
+    def get_field_complexity(self, node, type_info, path) -> int:
+        raise AssertionError("Fields are estimated in batches")
+
+
+@pytest.mark.parametrize("query", [
+    'query { droid(id: "1") { id name friends(first: 3) { name ... on Human { homePlanet } } } }',
+    "query { hero { ...fields } } fragment fields on Character { name appearsIn friends { id __typename } }",
+    "query ($skip: Boolean!) { hero { name @skip(if: $skip) id } }",
+    "query { __typename __schema { types { name } } hero { __typename __unknown id } }",
+])
+def test_batched_estimators_give_the_same_complexity(query):
+    variables = {"skip": True}
+    expected = get_complexity(query, SCHEMA, FieldEstimator(), variables=variables)
+
+    assert get_complexity(query, SCHEMA, BatchedFieldEstimator(), variables=variables) == expected
+    assert build_complexity_tree(query, SCHEMA, BatchedFieldEstimator(), variables=variables).evaluate() == expected
+    assert explain_complexity(query, SCHEMA, BatchedFieldEstimator(), variables=variables).total_complexity == expected
+    assert compile_cost_plan(query, SCHEMA, BatchedFieldEstimator()).evaluate(variables) == expected
+
+    complexities = []
+    rule = build_complexity_validation_rule(BatchedFieldEstimator(), variables=variables, on_complexity=complexities.append)
+    validate(SCHEMA, parse(query), [*specified_rules, rule])
+    assert complexities == [expected]
+
+
+def test_batched_estimators_are_called_once_per_selection_set():
+    estimator = BatchedFieldEstimator()
+    stats = AnalysisStats()
+    query = 'query { droid(id: "1") { id name friends { name ... on Human { homePlanet } } } }'
+
+    get_complexity(query, SCHEMA, estimator, stats=stats)
+
+    assert estimator.batches == [
+        ("Query", ["droid"]),
+        ("Droid", ["id", "name", "friends"]),
+        ("Character", ["name"]),
+        ("Human", ["homePlanet"]),
+    ]
+    assert stats.estimator_calls == 4
+    assert stats.fields_visited == 6
+
+
+def test_batched_estimators_count_the_fields_estimated_alone():
+    estimator = BatchedFieldEstimator()
+    stats = AnalysisStats()
+
+    get_complexity("query { hero { __unknown id } }", SCHEMA, estimator, stats=stats)
+
+    assert estimator.batches == [("Query", ["hero"]), ("Character", ["id"]), ("Character", ["__unknown"])]
+    assert stats.estimator_calls == 3
+
+
+@pytest.mark.parametrize("uses_variables, expected", [
+    (False, {}),
+    (True, {"skip": False, "n": 2}),
+])
+def test_batched_estimators_are_only_given_variables_when_they_use_them(uses_variables, expected):
+    estimator = BatchedFieldEstimator()
+    estimator.uses_variables = uses_variables
+    query = "query ($skip: Boolean!, $n: Int = 2) { hero { name @skip(if: $skip) } }"
+
+    get_complexity(query, SCHEMA, estimator, variables={"skip": False})
+
+    assert estimator.variables == [expected, expected]
+
+
+def test_batched_estimators_are_not_given_excluded_and_meta_fields():
+    query = """query ($skip: Boolean!) {
+        __typename
+        hero { __typename name @skip(if: $skip) id @include(if: false) friends @skip(if: true) { id } }
+    }"""
+
+    for visitor_class in (ComplexityVisitor, StreamingComplexityVisitor):
+        estimator = BatchedFieldEstimator()
+        type_info = SchemaTypeInfo(SCHEMA)
+        visitor = visitor_class(estimator, type_info, variables={"skip": True})
+        walk(parse(query), visitor, type_info)
+
+        assert estimator.batches == [("Query", ["hero"])]
+        assert visitor._fields_complexity == {}
+
+    # Cost plans keep the fields excluded by variables, for the sets of variables including them
+    estimator = BatchedFieldEstimator()
+    compile_cost_plan(query, SCHEMA, estimator)
+    assert estimator.batches == [("Query", ["hero"]), ("Character", ["name"])]
+
+
+def test_directives_estimator_batches_fields():
+    schema = build_schema("""
+        directive @complexity(value: Int!) on FIELD_DEFINITION
+        type Query {
+            a: String @complexity(value: 5)
+            b: String
+        }
+    """)
+    estimator = DirectivesEstimator(schema, missing_complexity=2)
+
+    assert estimator.batches_fields
+    assert get_complexity("query { a b x: a }", schema, estimator) == 5 + 2 + 5
+    assert estimator.get_fields_complexity(parse("{ a b }").definitions[0].selection_set.selections, None, {}) == [2, 2]
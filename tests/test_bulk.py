@@ -0,0 +1,115 @@
+import pickle
+
+import pytest
+from graphql import GraphQLError, build_schema, parse
+
+from graphql_complexity import (
+    ComplexityEstimator,
+    ComplexityLimitError,
+    ComplexityResult,
+    SimpleEstimator,
+    get_complexities,
+    get_complexity,
+)
+from graphql_complexity.evaluator import complexity as complexity_module
+from graphql_complexity.estimators.directive import get_directive_arguments
+from tests import ut_utils
+
+QUERIES = [
+    "query { version }",
+    'query { droid(id: "1") { id friends(first: 3) { name } } }',
+    "query {",
+    parse('query { human(id: "1") { id name } }'),
+    "  query { version }  ",
+    'query { droid(id: "1") { friends(first: 50) { name } } }',
+]
+
+
+class FieldDirectiveEstimator(ComplexityEstimator):
+    """Reads the complexity directive of each field while analyzing the queries."""
+
+    def get_field_complexity(self, node, type_info, path) -> int:
+        field = type_info.get_field_def()
+        arguments = get_directive_arguments(field, "complexity") if field else None
+        return arguments["value"] if arguments else 1
+
+
+@pytest.fixture
+def schema():
+    return build_schema(ut_utils.schema)
+
+
+@pytest.mark.parametrize("executor", [None, "thread", "process"])
+def test_get_complexities_returns_results_in_order(schema, executor):
+    results = get_complexities(
+        QUERIES, schema, SimpleEstimator(), max_complexity=20, executor=executor, max_workers=2, chunksize=2
+    )
+
+    assert [result.complexity for result in results] == [1, 6, None, 3, 1, None]
+    assert results[0].error is None
+    assert isinstance(results[2].error, GraphQLError)
+    assert "Syntax Error" in results[2].error.message
+    assert isinstance(results[5].error, ComplexityLimitError)
+    assert results[5].error.path == ["droid", "friends", "name"]
+
+
+def test_get_complexities_matches_get_complexity(schema):
+    queries = [query for query in QUERIES if query != "query {"]
+
+    results = get_complexities(queries, schema, SimpleEstimator(), executor="thread")
+
+    assert results == [
+        ComplexityResult(complexity=get_complexity(query, schema, SimpleEstimator())) for query in queries
+    ]
+
+
+def test_worker_processes_keep_the_directives_applied_in_the_schema():
+    schema = build_schema(ut_utils.schema + """
+        directive @complexity(value: Int!) on FIELD_DEFINITION
+        extend type Query {
+            expensive: String @complexity(value: 10)
+        }
+    """)
+    queries = ["query { expensive version }", 'query { droid(id: "1") { name } expensive }']
+
+    results = {
+        executor: get_complexities(queries, schema, FieldDirectiveEstimator(), executor=executor, max_workers=2)
+        for executor in (None, "thread", "process")
+    }
+
+    assert [result.complexity for result in results[None]] == [11, 12]
+    assert results["thread"] == results["process"] == results[None]
+
+
+def test_identical_queries_are_analyzed_once(schema, monkeypatch):
+    calls = []
+    original = complexity_module._calculate_complexity
+
+    def counting_calculate(query, *args):
+        calls.append(query)
+        return original(query, *args)
+
+    monkeypatch.setattr(complexity_module, "_calculate_complexity", counting_calculate)
+
+    results = get_complexities(
+        ["query { version }", "query { version }", " query { version }\n"], schema, SimpleEstimator(), executor=None
+    )
+
+    assert [result.complexity for result in results] == [1, 1, 1]
+    assert len(calls) == 1
+
+
+def test_get_complexities_rejects_unknown_executors(schema):
+    with pytest.raises(ValueError, match="Unknown executor 'fibers'"):
+        get_complexities(QUERIES, schema, SimpleEstimator(), executor="fibers")
+
+
+def test_complexity_limit_error_can_be_pickled():
+    error = ComplexityLimitError(12, 10, path=["droid", "friends"])
+
+    restored = pickle.loads(pickle.dumps(error))
+
+    assert restored.message == error.message
+    assert restored.complexity == 12
+    assert restored.max_complexity == 10
+    assert restored.path == ["droid", "friends"]
@@ -0,0 +1,229 @@
+import pytest
+from graphql import build_schema, parse
+
+from graphql_complexity import (
+    AnalysisStats,
+    ArgumentsEstimator,
+    ComplexityCache,
+    ComplexityEstimator,
+    ComplexityLimitError,
+    ParseCache,
+    SimpleEstimator,
+    compile_cost_plan,
+    explain_complexity,
+    get_complexity,
+)
+from graphql_complexity.config import Config
+from graphql_complexity.evaluator import cache as cache_module
+from graphql_complexity.evaluator.cache import LRUCache
+from tests.ut_utils import schema as schema_sdl
+
+
+class CountingEstimator(ComplexityEstimator):
+    def __init__(self):
+        self.calls = 0
+
+    def get_field_complexity(self, node, type_info, path) -> int:
+        self.calls += 1
+        return 1
+
+
+@pytest.fixture
+def schema():
+    return build_schema(schema_sdl)
+
+
+def test_cached_complexity_is_reused(schema):
+    cache = ComplexityCache()
+    estimator = CountingEstimator()
+    query = "query { droid { name } }"
+
+    assert get_complexity(query, schema, estimator, cache=cache) == 2
+    assert get_complexity(query, schema, estimator, cache=cache) == 2
+
+    assert estimator.calls == 2
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_documents_are_keyed_by_their_source(schema):
+    cache = ComplexityCache()
+    estimator = CountingEstimator()
+
+    get_complexity(parse("query { version }"), schema, estimator, cache=cache)
+    get_complexity(parse("query { version }"), schema, estimator, cache=cache)
+    get_complexity("query { version }", schema, estimator, cache=cache)
+
+    assert estimator.calls == 1
+    assert cache.stats.hits == 2
+
+
+@pytest.mark.parametrize("first, second", [
+    (SimpleEstimator(1), SimpleEstimator(2)),
+    (ArgumentsEstimator(["first"]), ArgumentsEstimator(["limit"])),
+    (CountingEstimator(), CountingEstimator()),
+])
+def test_different_estimators_are_not_shared(schema, first, second):
+    cache = ComplexityCache()
+
+    get_complexity("query { version }", schema, first, cache=cache)
+    get_complexity("query { version }", schema, second, cache=cache)
+
+    assert cache.stats.hits == 0
+    assert len(cache) == 2
+
+
+def test_equivalent_estimators_are_shared(schema):
+    cache = ComplexityCache()
+
+    get_complexity("query { version }", schema, SimpleEstimator(3), cache=cache)
+    get_complexity("query { version }", schema, SimpleEstimator(3), cache=cache)
+
+    assert cache.stats.hits == 1
+
+
+def test_schemas_and_configs_are_part_of_the_key(schema):
+    cache = ComplexityCache()
+    query = "query { droid { friends(first: 5) { name } } }"
+    estimator = SimpleEstimator()
+
+    assert get_complexity(query, schema, estimator, cache=cache) == 7
+    assert get_complexity(query, schema, estimator, Config(count_arg_name=None), cache=cache) == 3
+    assert get_complexity(query, build_schema(schema_sdl + "scalar Other"), estimator, cache=cache) == 7
+
+    assert cache.stats.hits == 0
+
+
+@pytest.mark.parametrize("estimator, variables, hits", [
+    # Only the variables the complexity depends on are part of the key
+    (SimpleEstimator(), {"id": "2", "n": 3, "skip": False}, 1),
+    (SimpleEstimator(), {"id": "1", "n": 4, "skip": False}, 0),
+    (SimpleEstimator(), {"id": "1", "n": 3, "skip": True}, 0),
+    (SimpleEstimator(), {"id": "1", "n": 3, "skip": False, "unused": 1}, 1),
+    # Estimators that use variables may depend on any of them
+    (ArgumentsEstimator(["first"]), {"id": "2", "n": 3, "skip": False}, 0),
+    (ArgumentsEstimator(["first"]), {"id": "1", "n": 3, "skip": False}, 1),
+    # Equal values of different types are keyed apart
+    (ArgumentsEstimator(["first"]), {"id": "1", "n": 3, "skip": 0}, 0),
+])
+def test_variables_are_keyed_when_the_complexity_depends_on_them(schema, estimator, variables, hits):
+    cache = ComplexityCache()
+    query = 'query ($id: ID!, $n: Int, $skip: Boolean) { droid(id: $id) { name @skip(if: $skip) friends(first: $n) { id } } }'
+
+    get_complexity(query, schema, estimator, variables={"id": "1", "n": 3, "skip": False}, cache=cache)
+    get_complexity(query, schema, estimator, variables=variables, cache=cache)
+
+    assert cache.stats.hits == hits
+
+
+def test_variables_are_keyed_by_their_use_in_documents(schema):
+    cache = ComplexityCache()
+    query = "query ($id: ID!) { droid(id: $id) { name } }"
+    estimator = SimpleEstimator()
+
+    get_complexity(parse(query), schema, estimator, variables={"id": "1"}, cache=cache)
+    get_complexity(parse(query), schema, estimator, variables={"id": "2"}, cache=cache)
+    get_complexity(query, schema, estimator, variables={"id": "3"}, cache=cache)
+
+    assert cache.stats.hits == 2
+
+
+def test_cached_complexity_is_checked_against_the_limit(schema):
+    cache = ComplexityCache()
+    query = "query { droid { name } }"
+
+    get_complexity(query, schema, SimpleEstimator(), cache=cache)
+
+    with pytest.raises(ComplexityLimitError):
+        get_complexity(query, schema, SimpleEstimator(), max_complexity=1, cache=cache)
+    assert cache.stats.hits == 1
+
+
+def test_lower_bounds_are_only_reused_to_reject_queries(schema):
+    cache = ComplexityCache()
+    estimator = CountingEstimator()
+    query = "query { version droid { name id } }"
+
+    for _ in range(2):
+        with pytest.raises(ComplexityLimitError) as exc_info:
+            get_complexity(query, schema, estimator, max_complexity=1, cache=cache)
+        assert exc_info.value.path == ["droid"]
+    assert estimator.calls == 2
+
+    assert get_complexity(query, schema, estimator, cache=cache) == 4
+    assert estimator.calls == 6
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = LRUCache(maxsize=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now)
+    cache = LRUCache(ttl=10)
+
+    cache.set("a", 1)
+    now = 109.0
+    assert cache.get("a") == 1
+    now = 110.0
+    assert cache.get("a") is None
+
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_cache_size_must_be_positive():
+    with pytest.raises(ValueError, match=r"^'maxsize' must be a positive integer \(greater than 0\)$"):
+        LRUCache(maxsize=0)
+
+
+def test_entries_are_evicted_once_their_size_exceeds_maxbytes():
+    cache = ParseCache(maxsize=10, maxbytes=50)
+    small = ["{ a }", "{ b }", "{ c }"]
+    huge = "{ " + " ".join(f"f{i}" for i in range(12)) + " }"
+
+    for query in small:
+        cache.parse(query)
+    cache.parse(small[0])
+    cache.parse(huge)
+
+    assert cache.size == len(huge) + len(small[0]) <= 50
+    assert cache.get(small[0]) is not None and cache.get(small[1]) is None
+    assert cache.stats.evictions == 2
+
+
+def test_entries_bigger_than_maxbytes_are_not_cached():
+    cache = ParseCache(maxbytes=10)
+    cache.parse("{ a }")
+
+    cache.parse("{ a b c d e f }")
+
+    assert len(cache) == 1 and cache.size == 5
+    with pytest.raises(ValueError, match=r"^'maxbytes' must be a positive integer \(greater than 0\)$"):
+        ParseCache(maxbytes=0)
+
+
+def test_parse_cache_is_used_by_the_analysis_functions(schema):
+    cache = ParseCache()
+    stats = AnalysisStats()
+    query = 'query { droid(id: "1") { id } }'
+
+    get_complexity(query, schema, SimpleEstimator(), parse_cache=cache, stats=stats)
+    explain_complexity(query, schema, SimpleEstimator(), parse_cache=cache, stats=stats)
+    compile_cost_plan(query, schema, SimpleEstimator(), parse_cache=cache)
+
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+    assert (stats.parse_cache_hits, stats.parse_cache_misses) == (1, 1)
+    cache.clear()
+    assert len(cache) == 0 and cache.size == 0
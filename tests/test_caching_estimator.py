@@ -0,0 +1,141 @@
+import pytest
+from graphql import build_schema
+
+from graphql_complexity import (
+    ArgumentsEstimator,
+    CachingEstimator,
+    ComplexityEstimator,
+    CostSpecEstimator,
+    get_complexity,
+)
+from graphql_complexity.evaluator.complexity import build_complexity_tree
+
+SCHEMA = build_schema("""
+    input Filter {
+        name: String
+        tags: [String]
+    }
+
+    type Query {
+        books(limit: Int, filter: Filter, name: String): [Book]
+        author: Author
+    }
+
+    type Book {
+        title: String
+        author: Author
+    }
+
+    type Author {
+        name: String
+        books(limit: Int): [Book]
+    }
+""")
+
+
+COST_SPEC_SCHEMA = build_schema("""
+    directive @cost(weight: String!) on FIELD_DEFINITION | OBJECT
+    directive @listSize(slicingArguments: [String!], sizedFields: [String!]) on FIELD_DEFINITION
+
+    type Query {
+        users(first: Int): UserConnection @listSize(slicingArguments: ["first"], sizedFields: ["edges"])
+    }
+
+    type UserConnection {
+        edges: [UserEdge]
+    }
+
+    type UserEdge {
+        node: User
+    }
+
+    type User {
+        name: String @cost(weight: "3")
+    }
+""")
+
+
+class RecordingEstimator(ComplexityEstimator):
+    pure = True
+
+    def __init__(self):
+        self.calls = []
+
+    def get_field_complexity(self, node, type_info, path) -> int:
+        self.calls.append((type_info.get_parent_type().name, node.name.value))
+        return len(node.arguments) + 1
+
+
+def test_caching_estimator_estimates_each_field_once():
+    estimator = RecordingEstimator()
+    caching = CachingEstimator(estimator)
+    query = """query {
+        a: books { title author { name } }
+        b: books { title author { name } }
+        author { books { title } }
+    }"""
+
+    assert get_complexity(query, SCHEMA, caching) == get_complexity(query, SCHEMA, RecordingEstimator())
+    assert estimator.calls == [
+        ("Query", "books"), ("Book", "title"), ("Book", "author"), ("Author", "name"),
+        ("Query", "author"), ("Author", "books"),
+    ]
+    assert (caching.stats.hits, caching.stats.misses) == (5, 6)
+
+
+@pytest.mark.parametrize("first, second, cached", [
+    ('books(limit: 1, name: "a")', 'books(name: "a", limit: 1)', True),
+    ('books(filter: {name: "a", tags: ["b"]})', 'books(filter: {tags: ["b"], name: "a"})', True),
+    ("books(limit: 1)", "books(limit: 2)", False),
+    ('books(name: "1")', "books(limit: 1)", False),
+    ('books(filter: {tags: ["a", "b"]})', 'books(filter: {tags: ["b", "a"]})', False),
+    # Estimators that do not use variables only see their name
+    ("books(limit: $a)", "books(limit: $a)", True),
+    ("books(limit: $a)", "books(limit: $b)", False),
+])
+def test_caching_estimator_keys_by_normalized_arguments(first, second, cached):
+    estimator = RecordingEstimator()
+    caching = CachingEstimator(estimator)
+
+    get_complexity(f"query ($a: Int, $b: Int) {{ {first} {{ title }} }}", SCHEMA, caching, variables={"a": 1, "b": 1})
+    get_complexity(f"query ($a: Int, $b: Int) {{ {second} {{ title }} }}", SCHEMA, caching, variables={"a": 1, "b": 1})
+
+    assert len(estimator.calls) == (2 if cached else 3)
+
+
+def test_caching_estimator_resolves_the_variables_of_estimators_using_them():
+    caching = CachingEstimator(ArgumentsEstimator(multipliers=["limit"]))
+    query = "query ($n: Int) { books(limit: $n) { title } }"
+
+    assert get_complexity(query, SCHEMA, caching, variables={"n": 5}) == 5 + 1
+    assert get_complexity(query, SCHEMA, caching, variables={"n": 3}) == 3 + 1
+    assert get_complexity(query, SCHEMA, caching, variables={"n": 5}) == 5 + 1
+    assert (caching.stats.hits, caching.stats.misses) == (3, 3)
+
+
+def test_caching_estimator_forwards_list_sizes():
+    estimator = CostSpecEstimator(COST_SPEC_SCHEMA)
+    caching = CachingEstimator(estimator)
+    query = "query { users(first: 10) { edges { node { name } } } }"
+
+    assert caching.sizes_lists
+    assert build_complexity_tree(query, COST_SPEC_SCHEMA, caching).evaluate() == 1 + 1 + 10 * (1 + 3)
+    assert caching.fingerprint() == estimator.fingerprint()
+
+
+def test_caching_estimator_is_bounded():
+    caching = CachingEstimator(RecordingEstimator(), maxsize=2)
+
+    get_complexity("query { author { name books { title } } }", SCHEMA, caching)
+
+    assert len(caching.cache) == 2
+    assert caching.stats.evictions == 2
+
+
+def test_caching_estimator_requires_a_pure_estimator():
+    class ImpureEstimator(ComplexityEstimator):
+        def get_field_complexity(self, node, type_info, path) -> int:
+            return len(path)
+
+    with pytest.raises(ValueError, match="^Only pure estimators can be cached$"):
+        CachingEstimator(ImpureEstimator())
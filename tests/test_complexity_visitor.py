@@ -1,15 +1,17 @@
 import pytest
-from graphql import build_schema
+from graphql import GraphQLError, build_schema
 
 from graphql_complexity import SimpleEstimator, get_complexity
+from graphql_complexity.evaluator import nodes
+from graphql_complexity.evaluator.complexity import build_complexity_tree
 from graphql_complexity.evaluator.visitor import ComplexityVisitor
 from tests import ut_utils
 
 
-def _evaluate_complexity(query: str, estimator=None):
+def _evaluate_complexity(query: str, estimator=None, operation_name=None):
     estimator = estimator or SimpleEstimator(1)
     schema = build_schema(ut_utils.schema)
-    return get_complexity(query, schema, estimator)
+    return get_complexity(query, schema, estimator, operation_name=operation_name)
 
 
 def test_one_field_simple_complexity_calculation():
@@ -84,6 +86,54 @@ def test_complexity_works_with_multiple_operation_definitions():
     assert complexity == 2
 
 
+def test_complexity_only_counts_the_selected_operation_and_its_fragments():
+    query = """
+        query FirstOne {
+            droid(id: "1") { ...DroidFields }
+        }
+        query OtherOne {
+            version
+            human(id: "1") { ...HumanFields }
+        }
+        fragment DroidFields on Droid { id name primaryFunction }
+        fragment HumanFields on Human { id ...NameField }
+        fragment NameField on Human { name }
+    """
+
+    assert _evaluate_complexity(query, operation_name="FirstOne") == 4
+    assert _evaluate_complexity(query, operation_name="OtherOne") == 4
+    assert _evaluate_complexity(query) == 8
+
+
+def test_unreachable_fragments_are_not_analyzed_for_the_selected_operation():
+    query = """
+        query FirstOne { version }
+        query OtherOne { version ...Cycle }
+        fragment Cycle on Query { ...Cycle }
+    """
+
+    assert _evaluate_complexity(query, operation_name="FirstOne") == 1
+
+
+def test_unknown_operation_name_raises():
+    query = "query FirstOne { version }"
+
+    with pytest.raises(GraphQLError, match="Unknown operation named 'Missing'."):
+        _evaluate_complexity(query, operation_name="Missing")
+
+
+def test_complexity_tree_is_built_for_the_selected_operation():
+    query = """
+        query FirstOne { version }
+        query OtherOne { version human(id: "1") { id } }
+    """
+    schema = build_schema(ut_utils.schema)
+
+    tree = build_complexity_tree(query, schema, SimpleEstimator(1), operation_name="OtherOne")
+
+    assert tree.evaluate() == 3
+
+
 def test_complexity_handles_fragments():
     query = """
         fragment fields on Character {
@@ -267,3 +317,63 @@ fragment TypeRef on __Type {
     complexity = _evaluate_complexity(query)
 
     assert complexity == 0
+
+
+@pytest.mark.parametrize("query", [
+    "query { version }",
+    "query { droid { id friends(first: 3) { name friends(first: 2) { name } } } }",
+    "query { droid { friends(first: 3) { ...names } } } fragment names on Character { name appearsIn }",
+    "fragment names on Character { name } query { hero { ...names friends { ...names } } }",
+    "query ($skip: Boolean = true) { version @skip(if: $skip) droid { name } }",
+    "query { droid { __typename id } }",
+])
+def test_complexity_matches_complexity_tree_evaluation(query):
+    schema = build_schema(ut_utils.schema)
+    estimator = SimpleEstimator(2)
+
+    tree = build_complexity_tree(query, schema, estimator)
+
+    assert get_complexity(query, schema, estimator) == tree.evaluate()
+
+
+def test_complexity_does_not_build_complexity_tree(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("The complexity tree should not be built")
+
+    monkeypatch.setattr(nodes, "build_node", fail)
+    query = """
+        query {
+            droid {
+                friends(first: 5) {
+                    name
+                }
+            }
+        }
+    """
+
+    complexity = _evaluate_complexity(query)
+
+    assert complexity == 7
+
+
+def test_complexity_multiplies_fragments_spread_inside_lists():
+    query = """
+        query {
+            droid {
+                friends(first: 10) {
+                    ...fields
+                }
+            }
+        }
+        fragment fields on Character {
+            name
+            ...nested
+        }
+        fragment nested on Character {
+            id
+        }
+    """
+
+    complexity = _evaluate_complexity(query)
+
+    assert complexity == 22
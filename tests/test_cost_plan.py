@@ -0,0 +1,193 @@
+import pickle
+
+import pytest
+from graphql import build_schema
+
+from graphql_complexity import (
+    ArgumentsEstimator,
+    ComplexityCache,
+    CostPlan,
+    FragmentCycleError,
+    SimpleEstimator,
+    compile_cost_plan,
+    get_complexity,
+)
+from graphql_complexity.config import Config
+from graphql_complexity.evaluator import plan as plan_module
+from tests import ut_utils
+
+
+@pytest.fixture
+def schema():
+    return build_schema(ut_utils.schema)
+
+
+@pytest.mark.parametrize("query, variables", [
+    ("query { version }", None),
+    ('query { droid(id: "1") { id friends(first: 3) { name friends(first: 2) { name } } } }', None),
+    ("query ($n: Int) { hero { friends(first: $n) { name } } }", {"n": 5}),
+    ("query ($n: Int) { hero { friends(first: $n) { name } } }", None),
+    ("query ($n: Int = 4) { hero { friends(first: $n) { name } } }", None),
+    ("query ($n: Int = 4) { hero { friends(first: $n) { name } } }", {"n": 2}),
+    ("query ($s: Boolean!) { version @skip(if: $s) hero { name } }", {"s": True}),
+    ("query ($s: Boolean!) { version @skip(if: $s) hero { name } }", {"s": False}),
+    ("query ($i: Boolean = false) { hero { friends(first: 3) @include(if: $i) { name } } }", None),
+    ("query ($i: Boolean = false) { hero { friends(first: 3) @include(if: $i) { name } } }", {"i": True}),
+    ("query { version @skip(if: true) hero @include(if: true) { name } }", None),
+    (
+        "query ($n: Int, $i: Boolean) { hero { friends(first: $n) { ...names @include(if: $i) } } } "
+        "fragment names on Character { name friends(first: $n) { ...ids } } "
+        "fragment ids on Character { id }",
+        {"n": 3, "i": True},
+    ),
+    (
+        "query ($i: Boolean) { hero { ... on Droid @include(if: $i) { primaryFunction } name } }",
+        {"i": True},
+    ),
+    (
+        "query ($i: Boolean) { hero { ... on Droid @include(if: $i) { primaryFunction } name } }",
+        {"i": False},
+    ),
+    ("query { hero { __typename name } }", None),
+    ("fragment F on Query { hero { friends(first: $n) { id } } } query Q($n: Int = 10) { ...F }", None),
+    ("fragment F on Query { hero { friends(first: $n) { id } } } query Q($n: Int = 10) { ...F }", {"n": 2}),
+])
+def test_cost_plan_matches_get_complexity(schema, query, variables):
+    plan = compile_cost_plan(query, schema, SimpleEstimator())
+
+    assert plan.evaluate(variables) == get_complexity(query, schema, SimpleEstimator(), variables=variables)
+
+
+def test_cost_plan_is_evaluated_for_each_set_of_variables(schema):
+    query = "query ($n: Int) { hero { friends(first: $n) { name } } }"
+
+    plan = compile_cost_plan(query, schema, SimpleEstimator())
+
+    assert [plan.evaluate({"n": n}) for n in (1, 10, 100)] == [3, 12, 102]
+
+
+def test_cost_plan_uses_config(schema):
+    query = "query ($n: Int) { hero { friends(count: $n) { name } } }"
+    config = Config(count_arg_name="count", count_missing_arg_value=7)
+
+    plan = compile_cost_plan(query, schema, SimpleEstimator(), config)
+
+    assert plan.evaluate({"n": 2}) == 4
+    assert plan.evaluate() == 9
+
+
+def test_cost_plan_can_be_pickled(schema):
+    query = """
+        query ($n: Int, $i: Boolean) { hero { friends(first: $n) { ...names @include(if: $i) } } }
+        fragment names on Character { name }
+    """
+    plan = compile_cost_plan(query, schema, SimpleEstimator())
+
+    restored = pickle.loads(pickle.dumps(plan))
+
+    assert isinstance(restored, CostPlan)
+    assert restored == plan
+    assert restored.evaluate({"n": 4, "i": True}) == plan.evaluate({"n": 4, "i": True}) == 6
+
+
+def test_cost_plan_only_compiles_the_selected_operation(schema):
+    query = """
+        query First { version }
+        query Second ($n: Int) { hero { friends(first: $n) { name } } }
+    """
+
+    plan = compile_cost_plan(query, schema, SimpleEstimator(), operation_name="Second")
+
+    assert plan.evaluate({"n": 2}) == 4
+
+
+def test_cost_plan_is_reused_from_cache(schema):
+    cache = ComplexityCache()
+    query = "query ($n: Int) { hero { friends(first: $n) { name } } }"
+
+    first = compile_cost_plan(query, schema, SimpleEstimator(), cache=cache)
+    second = compile_cost_plan(query, schema, SimpleEstimator(), cache=cache)
+    get_complexity(query, schema, SimpleEstimator(), cache=cache)
+
+    assert first is second
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+
+def test_cost_plan_checks_fragment_cycles(schema):
+    query = """
+        query { hero { ...A } }
+        fragment A on Character { ...B }
+        fragment B on Character { ...A }
+    """
+
+    with pytest.raises(FragmentCycleError):
+        compile_cost_plan(query, schema, SimpleEstimator())
+
+
+def test_cost_plan_rejects_estimators_using_variables(schema):
+    estimator = ArgumentsEstimator(multipliers=["first"])
+
+    with pytest.raises(ValueError, match="Cost plans can not be compiled for estimators that use variables"):
+        compile_cost_plan("query { version }", schema, estimator)
+
+
+BATCH_QUERY = """
+    query ($n: Int, $m: Int = 2, $i: Boolean) {
+        hero { name friends(first: $n) { ...names @include(if: $i) } }
+    }
+    fragment names on Character { name friends(first: $m) { ...ids } }
+    fragment ids on Character { id }
+"""
+
+BATCH_BINDINGS = [
+    {"n": 3, "i": True},
+    {"n": 3, "i": False},
+    {"n": 10, "m": 0, "i": True},
+    {"n": "invalid", "i": True},
+    {},
+    None,
+]
+
+
+def test_evaluate_many_matches_evaluate(schema):
+    plan = compile_cost_plan(BATCH_QUERY, schema, SimpleEstimator())
+
+    assert plan.evaluate_many(BATCH_BINDINGS) == [plan.evaluate(variables) for variables in BATCH_BINDINGS]
+
+
+def test_evaluate_many_without_numpy(schema, monkeypatch):
+    plan = compile_cost_plan(BATCH_QUERY, schema, SimpleEstimator())
+    expected = [plan.evaluate(variables) for variables in BATCH_BINDINGS]
+
+    monkeypatch.setattr(plan_module, "numpy", None)
+
+    assert plan.evaluate_many(BATCH_BINDINGS) == expected
+
+
+def test_evaluate_many_with_numpy_returns_python_ints(schema):
+    pytest.importorskip("numpy")
+    plan = compile_cost_plan(BATCH_QUERY, schema, SimpleEstimator())
+
+    results = plan.evaluate_many(BATCH_BINDINGS)
+
+    assert all(type(result) is int for result in results)
+
+
+@pytest.mark.parametrize("bindings", [
+    # The complexity overflows 64-bit integers, but not the counts
+    [{"n": 2 ** 62, "m": 4, "i": True}, {"n": 3, "i": True}],
+    # The counts themselves overflow them
+    [{"n": 2 ** 63, "i": True}, {"n": -2 ** 64, "i": True}],
+    [{"n": 2 ** 63 - 1, "i": False}],
+])
+def test_evaluate_many_does_not_overflow(schema, bindings):
+    plan = compile_cost_plan(BATCH_QUERY, schema, SimpleEstimator())
+
+    assert plan.evaluate_many(bindings) == [plan.evaluate(variables) for variables in bindings]
+
+
+def test_evaluate_many_without_bindings(schema):
+    plan = compile_cost_plan(BATCH_QUERY, schema, SimpleEstimator())
+
+    assert plan.evaluate_many([]) == []
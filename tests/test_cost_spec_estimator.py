@@ -0,0 +1,144 @@
+from typing import List, Optional
+
+import pytest
+import strawberry
+from graphql import build_schema
+from strawberry.schema_directive import Location
+
+from graphql_complexity import CostSpecEstimator, compile_cost_plan, explain_complexity, get_complexity
+from graphql_complexity.evaluator.complexity import build_complexity_tree
+
+SDL = """
+    directive @cost(weight: String!) on
+        ARGUMENT_DEFINITION | ENUM | FIELD_DEFINITION | INPUT_FIELD_DEFINITION | OBJECT | SCALAR
+    directive @listSize(
+        assumedSize: Int, slicingArguments: [String!], sizedFields: [String!], requireOneSlicingArgument: Boolean = true
+    ) on FIELD_DEFINITION
+
+    type Query {
+        users(first: Int, last: Int): UserConnection
+            @listSize(slicingArguments: ["first", "last"], sizedFields: ["edges", "nodes"])
+        tags: [Tag] @listSize(assumedSize: 20)
+        posts(limit: Int): [Post] @listSize(slicingArguments: ["limit"], assumedSize: 5)
+        plain(first: Int): [Tag]
+        recent(first: Int = 8): [Post] @listSize(slicingArguments: ["first"], assumedSize: 5)
+    }
+
+    type UserConnection {
+        edges: [UserEdge]
+        nodes: [User]
+        totalCount: Int
+    }
+
+    type UserEdge {
+        node: User
+        cursor: String
+    }
+
+    type User {
+        id: ID
+        name: String @cost(weight: "2.5")
+        score: Score
+    }
+
+    type Score @cost(weight: "4") {
+        value: Int
+    }
+
+    type Tag {
+        name: String
+    }
+
+    type Post {
+        title: String
+    }
+"""
+SCHEMA = build_schema(SDL)
+
+
+@pytest.mark.parametrize("query, variables, expected", [
+    # users + edges + 10 * (node + name)
+    ("query { users(first: 10) { edges { node { name } } totalCount } }", None, 1 + 1 + 10 * (1 + 3) + 1),
+    # The largest slicing argument is used, and they can be variables
+    ("query ($n: Int) { users(first: 3, last: $n) { nodes { id } } }", {"n": 7}, 1 + 1 + 7),
+    (
+        "query { users(first: 2) { ... on UserConnection { edges { node { score { value } } } } } }",
+        None,
+        1 + 1 + 2 * (1 + 4 + 1),
+    ),
+    ("query { tags { name } }", None, 1 + 20),
+    ("query { posts { title } }", None, 1 + 5),
+    ("query { posts(limit: 2) { title } }", None, 1 + 2),
+    # Slicing arguments that are not given take their default value
+    ("query { recent { title } }", None, 1 + 8),
+    # List fields without @listSize use the count argument of the config
+    ("query { plain(first: 4) { name } }", None, 1 + 4),
+    # Without slicing arguments nor assumed size, the connection is not multiplied
+    ("query { users { edges { cursor } } }", None, 1 + 1 + 1),
+])
+def test_cost_spec_estimator(query, variables, expected):
+    estimator = CostSpecEstimator(SCHEMA)
+
+    assert get_complexity(query, SCHEMA, estimator, variables=variables) == expected
+    assert build_complexity_tree(query, SCHEMA, estimator, variables=variables).evaluate() == expected
+    assert explain_complexity(query, SCHEMA, estimator, variables=variables).total_complexity == expected
+
+
+def test_cost_spec_estimator_compiles_the_directives_into_tables():
+    estimator = CostSpecEstimator(SDL)
+
+    assert estimator.weights == {("User", "name"): 3, ("User", "score"): 4}
+    assert estimator.list_sizes[("Query", "users")] == (None, ("first", "last"), ("edges", "nodes"))
+    assert estimator.fingerprint() == CostSpecEstimator(SCHEMA).fingerprint()
+
+
+@pytest.mark.parametrize("spread, inlined", [
+    (
+        "query { users(first: 10) { ...C } } fragment C on UserConnection { edges { node { name } } }",
+        "query { users(first: 10) { ... on UserConnection { edges { node { name } } } } }",
+    ),
+    (
+        "query { users(first: 2) { ...C } posts(limit: 3) { title } } "
+        "fragment C on UserConnection { ...E nodes { score { value } } } fragment E on UserConnection { edges { cursor } }",
+        "query { users(first: 2) { edges { cursor } nodes { score { value } } } posts(limit: 3) { title } }",
+    ),
+])
+def test_cost_spec_estimator_sizes_the_fragments_spread_in_sized_fields(spread, inlined):
+    estimator = CostSpecEstimator(SCHEMA)
+    expected = get_complexity(inlined, SCHEMA, estimator)
+
+    assert get_complexity(spread, SCHEMA, estimator) == expected
+    assert build_complexity_tree(spread, SCHEMA, estimator).evaluate() == expected
+    assert explain_complexity(spread, SCHEMA, estimator).total_complexity == expected
+
+
+def test_cost_spec_estimator_reads_strawberry_schema_directives():
+    @strawberry.schema_directive(locations=[Location.FIELD_DEFINITION])
+    class ListSize:
+        assumed_size: Optional[int] = None
+        slicing_arguments: Optional[List[str]] = None
+
+    @strawberry.schema_directive(locations=[Location.FIELD_DEFINITION])
+    class Cost:
+        weight: str
+
+    @strawberry.type
+    class Item:
+        name: str = strawberry.field(directives=[Cost(weight="2")])
+
+    @strawberry.type
+    class Query:
+        @strawberry.field(directives=[ListSize(assumed_size=50, slicing_arguments=["limit"])])
+        def items(self, limit: Optional[int] = None) -> Optional[List[Item]]:
+            return []
+
+    schema = strawberry.Schema(query=Query)
+    estimator = CostSpecEstimator(schema)
+
+    assert get_complexity("query { items { name } }", schema._schema, estimator) == 1 + 50 * 2
+    assert get_complexity("query { items(limit: 3) { name } }", schema._schema, estimator) == 1 + 3 * 2
+
+
+def test_cost_plans_can_not_be_compiled_for_the_cost_spec_estimator():
+    with pytest.raises(ValueError, match="^Cost plans can not be compiled for estimators that size lists$"):
+        compile_cost_plan("query { tags { name } }", SCHEMA, CostSpecEstimator(SCHEMA))
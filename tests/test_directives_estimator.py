@@ -1,4 +1,6 @@
+import strawberry
 from graphql import build_schema
+from strawberry.schema_directive import Location
 
 from graphql_complexity import DirectivesEstimator, get_complexity
 
@@ -146,3 +148,84 @@ def test_directive_estimator_should_accept_field_with_directive_is_part_of_an_ob
     complexity = _evaluate_complexity_with_directives_estimator(query, schema)
 
     assert complexity == 123
+
+
+TYPED_SCHEMA = """
+    directive @complexity(value: Int!) on FIELD_DEFINITION
+
+    interface Node {
+      id: ID
+      posts: [Post] @complexity(value: 7)
+    }
+
+    type User implements Node {
+      id: ID
+      posts: [Post] @complexity(value: 10)
+      friends: [User]
+    }
+
+    type Page implements Node {
+      id: ID
+      posts: [Post]
+    }
+
+    type Post {
+      posts: [Post]
+    }
+
+    type Query {
+      user: User
+      page: Page
+      node: Node
+    }
+"""
+
+
+def test_directive_estimator_costs_are_qualified_by_parent_type():
+    query = "query { user { posts { posts { id: __typename } } } }"
+
+    complexity = _evaluate_complexity_with_directives_estimator(query, TYPED_SCHEMA)
+
+    assert complexity == 1 + 10 + 1
+
+
+def test_directive_estimator_inherits_costs_from_interfaces():
+    query = "query { page { posts { __typename } } node { posts { __typename } ... on User { posts { __typename } } } }"
+
+    complexity = _evaluate_complexity_with_directives_estimator(query, TYPED_SCHEMA)
+
+    assert complexity == (1 + 7) + (1 + 7 + 10)
+
+
+def test_directive_estimator_reads_schema_objects_without_sdl():
+    schema = build_schema(TYPED_SCHEMA)
+    schema.type_map["User"].fields["friends"].extensions = {"complexity": 4}
+
+    estimator = DirectivesEstimator(schema)
+
+    assert get_complexity("query { user { posts { __typename } friends { id } } }", schema, estimator) == 1 + 10 + 4 + 1
+
+
+def test_directive_estimator_reads_strawberry_schema_directives():
+    @strawberry.schema_directive(locations=[Location.FIELD_DEFINITION])
+    class Complexity:
+        value: int
+
+    @strawberry.type
+    class Query:
+        cheap: str = strawberry.field(resolver=lambda: "cheap")
+        expensive: str = strawberry.field(resolver=lambda: "expensive", directives=[Complexity(value=25)])
+
+    schema = strawberry.Schema(query=Query)
+
+    complexity = get_complexity("query { cheap expensive }", schema._schema, DirectivesEstimator(schema))
+
+    assert complexity == 26
+
+
+def test_directive_estimator_uses_missing_complexity_for_unknown_fields():
+    query = "query { user { unknown { id } } }"
+
+    complexity = _evaluate_complexity_with_directives_estimator(query, TYPED_SCHEMA, missing_complexity=3)
+
+    assert complexity == 9
@@ -11,6 +11,7 @@ from graphql_complexity import (
     DirectivesEstimator,
     SimpleEstimator,
 )
+from graphql_complexity.evaluator import nodes
 from graphql_complexity.evaluator.explain import ExplanationResult, FieldExplanation
 
 
@@ -594,3 +595,61 @@ def test_field_explanation_str_with_multiplier():
     assert "Children complexity: 10" in str_repr
     assert "× 5 = 50" in str_repr  # 10 × 5
     assert "Total: 55" in str_repr
+
+
+def test_explain_evaluates_each_node_once(monkeypatch):
+    """Test that explaining a deep query evaluates every subtree only once."""
+    schema = build_schema(
+        """
+        type Query {
+            node: Node
+        }
+        type Node {
+            id: ID!
+            node: Node
+        }
+    """
+    )
+    depth = 100
+    query = "query { " + "node { " * depth + "id" + " }" * depth + " }"
+
+    combine_calls = 0
+    original_combine = nodes.Field._combine
+
+    def counting_combine(self, children_complexity):
+        nonlocal combine_calls
+        combine_calls += 1
+        return original_combine(self, children_complexity)
+
+    monkeypatch.setattr(nodes.Field, "_combine", counting_combine)
+
+    explanation = explain_complexity(query=query, schema=schema, estimator=SimpleEstimator())
+
+    assert combine_calls == depth + 1
+    assert explanation.total_complexity == depth + 1
+    assert explanation.field_breakdown[0].field_path == "node"
+    assert explanation.field_breakdown[0].children_complexity == depth
+    assert explanation.field_breakdown[-1].field_path == ".".join(["node"] * depth + ["id"])
+    assert explanation.tree_representation.count("\n") == depth + 1
+
+
+def test_explain_only_the_selected_operation():
+    schema = build_schema(
+        """
+        type Query {
+            version: String
+            name: String
+        }
+    """
+    )
+    query = """
+        query FirstOne { version }
+        query OtherOne { version name }
+    """
+
+    explanation = explain_complexity(
+        query=query, schema=schema, estimator=SimpleEstimator(), operation_name="OtherOne"
+    )
+
+    assert explanation.total_complexity == 2
+    assert [field.field_path for field in explanation.field_breakdown] == ["version", "name"]
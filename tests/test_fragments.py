@@ -0,0 +1,150 @@
+import pytest
+from graphql import build_schema
+
+from graphql_complexity import (
+    FragmentCycleError,
+    FragmentExpansionError,
+    SimpleEstimator,
+    get_complexity,
+)
+from graphql_complexity.config import Config
+from graphql_complexity.evaluator.complexity import build_complexity_tree
+from graphql_complexity.evaluator.nodes import FragmentSpreadNode, RootNode
+from tests import ut_utils
+
+
+@pytest.fixture(params=[
+    lambda query, schema, config: get_complexity(query, schema, SimpleEstimator(), config),
+    lambda query, schema, config: build_complexity_tree(query, schema, SimpleEstimator(), config).evaluate(),
+], ids=["get_complexity", "build_complexity_tree"])
+def evaluate(request):
+    def _evaluate(query: str, config: Config | None = None):
+        return request.param(query, build_schema(ut_utils.schema), config)
+    return _evaluate
+
+
+def test_fragment_spreading_itself_raises(evaluate):
+    query = """
+        query {
+            hero {
+                ...fields
+            }
+        }
+        fragment fields on Character {
+            name
+            ...fields
+        }
+    """
+
+    with pytest.raises(FragmentCycleError, match=r"^Cannot spread fragment 'fields' within itself\.$"):
+        evaluate(query)
+
+
+def test_mutually_recursive_fragments_raise(evaluate):
+    query = """
+        query {
+            hero {
+                ...first
+            }
+        }
+        fragment first on Character {
+            ...second
+        }
+        fragment second on Character {
+            friends {
+                ...third
+            }
+        }
+        fragment third on Character {
+            ...first
+        }
+    """
+
+    with pytest.raises(
+        FragmentCycleError,
+        match=r"^Cannot spread fragment 'first' within itself via 'second', 'third'\.$",
+    ):
+        evaluate(query)
+
+
+def test_long_fragment_chains_do_not_recurse():
+    fragments = "\n".join(
+        f"fragment f{i} on Character {{ name ...f{i + 1} }}" for i in range(5000)
+    )
+    query = f"""
+        query {{
+            hero {{
+                ...f0
+            }}
+        }}
+        {fragments}
+        fragment f5000 on Character {{
+            name
+        }}
+    """
+
+    assert get_complexity(query, build_schema(ut_utils.schema), SimpleEstimator()) == 5002
+
+
+def test_fragments_expansion_is_bounded(evaluate):
+    fragments = "\n".join(
+        f"fragment f{i} on Character {{ ...f{i + 1} ...f{i + 1} }}" for i in range(50)
+    )
+    query = f"""
+        query {{
+            hero {{
+                ...f0
+            }}
+        }}
+        {fragments}
+        fragment f50 on Character {{
+            name
+        }}
+    """
+
+    with pytest.raises(FragmentExpansionError, match=r"^Fragments expand to more than 1000 fields\.$"):
+        evaluate(query, Config(max_fragment_expansion=1000))
+
+
+def test_fragments_expansion_within_the_limit(evaluate):
+    query = """
+        query {
+            hero {
+                ...fields
+            }
+            droid(id: "1") {
+                ...fields
+            }
+        }
+        fragment fields on Character {
+            id
+            name
+        }
+    """
+
+    assert evaluate(query, Config(max_fragment_expansion=6)) == 6
+
+
+def test_unused_fragments_are_not_expanded(evaluate):
+    query = """
+        query {
+            version
+        }
+        fragment fields on Character {
+            id
+            name
+        }
+    """
+
+    assert evaluate(query, Config(max_fragment_expansion=1)) == 1
+
+
+def test_fragment_spread_node_detects_cycles():
+    fragments = {}
+    fragment = RootNode(name="fragment")
+    fragment.add_child(FragmentSpreadNode(name="fields", fragments_definition=fragments))
+    fragments["fields"] = fragment
+    spread = FragmentSpreadNode(name="fields", fragments_definition=fragments)
+
+    with pytest.raises(FragmentCycleError, match=r"^Cannot spread fragment 'fields' within itself\.$"):
+        spread.evaluate()
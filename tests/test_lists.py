@@ -1,6 +1,8 @@
-from graphql import build_schema
+import pytest
+from graphql import build_schema, parse, specified_rules, validate
 
-from graphql_complexity import SimpleEstimator, get_complexity
+from graphql_complexity import SimpleEstimator, build_complexity_validation_rule, compile_cost_plan, get_complexity
+from graphql_complexity.evaluator.complexity import build_complexity_tree
 from graphql_complexity.config import Config
 from tests.ut_utils import schema
 
@@ -64,3 +66,83 @@ def test_complexity_config_allows_penalizing_missing_count_argument():
     complexity = get_complexity(query, build_schema(schema), SimpleEstimator(), Config(count_missing_arg_value=100))
 
     assert complexity == 102
+
+
+def test_complexity_reads_count_from_request_variables():
+    query = """query Friends($count: Int) {
+        droid(id: "1") {
+            friends(first: $count) {
+                name
+            }
+        }
+      }"""
+    variables = {"count": 10}
+
+    complexity = get_complexity(query, build_schema(schema), SimpleEstimator(), variables=variables)
+    tree = build_complexity_tree(query, build_schema(schema), SimpleEstimator(), variables=variables)
+
+    assert complexity == 12
+    assert tree.evaluate() == 12
+    assert variables == {"count": 10}
+
+
+def test_complexity_reads_count_from_variable_default_value():
+    query = """query Friends($count: Int = 5) {
+        droid(id: "1") {
+            friends(first: $count) {
+                name
+            }
+        }
+      }"""
+
+    assert get_complexity(query, build_schema(schema), SimpleEstimator()) == 7
+    assert get_complexity(query, build_schema(schema), SimpleEstimator(), variables={"count": 2}) == 4
+
+
+def test_complexity_reads_count_from_variable_default_value_of_operation_after_fragment():
+    query = """fragment Friends on Query {
+        droid(id: "1") {
+            friends(first: $count) {
+                name
+            }
+        }
+      }
+      query Friends($count: Int = 5) { ...Friends }"""
+
+    assert get_complexity(query, build_schema(schema), SimpleEstimator()) == 7
+    assert build_complexity_tree(query, build_schema(schema), SimpleEstimator()).evaluate() == 7
+
+
+def test_missing_count_variable_without_default_uses_missing_value():
+    query = """query Friends($count: Int) {
+        droid(id: "1") {
+            friends(first: $count) {
+                name
+            }
+        }
+      }"""
+    config = Config(count_missing_arg_value=3)
+
+    complexity = get_complexity(query, build_schema(schema), SimpleEstimator(), config)
+
+    assert complexity == 5
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("query { users { id } }", 1 + 5),
+    ("query { users(first: 2) { id } }", 1 + 2),
+    ("query ($n: Int = 3) { users(first: $n) { id } }", 1 + 3),
+])
+def test_missing_count_argument_uses_its_default_value_in_the_schema(query, expected):
+    schema_with_defaults = build_schema("""
+        type User { id: ID }
+        type Query { users(first: Int = 5): [User] }
+    """)
+    complexities = []
+    rule = build_complexity_validation_rule(SimpleEstimator(), on_complexity=complexities.append)
+
+    assert get_complexity(query, schema_with_defaults, SimpleEstimator()) == expected
+    assert build_complexity_tree(query, schema_with_defaults, SimpleEstimator()).evaluate() == expected
+    assert compile_cost_plan(query, schema_with_defaults, SimpleEstimator()).evaluate() == expected
+    assert validate(schema_with_defaults, parse(query), [*specified_rules, rule]) == []
+    assert complexities == [expected]
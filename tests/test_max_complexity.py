@@ -0,0 +1,111 @@
+import pytest
+from graphql import build_schema
+
+from graphql_complexity import (
+    ComplexityEstimator,
+    ComplexityLimitError,
+    SimpleEstimator,
+    get_complexity,
+)
+from tests.ut_utils import schema
+
+
+class CountingEstimator(ComplexityEstimator):
+    def __init__(self):
+        self.calls = 0
+
+    def get_field_complexity(self, node, type_info, path) -> int:
+        self.calls += 1
+        return 1
+
+
+def test_complexity_within_the_limit_is_returned():
+    query = """query {
+        droid {
+            name
+        }
+    }"""
+
+    complexity = get_complexity(query, build_schema(schema), SimpleEstimator(), max_complexity=2)
+
+    assert complexity == 2
+
+
+def test_exceeding_the_limit_raises_with_the_exceeded_path():
+    query = """query {
+        version
+        droid {
+            id
+            friends(first: 10) {
+                name
+            }
+        }
+    }"""
+
+    with pytest.raises(ComplexityLimitError) as exc_info:
+        get_complexity(query, build_schema(schema), SimpleEstimator(), max_complexity=5)
+
+    error = exc_info.value
+    assert error.message == "Query is too complex. Max complexity is 5, estimated complexity is 14"
+    assert error.complexity == 14
+    assert error.max_complexity == 5
+    assert error.path == ["droid", "friends", "name"]
+
+
+def test_traversal_stops_once_the_limit_is_exceeded():
+    fields = "\n".join(f"field{i}: version" for i in range(100))
+    query = f"query {{ {fields} }}"
+    estimator = CountingEstimator()
+
+    with pytest.raises(ComplexityLimitError) as exc_info:
+        get_complexity(query, build_schema(schema), estimator, max_complexity=10)
+
+    assert estimator.calls == 11
+    assert exc_info.value.path == ["field10"]
+
+
+def test_spreads_of_visited_fragments_count_towards_the_limit():
+    query = """
+        fragment fields on Character {
+            id
+            name
+        }
+        query {
+            droid {
+                friends(first: 10) {
+                    ...fields
+                }
+                name
+            }
+        }
+    """
+    estimator = CountingEstimator()
+
+    with pytest.raises(ComplexityLimitError) as exc_info:
+        get_complexity(query, build_schema(schema), estimator, max_complexity=5)
+
+    assert exc_info.value.path == ["droid", "friends"]
+    assert exc_info.value.complexity == 22
+    assert estimator.calls == 4
+
+
+def test_limit_is_checked_after_resolving_fragments_defined_later():
+    query = """
+        query {
+            droid {
+                friends(first: 10) {
+                    ...fields
+                }
+            }
+        }
+        fragment fields on Character {
+            id
+            name
+        }
+    """
+
+    with pytest.raises(ComplexityLimitError) as exc_info:
+        get_complexity(query, build_schema(schema), SimpleEstimator(), max_complexity=5)
+
+    assert exc_info.value.complexity == 22
+    assert exc_info.value.path is None
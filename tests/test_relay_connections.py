@@ -0,0 +1,154 @@
+import pytest
+from graphql import TypeInfo, TypeInfoVisitor, build_schema, parse, specified_rules, validate, visit
+
+from graphql_complexity import (
+    SimpleEstimator,
+    build_complexity_validation_rule,
+    compile_cost_plan,
+    explain_complexity,
+    get_complexity,
+)
+from graphql_complexity.config import Config
+from graphql_complexity.evaluator.complexity import build_complexity_tree
+from graphql_complexity.evaluator.schema_index import get_schema_index
+from graphql_complexity.evaluator.visitor import ComplexityVisitor
+
+SCHEMA = build_schema("""
+    interface Node {
+        id: ID!
+    }
+
+    type User implements Node {
+        id: ID!
+        name: String
+        friends(first: Int, last: Int): UserConnection
+    }
+
+    type UserEdge {
+        node: User
+        cursor: String
+    }
+
+    type UserConnection {
+        edges: [UserEdge!]!
+        nodes: [User]
+        totalCount: Int
+    }
+
+    type PostConnection {
+        edges: [String]
+    }
+
+    type Query {
+        users(first: Int, last: Int, pageSize: Int): UserConnection
+        posts(first: Int): PostConnection
+        following(first: Int = 25): UserConnection
+        user: User
+    }
+""")
+
+CONFIG = Config(relay_connections=True)
+
+
+def test_connection_types_are_indexed_with_their_item_fields():
+    # Edges of PostConnection have no node, so it is not a connection
+    assert get_schema_index(SCHEMA).connections == {"UserConnection": ("edges", "nodes")}
+
+
+@pytest.mark.parametrize("query, variables, config, expected", [
+    # users + edges + 100 * (node + name)
+    ("query { users(first: 100) { edges { node { name } } } }", None, CONFIG, 1 + 1 + 100 * 2),
+    ("query { users(first: 10) { nodes { name } totalCount } }", None, CONFIG, 1 + 1 + 10 + 1),
+    # The largest slicing argument is used, and they can be variables
+    ("query ($n: Int) { users(first: 3, last: $n) { nodes { id } } }", {"n": 7}, CONFIG, 1 + 1 + 7),
+    # Sizes are carried through inline fragments and nested connections
+    (
+        "query { users(first: 10) { ... on UserConnection { edges { node { friends(last: 5) { nodes { id } } } } } } }",
+        None,
+        CONFIG,
+        1 + 1 + 10 * (1 + 1 + 1 + 5),
+    ),
+    # Connections without slicing arguments use the missing count
+    ("query { users { edges { cursor } } }", None, Config(relay_connections=True, count_missing_arg_value=20), 1 + 1 + 20),
+    (
+        "query { users(pageSize: 30) { nodes { id } } }",
+        None,
+        Config(relay_connections=True, connection_slicing_args=("pageSize",)),
+        1 + 1 + 30,
+    ),
+    ("query { users(first: 1000) { nodes { id } } }", None, Config(relay_connections=True, max_connection_size=50), 52),
+    # Slicing arguments that are not given take their default value
+    ("query { following { nodes { id } } }", None, CONFIG, 1 + 1 + 25),
+    ("query { following(first: 3) { nodes { id } } }", None, CONFIG, 1 + 1 + 3),
+    # Without relay connections, edges are lists without a count argument
+    ("query { users(first: 100) { edges { node { name } } } }", None, Config(), 1 + 1 + 2),
+])
+def test_connections_size_their_items(query, variables, config, expected):
+    estimator = SimpleEstimator()
+
+    assert get_complexity(query, SCHEMA, estimator, config, variables=variables) == expected
+    assert build_complexity_tree(query, SCHEMA, estimator, config, variables=variables).evaluate() == expected
+    assert explain_complexity(query, SCHEMA, estimator, config, variables=variables).total_complexity == expected
+
+
+def test_connections_are_sized_by_the_validation_rule():
+    complexities = []
+    rule = build_complexity_validation_rule(SimpleEstimator(), CONFIG, on_complexity=complexities.append)
+
+    validate(SCHEMA, parse("query { users(first: 100) { edges { node { name } } } }"), [*specified_rules, rule])
+
+    assert complexities == [1 + 1 + 100 * 2]
+
+
+@pytest.mark.parametrize("spread, inlined", [
+    (
+        "query { users(first: 10) { ...C } } fragment C on UserConnection { edges { node { id } } }",
+        "query { users(first: 10) { ... on UserConnection { edges { node { id } } } } }",
+    ),
+    # Fragments defined before being spread, and spread at the top of other fragments
+    (
+        "fragment D on UserConnection { nodes { id } } fragment C on UserConnection { ...D totalCount } "
+        "query { users(first: 10) { ...C } }",
+        "query { users(first: 10) { nodes { id } totalCount } }",
+    ),
+    # The same fragments spread with different sizes
+    (
+        "query { a: users(first: 10) { ...C } b: users(last: 3) { ...C } c: users(first: 10) { ...C } "
+        "user { friends(first: 4) { ...E } } } "
+        "fragment C on UserConnection { nodes { ...U } } "
+        "fragment U on User { id friends(first: 2) { ...E } } "
+        "fragment E on UserConnection { edges { cursor } }",
+        "query { a: users(first: 10) { nodes { id friends(first: 2) { edges { cursor } } } } "
+        "b: users(last: 3) { nodes { id friends(first: 2) { edges { cursor } } } } "
+        "c: users(first: 10) { nodes { id friends(first: 2) { edges { cursor } } } } "
+        "user { friends(first: 4) { edges { cursor } } } }",
+    ),
+])
+def test_connections_size_the_fragments_spread_in_them(spread, inlined):
+    estimator = SimpleEstimator()
+    expected = get_complexity(inlined, SCHEMA, estimator, CONFIG)
+    complexities = []
+    rule = build_complexity_validation_rule(estimator, CONFIG, on_complexity=complexities.append)
+
+    assert get_complexity(spread, SCHEMA, estimator, CONFIG) == expected
+    assert build_complexity_tree(spread, SCHEMA, estimator, CONFIG).evaluate() == expected
+    assert explain_complexity(spread, SCHEMA, estimator, CONFIG).total_complexity == expected
+    assert validate(SCHEMA, parse(spread), [*specified_rules, rule]) == []
+    assert complexities == [expected]
+
+
+def test_cost_plans_can_not_be_compiled_with_relay_connections():
+    with pytest.raises(ValueError, match="^Cost plans can not be compiled with Relay connections$"):
+        compile_cost_plan("query { users { nodes { id } } }", SCHEMA, SimpleEstimator(), CONFIG)
+
+
+def test_visitors_size_connections_with_the_given_schema():
+    query = parse("query { users(first: 100) { edges { node { name } } } }")
+    type_info = TypeInfo(SCHEMA)
+    visitor = ComplexityVisitor(SimpleEstimator(), type_info, CONFIG, schema=SCHEMA)
+
+    visit(query, TypeInfoVisitor(type_info, visitor))
+
+    assert visitor.complexity_tree.evaluate() == 1 + 1 + 100 * 2
+    with pytest.raises(ValueError, match="^The schema is required to size Relay connections$"):
+        ComplexityVisitor(SimpleEstimator(), TypeInfo(SCHEMA), CONFIG)
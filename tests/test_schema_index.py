@@ -0,0 +1,83 @@
+import gc
+import weakref
+
+import pytest
+from graphql import TypeInfo, TypeInfoVisitor, Visitor, build_schema, parse, visit
+
+from graphql_complexity.evaluator.schema_index import SchemaTypeInfo, get_schema_index
+from tests import ut_utils
+from tests.ut_utils import SchemaTypeInfoVisitor
+
+SCHEMA = build_schema(
+    ut_utils.schema
+    + """
+    directive @complexity(value: Int!) on FIELD_DEFINITION
+    union SearchResult = Human | Droid
+    extend type Query {
+        search(text: String, first: Int = 10): [SearchResult] @complexity(value: 5)
+        mutantHumans: [Human!]!
+    }
+"""
+)
+
+
+class FieldTypesVisitor(Visitor):
+    def __init__(self, type_info):
+        super().__init__()
+        self.type_info = type_info
+        self.fields = []
+
+    def enter_field(self, node, *_):
+        self.fields.append((
+            node.name.value,
+            str(self.type_info.get_parent_type()),
+            str(self.type_info.get_type()),
+            self.type_info.get_field_def(),
+        ))
+
+
+@pytest.mark.parametrize("query", [
+    'query { version droid(id: "1") { id friends(first: 3) { name ... on Human { homePlanet } } } }',
+    "query { hero { ...fields } } fragment fields on Character { name appearsIn friends { id } }",
+    'query { search(text: "a") { __typename ... on Droid { primaryFunction } ... { __typename } } }',
+    "query { __schema { types { name fields { name } } } __type(name: \"Droid\") { name } }",
+    "query { hero { unknownField { id } } unknownRoot }",
+    "mutation { version }",
+    "query { mutantHumans { id } }",
+])
+def test_schema_type_info_matches_graphql_core_type_info(query):
+    document = parse(query)
+    expected = FieldTypesVisitor(TypeInfo(SCHEMA))
+    visit(document, TypeInfoVisitor(expected.type_info, expected))
+    actual = FieldTypesVisitor(SchemaTypeInfo(SCHEMA))
+    visit(document, SchemaTypeInfoVisitor(actual.type_info, actual))
+
+    assert actual.fields == expected.fields
+
+
+def test_schema_index_is_built_once_per_schema():
+    assert get_schema_index(SCHEMA) is get_schema_index(SCHEMA)
+    assert get_schema_index(SCHEMA) is not get_schema_index(build_schema(ut_utils.schema))
+
+
+def test_schema_index_does_not_keep_its_schema_alive():
+    schema = build_schema(ut_utils.schema)
+    get_schema_index(schema)
+    schema_ref = weakref.ref(schema)
+
+    del schema
+    gc.collect()
+
+    assert schema_ref() is None
+
+
+def test_schema_index_precomputes_field_information():
+    index = get_schema_index(SCHEMA)
+    query_type = SCHEMA.query_type
+
+    search = index.get_field(query_type, "search")
+
+    assert search.definition is query_type.fields["search"]
+    assert str(search.type) == "[SearchResult]"
+    assert index.get_field(query_type, "missing") is None
+    assert index.get_field(SCHEMA.get_type("SearchResult"), "__typename").type.of_type.name == "String"
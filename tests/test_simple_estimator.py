@@ -2,6 +2,7 @@ import pytest
 from graphql import build_schema
 
 from graphql_complexity import SimpleEstimator, get_complexity
+from graphql_complexity.evaluator.complexity import build_complexity_tree
 from tests.ut_utils import schema
 
 
@@ -151,3 +152,32 @@ def test_9():
       }"""  # Simple Estimator(10): 10
     complexity = _evaluate_complexity_with_simple_estimator(query, 10)
     assert complexity == 10
+
+
+def test_skipped_selections_are_not_estimated():
+    calls = []
+
+    class RecordingEstimator(SimpleEstimator):
+        def get_field_complexity(self, node, *args, **kwargs) -> int:
+            calls.append(node.name.value)
+            return super().get_field_complexity(node, *args, **kwargs)
+
+    query = """query {
+        droid @include(if: false) {
+            name
+            friends {
+                name
+            }
+        }
+        hero {
+            ... on Droid @skip(if: true) {
+                primaryFunction
+            }
+            id
+        }
+    }"""
+
+    tree = build_complexity_tree(query, build_schema(schema), RecordingEstimator())
+
+    assert tree.evaluate() == 2
+    assert calls == ["hero", "id"]
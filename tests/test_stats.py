@@ -0,0 +1,71 @@
+from graphql import build_schema
+
+from graphql_complexity import AnalysisStats, ComplexityCache, SimpleEstimator, explain_complexity, get_complexity
+from graphql_complexity.evaluator.complexity import build_complexity_tree
+from tests import ut_utils
+
+SCHEMA = build_schema(ut_utils.schema)
+
+QUERY = """
+    query ($withFriends: Boolean = false) {
+        droid(id: "1") {
+            ...droidFields
+            friends @include(if: $withFriends) { name }
+        }
+        other: droid(id: "2") { ...droidFields }
+    }
+    fragment droidFields on Droid { id name }
+"""
+
+
+def test_get_complexity_collects_stats():
+    stats = AnalysisStats()
+
+    complexity = get_complexity(QUERY, SCHEMA, SimpleEstimator(), stats=stats)
+
+    assert complexity == 6
+    assert stats.fields_visited == 4
+    assert stats.fragments_expanded == 2
+    assert stats.estimator_calls == 4
+    assert stats.parse_time > 0 and stats.traversal_time > 0 and stats.evaluation_time > 0
+    assert (stats.cache_hits, stats.cache_misses) == (0, 0)
+
+
+def test_stats_are_added_up_across_analyses():
+    stats = AnalysisStats()
+    cache = ComplexityCache()
+
+    get_complexity(QUERY, SCHEMA, SimpleEstimator(), cache=cache, stats=stats)
+    get_complexity(QUERY, SCHEMA, SimpleEstimator(), cache=cache, stats=stats)
+    get_complexity(QUERY, SCHEMA, SimpleEstimator(), variables={"withFriends": True}, cache=cache, stats=stats)
+
+    assert (stats.cache_hits, stats.cache_misses) == (1, 2)
+    assert stats.estimator_calls == 4 + 6
+
+
+def test_build_complexity_tree_and_explain_collect_stats():
+    tree_stats = AnalysisStats()
+    explain_stats = AnalysisStats()
+
+    build_complexity_tree(QUERY, SCHEMA, SimpleEstimator(), stats=tree_stats)
+    explain_complexity(QUERY, SCHEMA, SimpleEstimator(), stats=explain_stats)
+
+    assert tree_stats.fields_visited == explain_stats.fields_visited == 4
+    assert tree_stats.estimator_calls == explain_stats.estimator_calls == 4
+    assert tree_stats.evaluation_time == 0
+    assert explain_stats.evaluation_time > 0
+
+
+def test_stats_as_dict():
+    assert AnalysisStats(fields_visited=3).as_dict() == {
+        "parse_time": 0.0,
+        "traversal_time": 0.0,
+        "evaluation_time": 0.0,
+        "fields_visited": 3,
+        "fragments_expanded": 0,
+        "estimator_calls": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "parse_cache_hits": 0,
+        "parse_cache_misses": 0,
+    }
@@ -1,8 +1,11 @@
-from typing import List
+from typing import List, Optional
 
+import pytest
 import strawberry
 from graphql import GraphQLError
 
+from graphql_complexity import ComplexityCache
+from graphql_complexity.config import Config
 from graphql_complexity.estimators import SimpleEstimator
 from graphql_complexity.extensions.strawberry_graphql import (
     build_complexity_extension
@@ -32,12 +35,16 @@ class Query:
     def an_obj_list(self) -> List[Obj]:
         return [Obj(a_str="a_str_in_list", an_int=3), Obj(a_str="another_str", an_int=3)]
 
+    @strawberry.field()
+    def an_obj_page(self, first: int) -> Optional[List[Obj]]:
+        return [Obj(a_str="a_str_in_page", an_int=index) for index in range(first)]
+
 
-def _execute_with_complexity(query: str, estimator=None):
+def _execute_with_complexity(query: str, estimator=None, operation_name=None):
     estimator = estimator or SimpleEstimator()
     extension = build_complexity_extension(estimator=estimator)
     schema = strawberry.Schema(query=Query, extensions=[extension])
-    return schema.execute_sync(query)
+    return schema.execute_sync(query, operation_name=operation_name)
 
 
 def _execute_limiting_complexity(query: str, max_complexity: int, estimator=None):
@@ -141,7 +148,29 @@ def test_complexity_works_with_multiple_operation_definitions():
 
     result = _execute_with_complexity(query)
 
-    assert result.extensions["complexity"]["value"] == 4
+    assert result.extensions["complexity"]["value"] == 2
+
+
+def test_complexity_only_counts_the_executed_operation():
+    query = """
+        fragment fields on Obj {
+            aStr
+            anInt
+        }
+        query Something {
+            a1ComplexityField
+        }
+        query SomethingElse {
+            anObj {
+                ... fields
+            }
+        }
+    """
+
+    result = _execute_with_complexity(query, operation_name="SomethingElse")
+
+    assert result.errors is None
+    assert result.extensions["complexity"]["value"] == 3
 
 
 def test_complexity_handles_fragments():
@@ -260,3 +289,161 @@ def test_extension_does_not_resolve_fields_when_limiting():
     schema.execute_sync(query)
 
     assert resolver_calls == 1
+
+
+def test_extension_reuses_cached_complexities():
+    cache = ComplexityCache()
+    extension = build_complexity_extension(estimator=SimpleEstimator(), cache=cache)
+    schema = strawberry.Schema(query=Query, extensions=[extension])
+    query = """
+        query {
+            anObj {
+                aStr
+            }
+        }
+    """
+
+    first = schema.execute_sync(query)
+    second = schema.execute_sync(query)
+
+    assert first.extensions["complexity"]["value"] == 2
+    assert second.extensions["complexity"]["value"] == 2
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_extension_reads_count_from_request_variables():
+    cache = ComplexityCache()
+    extension = build_complexity_extension(estimator=SimpleEstimator(), cache=cache)
+    schema = strawberry.Schema(query=Query, extensions=[extension])
+    query = """
+        query Page($first: Int!) {
+            anObjPage(first: $first) {
+                aStr
+            }
+        }
+    """
+
+    small = schema.execute_sync(query, variable_values={"first": 2})
+    large = schema.execute_sync(query, variable_values={"first": 20})
+
+    assert small.errors is None
+    assert small.extensions["complexity"]["value"] == 3
+    assert large.extensions["complexity"]["value"] == 21
+    assert cache.stats.misses == 2
+
+
+@pytest.mark.parametrize("use_validation_rule", [False, True])
+def test_extension_uses_the_given_config(use_validation_rule):
+    cache = ComplexityCache()
+    extension = build_complexity_extension(
+        estimator=SimpleEstimator(),
+        max_complexity=10,
+        cache=cache,
+        use_validation_rule=use_validation_rule,
+        config=Config(count_arg_name="size", count_missing_arg_value=20),
+    )
+    schema = strawberry.Schema(query=Query, extensions=[extension])
+    query = """
+        query {
+            anObjPage(first: 3) {
+                aStr
+            }
+        }
+    """
+
+    first = schema.execute_sync(query)
+    second = schema.execute_sync(query)
+
+    assert first.data is None
+    assert first.extensions["complexity"]["value"] == 21
+    assert second.extensions["complexity"]["value"] == 21
+    assert cache.stats.misses == 1
+
+
+def test_extension_calculates_complexity_with_validation_rule():
+    extension = build_complexity_extension(estimator=SimpleEstimator(), use_validation_rule=True)
+    schema = strawberry.Schema(query=Query, extensions=[extension])
+    query = """
+        query Page($first: Int!) {
+            anObjPage(first: $first) {
+                aStr
+            }
+        }
+    """
+
+    result = schema.execute_sync(query, variable_values={"first": 4})
+
+    assert result.errors is None
+    assert result.extensions["complexity"]["value"] == 5
+
+
+def test_extension_reports_limit_as_validation_error_with_validation_rule():
+    extension = build_complexity_extension(estimator=SimpleEstimator(), max_complexity=1, use_validation_rule=True)
+    schema = strawberry.Schema(query=Query, extensions=[extension])
+    query = """
+        query Something {
+            a1ComplexityField
+            alias: a1ComplexityField
+        }
+    """
+
+    result = schema.execute_sync(query)
+
+    assert result.data is None
+    assert [error.message for error in result.errors] == [
+        "Query is too complex. Max complexity is 1, estimated complexity is 2"
+    ]
+    assert result.extensions["complexity"]["value"] == 2
+
+
+def test_extension_reuses_cached_complexities_with_validation_rule():
+    cache = ComplexityCache()
+    extension = build_complexity_extension(estimator=SimpleEstimator(), cache=cache, use_validation_rule=True)
+    schema = strawberry.Schema(query=Query, extensions=[extension])
+    query = """
+        query {
+            anObj {
+                aStr
+            }
+        }
+    """
+
+    first = schema.execute_sync(query)
+    second = schema.execute_sync(query)
+
+    assert first.extensions["complexity"]["value"] == 2
+    assert second.extensions["complexity"]["value"] == 2
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.parametrize("use_validation_rule", [False, True])
+def test_extension_returns_analysis_stats(use_validation_rule):
+    extension = build_complexity_extension(
+        estimator=SimpleEstimator(), cache=ComplexityCache(), use_validation_rule=use_validation_rule, collect_stats=True
+    )
+    schema = strawberry.Schema(query=Query, extensions=[extension])
+    query = """
+        query {
+            anObj { ...fields }
+            other: anObj { ...fields }
+        }
+        fragment fields on Obj { aStr anInt }
+    """
+
+    first = schema.execute_sync(query)
+    second = schema.execute_sync(query)
+
+    stats = first.extensions["complexity"]["stats"]
+    assert first.extensions["complexity"]["value"] == 6
+    assert (stats["fields_visited"], stats["fragments_expanded"], stats["estimator_calls"]) == (4, 2, 4)
+    assert (stats["cache_hits"], stats["cache_misses"]) == (0, 1)
+    assert second.extensions["complexity"]["stats"]["cache_hits"] == 1
+    assert second.extensions["complexity"]["stats"]["estimator_calls"] == 0
+
+
+def test_extension_does_not_return_stats_by_default():
+    result = _execute_with_complexity("query { a1ComplexityField }")
+
+    assert result.extensions["complexity"] == {"value": 1}
@@ -3,7 +3,14 @@ from graphql import build_schema
 
 from graphql_complexity import SimpleEstimator
 from graphql_complexity.evaluator.complexity import build_complexity_tree
-from graphql_complexity.evaluator.nodes import ComplexityNode
+from graphql_complexity.evaluator.nodes import (
+    ComplexityNode,
+    Field,
+    FragmentSpreadNode,
+    ListField,
+    MetaField,
+    RootNode,
+)
 from tests import ut_utils
 
 
@@ -134,3 +141,122 @@ def test_children_should_be_complexity_nodes():
 
     with pytest.raises(TypeError, match="^Children must be ComplexityNode instances, got <class 'str'>$"):
         node.add_child("not a node")
+
+
+def test_fragments_are_evaluated_once_per_document():
+    fragments = "\n".join(
+        f"fragment f{i} on Character {{ ...f{i + 1} ...f{i + 1} }}" for i in range(30)
+    )
+    query = f"""query {{
+        hero {{
+            ...f0
+        }}
+    }}
+    {fragments}
+    fragment f30 on Character {{
+        name
+    }}"""
+
+    tree = _build_complexity_tree(query)
+
+    assert tree.evaluate() == 1 + 2 ** 30
+
+
+def test_fragment_complexity_is_shared_between_spreads():
+    query = """query {
+        hero {
+            ...fields
+        }
+        droid {
+            ...fields
+        }
+    }
+    fragment fields on Character {
+        id
+        name
+    }"""
+
+    tree = _build_complexity_tree(query)
+    hero, droid = tree.children
+    hero_spread, droid_spread = hero.children[0], droid.children[0]
+
+    assert tree.evaluate() == 6
+    assert hero_spread.fragments_complexity is droid_spread.fragments_complexity
+    assert hero_spread.fragments_complexity == {"fields": 2}
+
+
+@pytest.mark.parametrize("node", [
+    RootNode(name="root"),
+    Field(name="field", complexity=1),
+    ListField(name="list", complexity=1, count=10),
+    MetaField(name="__typename"),
+    FragmentSpreadNode(name="fragment", fragments_definition={}),
+])
+def test_complexity_nodes_are_slotted(node):
+    assert not hasattr(node, "__dict__")
+
+
+def _build_deep_tree(depth: int) -> RootNode:
+    root = RootNode(name="root")
+    node = root
+    for level in range(depth):
+        if level % 2:
+            child = ListField(name=f"field{level}", complexity=1, count=1)
+        else:
+            child = Field(name=f"field{level}", complexity=1)
+        node.add_child(child)
+        node = child
+    return root
+
+
+def test_deep_trees_are_evaluated_without_recursion():
+    tree = _build_deep_tree(10_000)
+
+    assert tree.evaluate() == 10_000
+
+
+def test_deep_trees_are_described_without_recursion():
+    tree = _build_deep_tree(5_000)
+
+    lines = tree.describe().split("\n")
+
+    assert len(lines) == 5_001
+    assert lines[0] == "root (RootNode) = 5000"
+    assert lines[-1] == f"{chr(9) * 5_000}field4999 (ListField) = 1"
+
+
+def test_skipped_fields_are_not_traversed():
+    query = """query {
+        droid @include(if: false) {
+            id
+            friends(first: 2) {
+                name
+            }
+        }
+    }"""
+
+    tree = _build_complexity_tree(query)
+
+    assert tree.describe() == """root (RootNode) = 0
+\tdroid (SkippedField) = 0"""
+
+
+def test_skipped_fragments_are_not_added():
+    query = """query ($withFragments: Boolean = false) {
+        droid {
+            ... on Droid @include(if: $withFragments) {
+                primaryFunction
+            }
+            ...fields @include(if: $withFragments)
+            id
+        }
+    }
+    fragment fields on Droid {
+        name
+    }"""
+
+    tree = _build_complexity_tree(query)
+
+    assert tree.describe() == """root (RootNode) = 2
+\tdroid (Field) = 2
+\t\tid (Field) = 1"""
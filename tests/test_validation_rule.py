@@ -0,0 +1,109 @@
+import pytest
+from graphql import build_schema, parse, specified_rules, validate
+
+from graphql_complexity import (
+    ComplexityLimitError,
+    FragmentExpansionError,
+    SimpleEstimator,
+    get_complexity,
+)
+from graphql_complexity.config import Config
+from graphql_complexity.evaluator.rule import build_complexity_validation_rule
+from tests import ut_utils
+
+QUERY = """
+    query Droid($count: Int) {
+        droid(id: "1") { id friends(first: $count) { ...names } }
+    }
+    query Version { version }
+    fragment names on Character { name }
+"""
+
+
+@pytest.fixture
+def schema():
+    return build_schema(ut_utils.schema)
+
+
+def _validate(schema, query, **kwargs):
+    complexities = []
+    rule = build_complexity_validation_rule(SimpleEstimator(), on_complexity=complexities.append, **kwargs)
+    errors = validate(schema, parse(query), [*specified_rules, rule])
+    return errors, complexities
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"variables": {"count": 4}},
+    {"operation_name": "Droid", "variables": {"count": 10}},
+    {"operation_name": "Version"},
+])
+def test_rule_matches_get_complexity(schema, kwargs):
+    errors, complexities = _validate(schema, QUERY, **kwargs)
+
+    assert errors == []
+    assert complexities == [get_complexity(QUERY, schema, SimpleEstimator(), **kwargs)]
+
+
+@pytest.mark.parametrize("operation_name", ["Few", "Many"])
+def test_rule_uses_variable_defaults_of_the_selected_operation(schema, operation_name):
+    query = """
+        fragment friends on Query { droid(id: "1") { friends(first: $count) { name } } }
+        query Few($count: Int = 2) { ...friends }
+        query Many($count: Int = 20) { ...friends }
+    """
+
+    errors, complexities = _validate(schema, query, operation_name=operation_name)
+
+    assert errors == []
+    assert complexities == [get_complexity(query, schema, SimpleEstimator(), operation_name=operation_name)]
+
+
+def test_rule_reports_complexity_limit_error(schema):
+    errors, complexities = _validate(schema, QUERY, variables={"count": 10}, max_complexity=5)
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], ComplexityLimitError)
+    assert errors[0].max_complexity == 5
+    assert complexities == [errors[0].complexity]
+
+
+def test_rule_reports_limit_exceeded_once_fragments_are_resolved(schema):
+    errors, complexities = _validate(schema, QUERY, variables={"count": 10}, operation_name="Droid", max_complexity=12)
+
+    assert complexities == [13]
+    assert [error.message for error in errors] == [
+        "Query is too complex. Max complexity is 12, estimated complexity is 13"
+    ]
+
+
+def test_rule_is_reported_with_other_validation_errors(schema):
+    errors, complexities = _validate(schema, "query { version unknownField }")
+
+    assert [error.message for error in errors] == ["Cannot query field 'unknownField' on type 'Query'."]
+    assert complexities == [2]
+
+
+def test_rule_leaves_fragment_cycles_to_graphql_core(schema):
+    query = """
+        query { hero { ...A } }
+        fragment A on Character { ...B }
+        fragment B on Character { ...A }
+    """
+
+    errors, complexities = _validate(schema, query)
+
+    assert [error.message for error in errors] == ["Cannot spread fragment 'A' within itself via 'B'."]
+    assert complexities == []
+
+
+def test_rule_reports_fragment_expansion_errors(schema):
+    query = """
+        query { hero { ...A ...A } }
+        fragment A on Character { name id }
+    """
+
+    errors, _ = _validate(schema, query, config=Config(max_fragment_expansion=3))
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], FragmentExpansionError)
@@ -0,0 +1,118 @@
+import pytest
+from graphql import (
+    BREAK,
+    SKIP,
+    DocumentNode,
+    FieldNode,
+    NameNode,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionSetNode,
+    TypeInfo,
+    TypeInfoVisitor,
+    Visitor,
+    build_schema,
+    parse,
+    visit,
+)
+
+from graphql_complexity.evaluator.walker import WALKED_KEYS, walk
+from tests import ut_utils
+
+SCHEMA = build_schema(ut_utils.schema)
+
+QUERY = """
+    query Droid($first: Int = 3 @deprecated) {
+        version @skip(if: false)
+        droid(id: "1") {
+            id
+            friends(first: $first) { name ... on Human @include(if: true) { homePlanet } }
+            ...droidFields
+        }
+    }
+    fragment droidFields on Droid { primaryFunction ... { id } }
+"""
+
+
+class RecordingVisitor(Visitor):
+    def __init__(self, type_info=None, skip=(), stop=None):
+        super().__init__()
+        self.type_info = type_info
+        self.skip = skip
+        self.stop = stop
+        self.events = []
+
+    def enter(self, node, key, parent, path, ancestors):
+        if node.kind not in WALKED_KEYS:
+            return None
+        self.events.append(("enter", *self._record(node, key, parent, path, ancestors)))
+        if node.kind == "field" and node.name.value in self.skip:
+            return SKIP
+        if node.kind == "field" and node.name.value == self.stop:
+            return BREAK
+        return None
+
+    def leave(self, node, key, parent, path, ancestors):
+        if node.kind in WALKED_KEYS:
+            self.events.append(("leave", *self._record(node, key, parent, path, ancestors)))
+
+    def _record(self, node, key, parent, path, ancestors):
+        types = (str(self.type_info.get_parent_type()), str(self.type_info.get_type())) if self.type_info else None
+        return node.kind, key, id(parent), tuple(path), tuple(map(id, ancestors)), types
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"skip": ("friends", "version")},
+    {"stop": "homePlanet"},
+])
+def test_walk_matches_graphql_core_visit(options):
+    document = parse(QUERY)
+    expected = RecordingVisitor(**options)
+    visit(document, expected)
+    actual = RecordingVisitor(**options)
+    walk(document, actual)
+
+    assert len(actual.events) > 10
+    assert actual.events == expected.events
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"skip": ("droid",)},
+    {"stop": "primaryFunction"},
+])
+def test_walk_updates_type_info_as_type_info_visitor(options):
+    document = parse(QUERY)
+    expected = RecordingVisitor(TypeInfo(SCHEMA), **options)
+    visit(document, TypeInfoVisitor(expected.type_info, expected))
+    actual = RecordingVisitor(TypeInfo(SCHEMA), **options)
+    walk(document, actual, actual.type_info)
+
+    assert actual.events == expected.events
+
+
+def test_walk_does_not_visit_arguments_and_values():
+    visitor = RecordingVisitor()
+    walk(parse('query { droid(id: "1") { id } }'), visitor)
+
+    assert {event[1] for event in visitor.events} == {"document", "operation_definition", "selection_set", "field"}
+
+
+def test_walk_query_deeper_than_the_recursion_limit():
+    depth = 5000
+    selection_set = parse("{ b }").definitions[0].selection_set
+    for _ in range(depth):
+        selection_set = SelectionSetNode(selections=(FieldNode(name=NameNode(value="a"), selection_set=selection_set),))
+    operation = OperationDefinitionNode(operation=OperationType.QUERY, selection_set=selection_set)
+
+    class FieldDepthVisitor(Visitor):
+        max_depth = 0
+
+        def enter_field(self, node, key, parent, path, ancestors):
+            self.max_depth = max(self.max_depth, len(ancestors))
+
+    visitor = FieldDepthVisitor()
+    walk(DocumentNode(definitions=(operation,)), visitor)
+
+    assert visitor.max_depth == 3 * depth + 4
@@ -1,3 +1,9 @@
+from typing import Any
+
+from graphql import Node, Visitor
+
+from graphql_complexity.evaluator.schema_index import SchemaTypeInfo
+
 schema = """
 enum Episode { NEW_HOPE, EMPIRE, JEDI }
 
@@ -31,3 +37,31 @@ type Query {
   droid(id: String!): Droid
 }
 """
+
+
+class SchemaTypeInfoVisitor(Visitor):
+    """Visitor that maintains a `SchemaTypeInfo` while visiting the wrapped visitor,
+    as graphql-core's `TypeInfoVisitor` does with a `TypeInfo`, to traverse documents
+    with graphql-core's `visit` instead of the walker."""
+
+    def __init__(self, type_info: SchemaTypeInfo, visitor: Visitor):
+        super().__init__()
+        self.type_info = type_info
+        self.visitor = visitor
+
+    def enter(self, node: Node, *args: Any) -> Any:
+        self.type_info.enter(node)
+        fn = self.visitor.get_enter_leave_for_kind(node.kind).enter
+        if fn:
+            result = fn(node, *args)
+            if result is not None:
+                self.type_info.leave(node)
+                if isinstance(result, Node):
+                    self.type_info.enter(result)
+            return result
+
+    def leave(self, node: Node, *args: Any) -> Any:
+        fn = self.visitor.get_enter_leave_for_kind(node.kind).leave
+        result = fn(node, *args) if fn else None
+        self.type_info.leave(node)
+        return result